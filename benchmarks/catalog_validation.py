@@ -0,0 +1,58 @@
+'''
+Benchmark of the throughput of catalog file validation
+
+Writes an items.csv file with facets and JSON metadata to a temporary directory, then validates it.
+
+Usage: python benchmarks/catalog_validation.py [number_of_rows]
+'''
+
+import os
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from constructor_io.helpers.feeds import create_items_feed
+from constructor_io.helpers.validation import validate_catalog_files
+
+
+def create_items(num_rows):
+    '''Create items with facets and metadata'''
+
+    for index in range(num_rows):
+        yield {
+            'id': f'item-{index}',
+            'name': f'Item {index}',
+            'data': {
+                'url': f'https://example.com/items/{index}',
+                'facets': { 'color': ['blue', 'red'], 'size': ['m'] },
+                'brand': 'abc',
+                'specs': { 'weight': index, 'tags': ['a', 'b'] },
+            },
+        }
+
+def main():
+    '''Run the benchmark'''
+
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'items.csv')
+
+        with open(path, 'wb') as file:
+            feed = create_items_feed(create_items(num_rows))
+
+            while chunk := feed.read(1024 * 1024):
+                file.write(chunk)
+
+        print(f'{num_rows} rows, {os.path.getsize(path) / 1024 / 1024:.0f} MB')
+
+        start = perf_counter()
+        report = validate_catalog_files({ 'items': Path(path) })
+        elapsed = perf_counter() - start
+
+        assert report.ok, report.errors
+        print(f'{elapsed:.2f}s, {num_rows / elapsed * 60 / 1e6:.1f}M rows/min')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+'''
+Benchmark of the client side CPU time spent per API call for each transport
+
+Runs a local keep-alive HTTP server in a separate process so that only the CPU time spent by the
+client is measured, then calls each module method through the requests and urllib3 transports.
+The in-memory FakeTransport is included as a baseline for the overhead of the SDK itself.
+Quizzes are not included as their service URL cannot be pointed at the local server.
+
+Usage: python benchmarks/transport_overhead.py [number_of_calls]
+'''
+
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process, Queue
+from time import perf_counter, process_time
+
+from constructor_io.constructor_io import ConstructorIO
+from constructor_io.helpers.transport import (FakeTransport, RequestsTransport,
+                                              Urllib3Transport)
+
+RESPONSES = {
+    '/search/': { 'response': { 'results': [{ 'value': 'item', 'data': { 'id': '1' } }] }, 'result_id': 'id' },
+    '/autocomplete/': { 'sections': { 'Products': [{ 'value': 'item', 'data': { 'id': '1' } }] }, 'result_id': 'id' },
+    '/browse/groups': { 'response': { 'groups': [] } },
+    '/browse/': { 'response': { 'results': [{ 'value': 'item', 'data': { 'id': '1' } }] }, 'result_id': 'id' },
+    '/recommendations/': { 'response': { 'results': [{ 'value': 'item', 'data': { 'id': '1' } }] } },
+    '/v1/tasks': { 'total_count': 0, 'tasks': [] },
+    '/v2/items': { 'items': [], 'total_count': 0 },
+}
+CALLS = {
+    'search.get_search_results': lambda client: client.search.get_search_results('item'),
+    'autocomplete.get_autocomplete_results': lambda client: client.autocomplete.get_autocomplete_results('item'),
+    'browse.get_browse_results': lambda client: client.browse.get_browse_results('group_id', 'All'),
+    'browse.get_browse_groups': lambda client: client.browse.get_browse_groups(),
+    'recommendations.get_recommendation_results':
+        lambda client: client.recommendations.get_recommendation_results('pod', { 'item_ids': ['1'] }),
+    'tasks.get_all_tasks': lambda client: client.tasks.get_all_tasks(),
+    'catalog.retrieve_items': lambda client: client.catalog.retrieve_items(),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self): # pylint: disable=invalid-name
+        '''Return the canned response matching the request path'''
+
+        body = b'{}'
+
+        for path, response in RESPONSES.items():
+            if self.path.startswith(path):
+                body = json.dumps(response).encode('utf-8')
+                break
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def _serve(queue):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    queue.put(server.server_address[1])
+    server.serve_forever()
+
+def _create_fake_transport():
+    transport = FakeTransport()
+
+    for path, response in RESPONSES.items():
+        transport.add_response('get', path, response)
+
+    return transport
+
+def _measure(client, call, number_of_calls):
+    call(client)
+    start_cpu = process_time()
+    start_wall = perf_counter()
+
+    for _ in range(number_of_calls):
+        call(client)
+
+    cpu = (process_time() - start_cpu) / number_of_calls
+    wall = (perf_counter() - start_wall) / number_of_calls
+
+    return cpu * 1e6, wall * 1e6
+
+def main(number_of_calls=2000):
+    '''Run the benchmark and print the per call CPU and wall time of each transport'''
+
+    queue = Queue()
+    server = Process(target=_serve, args=(queue,), daemon=True)
+    server.start()
+    service_url = f'http://127.0.0.1:{queue.get()}'
+    transports = {
+        'requests': RequestsTransport,
+        'urllib3': Urllib3Transport,
+        'fake (sdk only)': _create_fake_transport,
+    }
+
+    print(f'{"method":45} {"transport":16} {"cpu us/call":>12} {"wall us/call":>13}')
+
+    try:
+        for name, call in CALLS.items():
+            for transport_name, create_transport in transports.items():
+                transport = create_transport()
+                client = ConstructorIO({
+                    'api_key': 'key',
+                    'api_token': 'token',
+                    'service_url': service_url,
+                    'transport': transport,
+                })
+                cpu, wall = _measure(client, call, number_of_calls)
+                transport.close()
+
+                print(f'{name:45} {transport_name:16} {cpu:12.1f} {wall:13.1f}')
+    finally:
+        server.terminate()
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,16 +1,57 @@
 '''ConstructorIO Python Package'''
 
 from constructor_io import __version__
+from constructor_io.helpers.async_utils import AiohttpTransport
+from constructor_io.helpers.cache import CachingTransport
+from constructor_io.helpers.coalescing import CoalescingTransport
+from constructor_io.helpers.composition import AsyncPage, Page
+from constructor_io.helpers.compression import (CompressionStats,
+                                                create_compression_options)
+from constructor_io.helpers.concurrency import (LazyThreadPoolExecutor,
+                                                get_executor)
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.modules.autocomplete import Autocomplete
-from constructor_io.modules.browse import Browse
-from constructor_io.modules.catalog import Catalog
-from constructor_io.modules.quizzes import Quizzes
-from constructor_io.modules.recommendations import Recommendations
-from constructor_io.modules.search import Search
-from constructor_io.modules.tasks import Tasks
+from constructor_io.helpers.hedging import HedgingTransport
+from constructor_io.helpers.ledger import check_ledger
+from constructor_io.helpers.transport import RequestsTransport
+from constructor_io.modules.autocomplete import AsyncAutocomplete, Autocomplete
+from constructor_io.modules.browse import AsyncBrowse, Browse
+from constructor_io.modules.catalog import AsyncCatalog, Catalog
+from constructor_io.modules.quizzes import AsyncQuizzes, Quizzes
+from constructor_io.modules.recommendations import (AsyncRecommendations,
+                                                    Recommendations)
+from constructor_io.modules.search import AsyncSearch, Search
+from constructor_io.modules.tasks import AsyncTasks, Tasks
 
 
+def _create_options(options, default_pool_size):
+    '''Validate client options and create the options shared between modules'''
+
+    api_key = options.get('api_key')
+    api_token = options.get('api_token', '')
+    security_token = options.get('security_token', '')
+    version = options.get('version')
+    service_url = options.get('service_url')
+    pool_size = options.get('pool_size', default_pool_size)
+    package_version_with_prefix = "ciopython-" + __version__
+
+    if not api_key or not isinstance(api_key, str):
+        raise ConstructorException('API key is a required parameter of type string')
+
+    if not isinstance(pool_size, int) or pool_size < 1:
+        raise ConstructorException('pool_size must be a positive integer')
+
+    return {
+        'api_key': api_key,
+        'api_token': api_token,
+        'security_token': security_token,
+        'version': version or package_version_with_prefix,
+        'service_url': service_url or 'https://ac.cnstrc.com',
+        'pool_size': pool_size,
+        'compression': create_compression_options(options.get('compression')),
+        'compression_stats': CompressionStats(),
+        'ledger': check_ledger(options.get('ledger')),
+    }
+
 class ConstructorIO:
     # pylint: disable=too-few-public-methods
     # pylint: disable=too-many-instance-attributes
@@ -21,30 +62,69 @@ class ConstructorIO:
         :param str api_token: Constructor.io API token
         :param str security_token: Constructor security token
         :param str service_url: API URL endpoint
+        :param object requests: Requests module or session used to send requests (a pooled session owned by the client is created if omitted)
+        :param Transport transport: Transport used to send requests, takes precedence over requests
+        :param int pool_size: The maximum number of keep-alive connections per host. Defaults to 10
+        :param bool pool_block: Block when all connections to a host are in use instead of opening extra ones
+        :param concurrent.futures.Executor executor: Executor running concurrent and background requests (a thread pool owned by the client is created if omitted)
+        :param int max_workers: The maximum number of threads of the executor owned by the client. Defaults to pool_size
+        :param dict hedging: Hedging options per endpoint ('autocomplete' or 'search'), such as { 'search': { 'delay': 0.2 } } or { 'autocomplete': { 'percentile': 95, 'budget': 0.05 } }
+        :param bool coalesce: Share one network call between identical GET requests in flight at the same time
+        :param str|dict compression: Compress request bodies, such as catalog uploads, with 'gzip' or 'zstd' (Python 3.14 or the zstandard package), or { 'algorithm': 'gzip', 'level': 6 }. Bytes saved are counted in the compression_stats option
+        :param ContentLedger ledger: Ledger of the content hashes of the items and variations accepted by the API, so unchanged ones are not sent again
+        :param dict cache: Response cache options per endpoint ('autocomplete', 'search', 'browse', 'browse_groups', 'browse_facets', 'browse_facet_options' or 'recommendations'), such as { 'search': { 'ttl': 60, 'max_size': 1000 } } or { 'browse_groups': { 'ttl': 60, 'stale_while_revalidate': 3600 } }
 
         :return: class
     '''
 
     def __init__(self, options) -> None:
-        api_key = options.get('api_key')
-        api_token = options.get('api_token', '')
-        security_token = options.get('security_token', '')
-        version = options.get('version')
-        service_url = options.get('service_url')
-        requests = options.get('requests')
-        package_version_with_prefix = "ciopython-" + __version__
-
-        if not api_key or not isinstance(api_key, str):
-            raise ConstructorException('API key is a required parameter of type string')
-
-        self.__options = {
-            'api_key': api_key,
-            'api_token': api_token,
-            'security_token': security_token,
-            'version': version or package_version_with_prefix,
-            'service_url': service_url or 'https://ac.cnstrc.com',
-            'requests': requests,
-        }
+        transport = options.get('transport')
+        pool_block = options.get('pool_block', False)
+
+        self.__options = _create_options(options, 10)
+
+        # Share one keep-alive transport across all modules unless one was supplied
+        self.__owns_transport = transport is None
+        if self.__owns_transport:
+            transport = RequestsTransport(
+                options.get('requests'),
+                pool_size=self.__options.get('pool_size'),
+                pool_block=pool_block
+            )
+            self.__options['requests'] = transport.requests
+
+        self.__transport = transport
+        self.__middlewares = []
+
+        # Share one thread pool for concurrent requests across all modules unless one was supplied
+        self.__owns_executor = options.get('executor') is None
+        self.__options['executor'] = options.get('executor') or LazyThreadPoolExecutor(
+            options.get('max_workers') or self.__options.get('pool_size')
+        )
+
+        if options.get('hedging'):
+            transport = HedgingTransport(
+                transport,
+                options.get('hedging'),
+                self.__options.get('service_url'),
+                max_workers=self.__options.get('pool_size') * 2,
+            )
+            self.__middlewares.append(transport)
+
+        if options.get('coalesce'):
+            transport = CoalescingTransport(transport)
+            self.__middlewares.append(transport)
+
+        if options.get('cache'):
+            transport = CachingTransport(
+                transport,
+                options.get('cache'),
+                self.__options.get('service_url'),
+                executor=get_executor(self.__options),
+            )
+            self.__middlewares.append(transport)
+
+        self.__options['transport'] = transport
 
         self.autocomplete = Autocomplete(self.__options)
         self.search = Search(self.__options)
@@ -63,3 +143,111 @@ class ConstructorIO:
         '''Set client options'''
 
         self.__options = options
+
+    def create_page(self, timeout=None, max_concurrency=None):
+        '''
+        Create a page running the calls it declares concurrently under one latency budget
+
+        :param float timeout: Seconds to wait for all calls of the page (no deadline if omitted)
+        :param int max_concurrency: The maximum number of calls running at the same time (all calls at once if omitted)
+
+        :return: Page
+        '''
+
+        return Page(timeout=timeout, max_concurrency=max_concurrency)
+
+    def close(self):
+        '''Close the connection pool and background threads owned by the client'''
+
+        if self.__owns_executor:
+            self.__options.get('executor').shutdown()
+
+        # Middlewares are closed outermost first as their pending requests go through the inner ones
+        for middleware in reversed(self.__middlewares):
+            middleware.close()
+
+        if self.__owns_transport:
+            self.__transport.close()
+            self.__owns_transport = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class AsyncConstructorIO:
+    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
+    '''
+        ConstructorIO Python Client for asyncio applications
+
+        Requires the optional aiohttp dependency (`pip install constructor-io[async]`)
+
+        :param str api_key: Constructor.io API key
+        :param str api_token: Constructor.io API token
+        :param str security_token: Constructor security token
+        :param str service_url: API URL endpoint
+        :param aiohttp.ClientSession async_requests: Session used to send requests (a pooled session owned by the client is created on first use if omitted)
+        :param AsyncTransport transport: Transport used to send requests, takes precedence over async_requests
+        :param int pool_size: The maximum number of keep-alive connections per host. Defaults to 100
+        :param str|dict compression: Compress request bodies, see ConstructorIO
+        :param ContentLedger ledger: Ledger of the content hashes of the items and variations accepted by the API, see ConstructorIO
+
+        :return: class
+    '''
+
+    def __init__(self, options) -> None:
+        transport = options.get('transport')
+
+        self.__options = _create_options(options, 100)
+        self.__owns_transport = transport is None
+        if self.__owns_transport:
+            transport = AiohttpTransport(
+                options.get('async_requests'),
+                pool_size=self.__options.get('pool_size')
+            )
+
+        self.__options['transport'] = transport
+
+        self.autocomplete = AsyncAutocomplete(self.__options)
+        self.search = AsyncSearch(self.__options)
+        self.browse = AsyncBrowse(self.__options)
+        self.recommendations = AsyncRecommendations(self.__options)
+        self.catalog = AsyncCatalog(self.__options)
+        self.tasks = AsyncTasks(self.__options)
+        self.quizzes = AsyncQuizzes(self.__options)
+
+    def get_options(self):
+        '''Get client options'''
+
+        return self.__options
+
+    def set_options(self, options):
+        '''Set client options'''
+
+        self.__options = options
+
+    def create_page(self, timeout=None, max_concurrency=None):
+        '''
+        Create a page running the calls it declares concurrently under one latency budget
+
+        Accepts the same parameters as :meth:`ConstructorIO.create_page`
+
+        :return: AsyncPage
+        '''
+
+        return AsyncPage(timeout, max_concurrency)
+
+    async def close(self):
+        '''Close the connection pool owned by the client'''
+
+        if self.__owns_transport:
+            await self.__options.get('transport').close()
+            self.__owns_transport = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
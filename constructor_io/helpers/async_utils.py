@@ -0,0 +1,171 @@
+'''Async utility functions'''
+
+import asyncio
+import os
+from contextlib import ExitStack
+
+from constructor_io.helpers.concurrency import check_timeout
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.feeds import CsvFeed
+from constructor_io.helpers.transport import AsyncTransport, Response
+from constructor_io.helpers.utils import (create_request,
+                                          throw_http_exception_from_response)
+
+try:
+    import aiohttp
+except ImportError: # pragma: no cover
+    aiohttp = None
+
+
+def check_aiohttp_installed():
+    '''Raise an exception when the optional aiohttp dependency is not installed'''
+
+    if aiohttp is None:
+        raise ConstructorException(
+            'aiohttp is required for async requests - install it with `pip install constructor-io[async]`'
+        )
+
+def create_aiohttp_session(pool_size=100):
+    '''
+    Create a keep-alive aiohttp session backed by a connection pool per host
+
+    :param int pool_size: The maximum number of connections kept alive per host
+
+    :return: aiohttp.ClientSession
+    '''
+
+    check_aiohttp_installed()
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=pool_size)
+
+    return aiohttp.ClientSession(connector=connector)
+
+def create_form_data(file_data, exit_stack):
+    '''
+    Create multipart form data from file data created for the requests library
+
+    aiohttp streams readable files in chunks. Paths are opened, and closed by exit_stack. Iterables of
+    bytes or strings are read through a CsvFeed, as aiohttp can not send them as files.
+    '''
+
+    form_data = aiohttp.FormData()
+
+    for field_name, (file_name, content) in file_data.items():
+        if isinstance(content, os.PathLike):
+            content = exit_stack.enter_context(open(content, 'rb')) # pylint: disable=consider-using-with
+        elif not isinstance(content, (bytes, str)) and not hasattr(content, 'read'):
+            content = CsvFeed(chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in content if chunk)
+
+        form_data.add_field(field_name, content, filename=file_name)
+
+    return form_data
+
+async def iter_async(chunks):
+    '''Iterate asynchronously over an iterable of bytes, which aiohttp sends as a streamed body'''
+
+    for chunk in chunks:
+        yield chunk
+
+class AiohttpTransport(AsyncTransport):
+    '''
+    Async transport built on aiohttp
+
+    :param aiohttp.ClientSession session: Session used to send requests (a pooled session owned by the transport is created on first use if omitted)
+    :param int pool_size: The maximum number of keep-alive connections per host
+    '''
+
+    def __init__(self, session=None, pool_size=100):
+        self.__owns_session = session is None
+        self.__pool_size = pool_size
+        self.session = session
+
+        if self.__owns_session:
+            check_aiohttp_installed()
+
+    async def send(self, request):
+        # The session is created here rather than in the constructor as it must be bound to the running event loop
+        if self.session is None:
+            self.session = create_aiohttp_session(self.__pool_size)
+
+        username, password = request.auth or ('', '')
+        data = request.data
+
+        if data is not None and not isinstance(data, bytes):
+            data = iter_async(data)
+
+        with ExitStack() as exit_stack:
+            async with self.session.request(
+                request.method.upper(),
+                request.url,
+                auth=aiohttp.BasicAuth(username or '', password),
+                headers=request.headers,
+                json=request.json,
+                data=create_form_data(request.files, exit_stack) if request.files else data,
+            ) as response:
+                content = await response.read()
+
+                return Response(response.status, content, dict(response.headers), str(response.url))
+
+    async def close(self):
+        if self.__owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+async def send_async_request(options, method, url, *, headers=None, json=None, files=None):
+    # pylint: disable=too-many-arguments
+    '''Send an API request through the async transport from options and return the parsed response'''
+
+    request = create_request(options, method, url, headers=headers, json=json, files=files)
+    response = await options.get('transport').send(request)
+
+    if not response.ok:
+        throw_http_exception_from_response(response)
+
+    return response.json()
+
+async def gather_with_concurrency(coroutines, max_concurrency=None, timeout=None):
+    '''
+    Run coroutines concurrently, at most max_concurrency of them at a time
+
+    Coroutines not done within timeout seconds are cancelled and an asyncio.TimeoutError is returned in
+    place of their results.
+
+    :return: list of results, or of the exceptions raised, in the order of coroutines
+    '''
+
+    try:
+        if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency < 1):
+            raise ConstructorException('max_concurrency must be a positive integer')
+
+        check_timeout(timeout)
+    except ConstructorException:
+        for coroutine in coroutines:
+            coroutine.close()
+
+        raise
+
+    if max_concurrency is not None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        coroutines = [run(coroutine) for coroutine in coroutines]
+
+    if timeout is None:
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        for task in pending:
+            task.cancel()
+
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return [
+        asyncio.TimeoutError() if task.cancelled() else task.exception() or task.result()
+        for task in tasks
+    ]
@@ -0,0 +1,375 @@
+'''Bulk catalog uploads'''
+
+import asyncio
+import json
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import count
+from time import sleep
+
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.feeds import iter_item_groups
+
+MAX_CHUNK_SIZE = 1000
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+class BulkFailure:
+    # pylint: disable=too-few-public-methods
+    '''
+    Chunk of a bulk upload that failed after its retries
+
+    :param int index: Index of the chunk in the upload
+    :param list records: Records of the chunk, so they can be uploaded again
+    :param Exception exception: Exception raised by the last attempt
+    '''
+
+    def __init__(self, index, records, exception):
+        self.index = index
+        self.records = records
+        self.exception = exception
+
+class BulkReport:
+    '''
+    Aggregate outcome of a bulk upload
+
+    :param int num_chunks: The number of chunks reported
+    :param int num_records: The number of records of the chunks reported
+    '''
+
+    def __init__(self):
+        self.num_chunks = 0
+        self.num_records = 0
+        self.__task_ids = {}
+        self.__failures = []
+
+    @property
+    def task_ids(self):
+        '''IDs of the tasks created by the chunks uploaded, in the order of chunks'''
+
+        return [self.__task_ids[index] for index in sorted(self.__task_ids)]
+
+    @property
+    def failures(self):
+        '''BulkFailure of each chunk that failed, in the order of chunks'''
+
+        return sorted(self.__failures, key=lambda failure: failure.index)
+
+    @property
+    def ok(self):
+        '''Whether every chunk was uploaded'''
+
+        return not self.__failures
+
+    def add_result(self, index, records, result=None, exception=None):
+        '''Record the outcome of a chunk'''
+
+        self.num_chunks += 1
+        self.num_records += len(records)
+
+        if exception is not None:
+            self.__failures.append(BulkFailure(index, records, exception))
+        elif result and result.get('task_id') is not None:
+            self.__task_ids[index] = result.get('task_id')
+
+def iter_chunks(records, max_size=MAX_CHUNK_SIZE, max_bytes=MAX_CHUNK_BYTES):
+    '''
+    Split records into lists of at most max_size records and at most max_bytes once serialized to JSON
+
+    A record larger than max_bytes is sent in a chunk of its own. Records are consumed lazily.
+
+    :param iterable records: Records to split
+    :param int max_size: The maximum number of records of a chunk
+    :param int max_bytes: The maximum size of the serialized records of a chunk
+
+    :return: generator of lists
+    '''
+
+    if not isinstance(max_size, int) or max_size < 1:
+        raise ConstructorException('max_size must be a positive integer')
+
+    if not isinstance(max_bytes, int) or max_bytes < 1:
+        raise ConstructorException('max_bytes must be a positive integer')
+
+    chunk = []
+    chunk_bytes = 0
+
+    for record in records:
+        # One byte per record for the separating comma
+        record_bytes = len(json.dumps(record).encode('utf-8')) + 1
+
+        if chunk and (len(chunk) >= max_size or chunk_bytes + record_bytes > max_bytes):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+
+        chunk.append(record)
+        chunk_bytes += record_bytes
+
+    if chunk:
+        yield chunk
+
+def is_retryable(exception):
+    '''Tell whether a failed request may succeed when sent again'''
+
+    if isinstance(exception, HttpException):
+        return isinstance(exception.status, int) and (exception.status == 429 or exception.status >= 500)
+
+    return not isinstance(exception, ConstructorException)
+
+def _check_bulk_options(max_concurrency, retries):
+    '''Raise an exception when max_concurrency or retries are invalid'''
+
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ConstructorException('max_concurrency must be a positive integer')
+
+    if not isinstance(retries, int) or retries < 0:
+        raise ConstructorException('retries must be a non-negative integer')
+
+def _upload_with_retries(upload, records, retries, backoff):
+    for attempt in count():
+        try:
+            return upload(records)
+        except Exception as exception: # pylint: disable=broad-except
+            if attempt >= retries or not is_retryable(exception):
+                raise
+
+            sleep(backoff * 2 ** attempt)
+
+    return None # pragma: no cover
+
+def upload_chunks(executor, chunks, upload, *, max_concurrency=4, retries=2, backoff=0.5, report=None):
+    # pylint: disable=too-many-arguments
+    '''
+    Upload chunks concurrently, at most max_concurrency at a time
+
+    Chunks are consumed lazily, so at most max_concurrency chunks are held in memory. A chunk failing
+    with a rate limit, server or network error is retried with exponential backoff.
+
+    :param concurrent.futures.Executor executor: Executor running the uploads
+    :param iterable chunks: Lists of records to upload
+    :param function upload: Function taking a list of records and returning the response data (dict)
+    :param int max_concurrency: The maximum number of chunks uploaded at the same time
+    :param int retries: The number of times a failed chunk is sent again
+    :param float backoff: Seconds to wait before the first retry, doubled at each retry
+    :param BulkReport report: Report of an earlier stage of the same upload to add the outcomes to
+
+    :return: BulkReport
+    '''
+
+    _check_bulk_options(max_concurrency, retries)
+
+    report = report or BulkReport()
+    chunks = enumerate(chunks, report.num_chunks)
+    in_flight = {}
+
+    def submit_next():
+        index, records = next(chunks, (None, None))
+
+        if records is not None:
+            future = executor.submit(_upload_with_retries, upload, records, retries, backoff)
+            in_flight[future] = (index, records)
+
+    try:
+        for _ in range(max_concurrency):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, records = in_flight.pop(future)
+                exception = future.exception()
+                report.add_result(index, records, None if exception else future.result(), exception)
+                submit_next()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+    return report
+
+async def _upload_with_retries_async(upload, records, retries, backoff):
+    for attempt in count():
+        try:
+            return await upload(records)
+        except Exception as exception: # pylint: disable=broad-except
+            if attempt >= retries or not is_retryable(exception):
+                raise
+
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+    return None # pragma: no cover
+
+async def upload_chunks_async(chunks, upload, *, max_concurrency=4, retries=2, backoff=0.5, report=None):
+    # pylint: disable=too-many-arguments
+    '''
+    Upload chunks concurrently, at most max_concurrency at a time
+
+    Accepts the same parameters as :func:`upload_chunks` except executor, upload is a coroutine function
+
+    :return: BulkReport
+    '''
+
+    _check_bulk_options(max_concurrency, retries)
+
+    report = report or BulkReport()
+    chunks = enumerate(chunks, report.num_chunks)
+    in_flight = {}
+
+    def submit_next():
+        index, records = next(chunks, (None, None))
+
+        if records is not None:
+            task = asyncio.ensure_future(_upload_with_retries_async(upload, records, retries, backoff))
+            in_flight[task] = (index, records)
+
+    try:
+        for _ in range(max_concurrency):
+            submit_next()
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                index, records = in_flight.pop(task)
+                exception = task.exception()
+                report.add_result(index, records, None if exception else task.result(), exception)
+                submit_next()
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+    return report
+
+def flatten_item_groups(item_groups):
+    '''
+    Flatten a tree of item groups into levels, parents before children
+
+    Children are given the parent_id of their parent and lose their children attribute. An item group
+    given with a parent_id is placed one level below its parent when the parent is part of item_groups.
+
+    :param list item_groups: Item groups, with children
+    :return: list of levels (lists of item groups), from the roots down
+    '''
+
+    if not isinstance(item_groups, list):
+        raise ConstructorException('item_groups is a required parameter of type list')
+
+    groups = list(iter_item_groups(item_groups))
+    groups_by_id = { group.get('id'): group for group in groups }
+    depths = {}
+    levels = {}
+
+    for group in groups:
+        chain = []
+        ancestor = group
+
+        # Walk up to the first ancestor of known depth, or to a root
+        while ancestor.get('id') not in depths:
+            parent = groups_by_id.get(ancestor.get('parent_id'))
+
+            if parent is None:
+                depths[ancestor.get('id')] = 0
+            else:
+                if ancestor.get('id') in chain:
+                    raise ConstructorException(f'item group {ancestor.get("id")} is its own ancestor')
+
+                chain.append(ancestor.get('id'))
+                ancestor = parent
+
+        depth = depths[ancestor.get('id')]
+
+        for group_id in reversed(chain):
+            depth += 1
+            depths[group_id] = depth
+
+        levels.setdefault(depths[group.get('id')], []).append(group)
+
+    return [levels[depth] for depth in sorted(levels)]
+
+def _skip_orphans(level, failed_ids, create_chunks, report):
+    '''
+    Report the item groups of a level whose parent was not uploaded as failed
+
+    :return: list of the other item groups of the level
+    '''
+
+    groups = [group for group in level if group.get('parent_id') not in failed_ids]
+    orphans = [group for group in level if group.get('parent_id') in failed_ids]
+
+    for chunk in create_chunks(orphans):
+        report.add_result(
+            report.num_chunks,
+            chunk,
+            exception=ConstructorException('parent item group was not uploaded'),
+        )
+
+    return groups
+
+def _get_failed_ids(report, num_failures):
+    '''Get the IDs of the records of the failures reported after the first num_failures'''
+
+    return { record.get('id') for failure in report.failures[num_failures:] for record in failure.records }
+
+def upload_levels(executor, levels, create_chunks, upload, *, max_concurrency=4, retries=2):
+    # pylint: disable=too-many-arguments
+    '''
+    Upload levels of item groups one after the other, the chunks of each level concurrently
+
+    Item groups whose parent failed to upload are not sent and are reported as failed.
+
+    :param concurrent.futures.Executor executor: Executor running the uploads
+    :param list levels: Lists of item groups, from the roots down, see flatten_item_groups
+    :param function create_chunks: Function splitting a list of item groups into chunks, such as iter_chunks
+    :param function upload: Function taking a list of item groups and returning the response data (dict)
+    :param int max_concurrency: The maximum number of chunks uploaded at the same time
+    :param int retries: The number of times a failed chunk is sent again
+
+    :return: BulkReport
+    '''
+
+    report = BulkReport()
+    failed_ids = set()
+
+    for level in levels:
+        num_failures = len(report.failures)
+        groups = _skip_orphans(level, failed_ids, create_chunks, report)
+
+        upload_chunks(
+            executor,
+            create_chunks(groups),
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+            report=report,
+        )
+        failed_ids |= _get_failed_ids(report, num_failures)
+
+    return report
+
+async def upload_levels_async(levels, create_chunks, upload, *, max_concurrency=4, retries=2):
+    '''
+    Upload levels of item groups one after the other, the chunks of each level concurrently
+
+    Accepts the same parameters as :func:`upload_levels` except executor, upload is a coroutine function
+
+    :return: BulkReport
+    '''
+
+    report = BulkReport()
+    failed_ids = set()
+
+    for level in levels:
+        num_failures = len(report.failures)
+        groups = _skip_orphans(level, failed_ids, create_chunks, report)
+
+        await upload_chunks_async(
+            create_chunks(groups),
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+            report=report,
+        )
+        failed_ids |= _get_failed_ids(report, num_failures)
+
+    return report
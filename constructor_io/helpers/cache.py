@@ -0,0 +1,250 @@
+'''Response caching'''
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from constructor_io.helpers.concurrency import LazyThreadPoolExecutor
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.transport import Transport
+
+CACHEABLE_ENDPOINTS = (
+    'autocomplete',
+    'search',
+    'browse',
+    'browse_groups',
+    'browse_facets',
+    'browse_facet_options',
+    'recommendations',
+)
+
+
+class LRUCache:
+    # pylint: disable=too-many-instance-attributes
+    '''
+    Thread-safe least recently used cache with a time to live per entry
+
+    :param int max_size: The maximum number of entries kept in the cache
+    :param float ttl: The number of seconds an entry is fresh for after it was stored
+    :param float stale_while_revalidate: The number of seconds after ttl an entry can still be served as stale
+    '''
+
+    def __init__(self, max_size=1000, ttl=60, stale_while_revalidate=0):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ConstructorException('max_size must be a positive integer')
+
+        if not isinstance(ttl, (int, float)) or ttl <= 0:
+            raise ConstructorException('ttl must be a positive number')
+
+        if not isinstance(stale_while_revalidate, (int, float)) or stale_while_revalidate < 0:
+            raise ConstructorException('stale_while_revalidate must be a non-negative number')
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def lookup(self, key):
+        '''
+        Look up the value stored for key
+
+        :return: tuple of the value (None if missing or expired) and whether the value is stale
+        '''
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            now = monotonic()
+
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self.__entries[key]
+
+                self.misses += 1
+
+                return None, False
+
+            self.__entries.move_to_end(key)
+            stale = entry[0] <= now
+
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+
+            return entry[2], stale
+
+    def get(self, key):
+        '''Return the value stored for key, or None if it is missing or expired'''
+
+        return self.lookup(key)[0]
+
+    def set(self, key, value):
+        '''Store value for key, evicting the least recently used entry when full'''
+
+        with self.__lock:
+            fresh_until = monotonic() + self.ttl
+            self.__entries[key] = (fresh_until, fresh_until + self.stale_while_revalidate, value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key):
+        '''Remove the entry stored for key, if any'''
+
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        '''Remove all entries'''
+
+        with self.__lock:
+            self.__entries.clear()
+
+def create_cache_key(request):
+    '''
+    Create a cache key from a request
+
+    Query parameters are sorted by name and the `_dt` timestamp is dropped, so identical requests made at
+    different times share an entry. Credentials and headers are part of the key.
+    '''
+
+    scheme, netloc, path, query, fragment = urlsplit(request.url)
+    query_params = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True) if key != '_dt']
+    query_params.sort(key=lambda param: param[0])
+    canonical_url = urlunsplit((scheme, netloc, path, urlencode(query_params), fragment))
+
+    return (
+        request.method,
+        canonical_url,
+        request.auth,
+        tuple(sorted(request.headers.items())),
+    )
+
+def get_endpoint_names(url, service_url):
+    '''
+    Get the names of the API endpoints a request URL targets, most specific first
+
+    For example ['browse_groups', 'browse'] for the browse groups endpoint and ['search'] for search
+    '''
+
+    path = url[len(service_url):] if url.startswith(service_url) else urlsplit(url).path
+    segments = path.split('?', 1)[0].strip('/').split('/')
+
+    if segments[0] == 'browse' and len(segments) == 2 and segments[1] in ('groups', 'facets', 'facet_options'):
+        return [f'browse_{segments[1]}', 'browse']
+
+    return segments[:1]
+
+class CachingTransport(Transport):
+    '''
+    Transport caching successful GET responses of another transport
+
+    Stale entries of policies with `stale_while_revalidate` are served immediately while they are
+    refreshed in the background. Once an entry is older than `ttl` + `stale_while_revalidate` the
+    caller waits for a new response.
+
+    :param Transport transport: Transport used to send requests on cache misses
+    :param dict policies: Cache options per endpoint, such as { 'search': { 'ttl': 60, 'max_size': 1000 } }
+    :param str service_url: API URL endpoint the request URLs are relative to
+    :param concurrent.futures.Executor executor: Executor running background refreshes, such as the executor shared between modules (a thread pool owned by the transport is created if omitted)
+    '''
+
+    def __init__(self, transport, policies, service_url, executor=None):
+        if not isinstance(policies, dict):
+            raise ConstructorException('cache must be a dictionary')
+
+        for endpoint_name in policies:
+            if endpoint_name not in CACHEABLE_ENDPOINTS:
+                raise ConstructorException(
+                    f'cache endpoint must be one of {", ".join(CACHEABLE_ENDPOINTS)}'
+                )
+
+        self.transport = transport
+        self.service_url = service_url
+        self.caches = {
+            endpoint_name: LRUCache(**(policy or {}))
+            for endpoint_name, policy in policies.items()
+        }
+        self.__refreshing = set()
+        self.__lock = Lock()
+        self.__owns_executor = executor is None
+        self.__executor = executor or LazyThreadPoolExecutor()
+
+    def __get_cache(self, request):
+        if request.method != 'get':
+            return None
+
+        for endpoint_name in get_endpoint_names(request.url, self.service_url):
+            cache = self.caches.get(endpoint_name)
+
+            if cache is not None:
+                return cache
+
+        return None
+
+    def __refresh(self, cache, key, request):
+        try:
+            response = self.transport.send(request)
+
+            if response.ok:
+                cache.set(key, response)
+        except Exception: # pylint: disable=broad-except
+            # Keep serving the stale response until it expires, the next caller will retry
+            pass
+        finally:
+            with self.__lock:
+                self.__refreshing.discard(key)
+
+    def __refresh_in_background(self, cache, key, request):
+        with self.__lock:
+            if key in self.__refreshing:
+                return
+
+            self.__refreshing.add(key)
+
+        try:
+            self.__executor.submit(self.__refresh, cache, key, request)
+        except RuntimeError:
+            # The executor was shut down, keep serving the stale response until it expires
+            with self.__lock:
+                self.__refreshing.discard(key)
+
+    def send(self, request):
+        cache = self.__get_cache(request)
+
+        if cache is None:
+            return self.transport.send(request)
+
+        key = create_cache_key(request)
+        response, stale = cache.lookup(key)
+
+        if response is None:
+            response = self.transport.send(request)
+
+            if response.ok:
+                cache.set(key, response)
+        elif stale:
+            self.__refresh_in_background(cache, key, request)
+
+        return response
+
+    def clear(self):
+        '''Remove all cached responses'''
+
+        for cache in self.caches.values():
+            cache.clear()
+
+    def close(self):
+        '''Wait for background refreshes to complete and stop their threads, unless the executor was supplied'''
+
+        if self.__owns_executor:
+            self.__executor.shutdown(wait=True)
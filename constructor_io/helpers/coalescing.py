@@ -0,0 +1,54 @@
+'''Request coalescing'''
+
+from concurrent.futures import Future
+from threading import Lock
+
+from constructor_io.helpers.cache import create_cache_key
+from constructor_io.helpers.transport import Response, Transport
+
+
+class CoalescingTransport(Transport):
+    '''
+    Transport sharing one network call between identical GET requests in flight at the same time
+
+    Requests are identical when their cache keys are equal: same method, URL (ignoring the order of query
+    parameters and the `_dt` timestamp), credentials and headers. Each caller receives its own copy of the
+    response, so parsed results are never shared between callers.
+
+    :param Transport transport: Transport used to send requests
+    '''
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.coalesced = 0
+        self.__in_flight = {}
+        self.__lock = Lock()
+
+    def send(self, request):
+        if request.method != 'get':
+            return self.transport.send(request)
+
+        key = create_cache_key(request)
+
+        with self.__lock:
+            future = self.__in_flight.get(key)
+            leader = future is None
+
+            if leader:
+                future = self.__in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                future.set_result(self.transport.send(request))
+            except BaseException as exception:
+                future.set_exception(exception)
+                raise
+            finally:
+                with self.__lock:
+                    del self.__in_flight[key]
+
+        response = future.result()
+
+        return Response(response.status_code, response.content, dict(response.headers), response.url)
@@ -0,0 +1,146 @@
+'''Page composition'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+
+from constructor_io.helpers.async_utils import gather_with_concurrency
+from constructor_io.helpers.concurrency import check_timeout, submit_all
+from constructor_io.helpers.exception import ConstructorException
+
+
+class PageResults(dict):
+    '''
+    Results of the calls of a page that finished in time, keyed by call name
+
+    :param list timed_out: Names of the calls not done by the deadline
+    :param dict errors: Exceptions raised by the calls that failed, keyed by call name
+    '''
+
+    def __init__(self, results=None, timed_out=None, errors=None):
+        super().__init__(results or {})
+        self.timed_out = timed_out or []
+        self.errors = errors or {}
+
+class _PageCalls:
+    '''Named calls declared by a page'''
+
+    def __init__(self, timeout, max_concurrency):
+        check_timeout(timeout)
+
+        if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency < 1):
+            raise ConstructorException('max_concurrency must be a positive integer')
+
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._calls = {}
+
+    def add(self, name, function, *args, **kwargs):
+        '''
+        Declare a call of the page
+
+        :param str name: Name of the call, its results are keyed by it
+        :param function function: Client method to call, such as client.search.get_search_results
+        :param args: Positional arguments of the call
+        :param kwargs: Keyword arguments of the call
+
+        :return: the page, so calls can be chained
+        '''
+
+        if not name or not isinstance(name, str):
+            raise ConstructorException('name is a required parameter of type string')
+
+        if name in self._calls:
+            raise ConstructorException(f'a call named {name} was already added')
+
+        if not callable(function):
+            raise ConstructorException('function is a required parameter of type function')
+
+        self._calls[name] = partial(function, *args, **kwargs)
+
+        return self
+
+class Page(_PageCalls):
+    '''
+    Calls needed by a page, run concurrently under one latency budget
+
+    Calls run on threads of the page over the shared connection pool, so calls fanning out themselves,
+    such as get_recommendation_results_many, never wait for a thread held by their page. Calls not done by
+    the deadline are cancelled if they have not started yet and are listed in timed_out, so slow optional
+    widgets never delay the rest of the page.
+
+    :param concurrent.futures.Executor executor: Executor running the calls, it must not be the executor the calls fan out on (a thread pool owned by the page is started for each run if omitted)
+    :param float timeout: Seconds to wait for all calls (no deadline if omitted)
+    :param int max_concurrency: The maximum number of calls running at the same time (all calls at once if omitted)
+    '''
+
+    def __init__(self, executor=None, timeout=None, max_concurrency=None):
+        super().__init__(timeout, max_concurrency)
+        self.__executor = executor
+
+    def run(self):
+        '''
+        Run the calls of the page
+
+        :return: PageResults
+        '''
+
+        calls = list(self._calls.values())
+        executor = self.__executor or ThreadPoolExecutor(
+            max_workers=max(min(self.max_concurrency or len(calls), len(calls)), 1),
+            thread_name_prefix='constructorio-page',
+        )
+
+        try:
+            futures = submit_all(executor, calls, self.max_concurrency)
+            done, _ = wait(futures, self.timeout)
+        finally:
+            if self.__executor is None:
+                # Calls still running finish in the background, their results are discarded
+                executor.shutdown(wait=False)
+
+        results = PageResults()
+
+        # Each call is classified once, from the futures done by the deadline
+        for name, future in zip(self._calls, futures):
+            if future not in done or future.cancelled():
+                future.cancel()
+                results.timed_out.append(name)
+            elif future.exception() is not None:
+                results.errors[name] = future.exception()
+            else:
+                results[name] = future.result()
+
+        return results
+
+class AsyncPage(_PageCalls):
+    '''
+    Calls needed by a page, run concurrently under one latency budget
+
+    Accepts the same parameters as :class:`Page` except executor, calls are coroutine functions such as
+    async_client.search.get_search_results. Calls not done by the deadline are cancelled.
+    '''
+
+    async def run(self):
+        '''
+        Run the calls of the page
+
+        :return: PageResults
+        '''
+
+        outcomes = await gather_with_concurrency(
+            [call() for call in self._calls.values()],
+            self.max_concurrency,
+            self.timeout,
+        )
+        results = PageResults()
+
+        for name, result in zip(self._calls, outcomes):
+            if isinstance(result, asyncio.TimeoutError):
+                results.timed_out.append(name)
+            elif isinstance(result, Exception):
+                results.errors[name] = result
+            else:
+                results[name] = result
+
+        return results
@@ -0,0 +1,163 @@
+'''Request body compression'''
+
+import json as jsonlib
+import zlib
+from threading import Lock
+
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.multipart import MultipartStream
+
+try:
+    from compression import zstd
+except ImportError: # pragma: no cover
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+CHUNK_SIZE = 64 * 1024
+ALGORITHMS = ('gzip', 'zstd')
+
+
+class CompressionStats:
+    '''
+    Thread-safe counters of the request bodies compressed by a client
+
+    :param int requests: The number of request bodies compressed
+    :param int bytes_in: The number of bytes of the bodies before compression
+    :param int bytes_out: The number of bytes sent after compression
+    '''
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.__lock = Lock()
+
+    @property
+    def bytes_saved(self):
+        '''The number of bytes not sent thanks to compression'''
+
+        return self.bytes_in - self.bytes_out
+
+    def add(self, requests=0, bytes_in=0, bytes_out=0):
+        '''Add to the counters'''
+
+        with self.__lock:
+            self.requests += requests
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+def create_compression_options(compression):
+    '''
+    Validate the compression client option
+
+    :param str|dict compression: 'gzip' or 'zstd', or a dict such as { 'algorithm': 'gzip', 'level': 6 }
+
+    :return: dict with the algorithm and level, or None if compression is disabled
+    '''
+
+    if not compression:
+        return None
+
+    if isinstance(compression, str):
+        compression = { 'algorithm': compression }
+
+    if not isinstance(compression, dict):
+        raise ConstructorException('compression must be an algorithm name or a dict')
+
+    algorithm = compression.get('algorithm', 'gzip')
+    level = compression.get('level')
+
+    if algorithm not in ALGORITHMS:
+        raise ConstructorException(f'compression algorithm must be one of {", ".join(ALGORITHMS)}')
+
+    if algorithm == 'zstd' and zstd is None:
+        raise ConstructorException('zstd compression requires Python 3.14 or the zstandard package')
+
+    if level is not None and not isinstance(level, int):
+        raise ConstructorException('compression level must be an integer')
+
+    return { 'algorithm': algorithm, 'level': level }
+
+def _create_compressor(algorithm, level):
+    '''Create a compressor with compress and flush methods'''
+
+    if algorithm == 'gzip':
+        level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+
+        # A window size of 16 + 15 bits produces a gzip header and trailer
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    if hasattr(zstd, 'ZstdCompressor') and hasattr(zstd.ZstdCompressor, 'compressobj'):
+        # zstandard package
+        return zstd.ZstdCompressor(level=3 if level is None else level).compressobj()
+
+    return zstd.ZstdCompressor(level=level)
+
+def _iter_json(json):
+    '''Iterate over the JSON serialization of an object in chunks of about CHUNK_SIZE bytes'''
+
+    pieces = []
+    size = 0
+
+    for piece in jsonlib.JSONEncoder().iterencode(json):
+        pieces.append(piece)
+        size += len(piece)
+
+        if size >= CHUNK_SIZE:
+            yield ''.join(pieces).encode('utf-8')
+            pieces = []
+            size = 0
+
+    if pieces:
+        yield ''.join(pieces).encode('utf-8')
+
+def _compress(chunks, compressor, stats):
+    '''Compress chunks of bytes as they are read, counting the bytes in and out'''
+
+    bytes_in = 0
+    bytes_out = 0
+
+    for chunk in chunks:
+        bytes_in += len(chunk)
+        compressed = compressor.compress(chunk)
+
+        if compressed:
+            bytes_out += len(compressed)
+            yield compressed
+
+    compressed = compressor.flush()
+    bytes_out += len(compressed)
+    stats.add(1, bytes_in, bytes_out)
+
+    yield compressed
+
+def compress_body(options, headers, json=None, files=None):
+    '''
+    Compress a JSON or multipart request body when compression is enabled in the client options
+
+    The body is serialized and compressed in chunks as it is sent, so it is never held in memory as a
+    whole. The client compression_stats count the bytes once the body was sent.
+
+    :return: tuple of the headers and the compressed body (generator of bytes), or None when the body is not compressed
+    '''
+
+    compression = options.get('compression')
+
+    if not compression or (json is None and not files):
+        return None
+
+    headers = dict(headers or {})
+
+    if files:
+        body = MultipartStream(files)
+        headers['Content-Type'] = body.content_type
+    else:
+        body = _iter_json(json)
+        headers['Content-Type'] = 'application/json'
+
+    headers['Content-Encoding'] = compression.get('algorithm')
+    compressor = _create_compressor(compression.get('algorithm'), compression.get('level'))
+
+    return headers, _compress(body, compressor, options.get('compression_stats'))
@@ -0,0 +1,155 @@
+'''Concurrency utility functions'''
+
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+from time import monotonic
+
+from constructor_io.helpers.exception import ConstructorException
+
+
+class LazyThreadPoolExecutor:
+    '''
+    Thread pool executor whose threads are only started once work is submitted
+
+    :param int max_workers: The maximum number of threads running submitted calls
+    '''
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.__executor = None
+        self.__lock = Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        '''Schedule fn(*args, **kwargs) to be run and return its future'''
+
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='constructorio',
+                )
+
+            return self.__executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        '''Stop the threads of the pool, it is restarted if more work is submitted'''
+
+        with self.__lock:
+            executor = self.__executor
+            self.__executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+def get_executor(options):
+    '''Get the executor shared between modules, creating one if the options have none'''
+
+    executor = options.get('executor')
+
+    if executor is None:
+        executor = options.setdefault('executor', LazyThreadPoolExecutor())
+
+    return executor
+
+def submit_all(executor, calls, max_concurrency=None):
+    '''
+    Submit calls taking no arguments to an executor, running at most max_concurrency of them at a time
+
+    Calls are started in order. Cancelling the future of a call that has not started yet, including one
+    waiting in the queue of the executor, skips it.
+
+    :param concurrent.futures.Executor executor: Executor running the calls
+    :param list calls: Functions to call
+    :param int max_concurrency: The maximum number of calls running at the same time (limited by the executor only if omitted)
+
+    :return: list of concurrent.futures.Future, in the order of calls
+    '''
+
+    if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency < 1):
+        raise ConstructorException('max_concurrency must be a positive integer')
+
+    futures = [Future() for _ in calls]
+    pending = iter(list(zip(futures, calls)))
+    lock = Lock()
+
+    def run(future, call):
+        # The future stays pending while queued, so it can be cancelled until a thread picks it up
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(call())
+        except BaseException as exception: # pylint: disable=broad-except
+            future.set_exception(exception)
+
+    def submit_next(_=None):
+        while True:
+            with lock:
+                future, call = next(pending, (None, None))
+
+            if future is None:
+                return
+
+            if future.cancelled():
+                continue
+
+            try:
+                executor.submit(run, future, call)
+            except RuntimeError as exception:
+                # The executor was shut down, fail the remaining calls rather than leaving them pending
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(exception)
+
+                continue
+
+            future.add_done_callback(submit_next)
+
+            return
+
+    for _ in range(min(max_concurrency or len(calls), len(calls))):
+        submit_next()
+
+    return futures
+
+def get_result_or_exception(future, timeout=None):
+    '''Wait for a future and return its result, or the exception it raised'''
+
+    exception = future.exception(timeout)
+
+    return future.result() if exception is None else exception
+
+def check_timeout(timeout):
+    '''Raise an exception when a timeout is neither omitted nor a positive number of seconds'''
+
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise ConstructorException('timeout must be a positive number')
+
+def get_results_or_exceptions(futures, timeout=None):
+    '''
+    Wait for futures sharing a single deadline and return their results, or the exceptions they raised
+
+    Futures not done by the deadline are cancelled and a TimeoutError is returned in place of their results.
+
+    :param list futures: Futures to wait for
+    :param float timeout: Seconds to wait for all futures (no deadline if omitted)
+
+    :return: list of results or exceptions, in the order of futures
+    '''
+
+    check_timeout(timeout)
+
+    deadline = None if timeout is None else monotonic() + timeout
+    results = []
+
+    for future in futures:
+        try:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            results.append(get_result_or_exception(future, remaining))
+        except FutureTimeoutError as exception:
+            future.cancel()
+            results.append(exception)
+        except CancelledError as exception:
+            results.append(exception)
+
+    return results
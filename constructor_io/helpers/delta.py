@@ -0,0 +1,265 @@
+'''Catalog delta files'''
+
+import csv
+import io
+import json
+import os
+import zlib
+from contextlib import ExitStack, contextmanager
+from hashlib import blake2b
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.feeds import CsvFeed
+
+KEY_COLUMNS = ('variation_id', 'id', 'item_id')
+CATALOG_FILES = ('items', 'variations', 'item_groups')
+PARTITIONS = 16
+
+
+class CsvDelta:
+    '''
+    Rows of a catalog file added, changed or removed since a previous version of the file
+
+    :param str path: Path of the CSV file with the rows added or changed, None when there are none
+    :param str key_column: The column identifying rows
+    :param int num_added: The number of rows not in the previous file
+    :param int num_changed: The number of rows whose values changed
+    :param int num_unchanged: The number of rows left out of the delta
+    :param list removed_ids: IDs of the rows of the previous file no longer in the current one
+    '''
+
+    def __init__(self, path=None, key_column=None):
+        self.path = path
+        self.key_column = key_column
+        self.num_added = 0
+        self.num_changed = 0
+        self.num_unchanged = 0
+        self.removed_ids = []
+
+class CatalogDelta(dict):
+    '''
+    CsvDelta of each catalog file compared, keyed by file name (items, variations or item_groups)
+
+    :param dict response: Response of the patch_catalog request sending the delta, None if no row was added or changed
+    '''
+
+    def __init__(self, deltas=None, response=None):
+        super().__init__(deltas or {})
+        self.response = response
+
+    @property
+    def files(self):
+        '''Paths of the delta files with rows to send, as parameters of patch_catalog'''
+
+        # A string would be uploaded as the content of the file, only os.PathLike files are read from disk
+        return { name: Path(delta.path) for name, delta in self.items() if delta.path }
+
+    @property
+    def removed_ids(self):
+        '''IDs of the rows removed from each catalog file, keyed by file name'''
+
+        return { name: delta.removed_ids for name, delta in self.items() if delta.removed_ids }
+
+@contextmanager
+def open_csv(file):
+    '''
+    Open a catalog CSV file as a text stream
+
+    Accepts the same files as catalog uploads: bytes, CSV text (str), paths (os.PathLike, such as
+    pathlib.Path), binary or text streams and iterables of bytes. A string is the content of the file,
+    not its path.
+    '''
+
+    if isinstance(file, os.PathLike):
+        with open(file, newline='', encoding='utf-8') as stream:
+            yield stream
+    elif isinstance(file, bytes):
+        yield io.StringIO(file.decode('utf-8'), newline='')
+    elif isinstance(file, str):
+        yield io.StringIO(file, newline='')
+    elif isinstance(file, io.TextIOBase):
+        yield file
+    elif hasattr(file, 'read'):
+        stream = io.TextIOWrapper(file, encoding='utf-8', newline='')
+
+        try:
+            yield stream
+        finally:
+            # Leave the binary stream of the caller open
+            stream.detach()
+    elif hasattr(file, '__iter__'):
+        chunks = (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in file)
+
+        yield io.TextIOWrapper(io.BufferedReader(CsvFeed(chunks)), encoding='utf-8', newline='')
+    else:
+        raise ConstructorException('catalog files must be bytes, strings, paths, streams or iterables of bytes')
+
+def _get_key_index(header, key_column):
+    '''Get the index of the column identifying rows, the first of KEY_COLUMNS in the header by default'''
+
+    for column in [key_column] if key_column else KEY_COLUMNS:
+        if column in header:
+            return header.index(column)
+
+    raise ConstructorException(f'catalog file has no {key_column or " or ".join(KEY_COLUMNS)} column')
+
+def _get_digest(header, row):
+    '''
+    Hash the values of a row by column name
+
+    Empty values are left out, so adding an empty column or reordering columns does not change rows.
+    '''
+
+    values = sorted((column, value) for column, value in zip(header, row) if value)
+
+    return blake2b(json.dumps(values).encode('utf-8'), digest_size=16).hexdigest()
+
+def _get_partition(key, partitions):
+    return zlib.crc32(key.encode('utf-8')) % partitions
+
+def _iter_rows(reader, key_index):
+    '''Iterate over the rows of a CSV file with their key, skipping blank lines'''
+
+    for row in reader:
+        if not any(row):
+            continue
+
+        key = row[key_index] if key_index < len(row) else ''
+
+        if not key:
+            raise ConstructorException(f'row {reader.line_num} of catalog file has no ID')
+
+        yield key, row
+
+def _get_partition_paths(directory, prefix, partitions):
+    return [os.path.join(directory, f'{prefix}-{partition}.csv') for partition in range(partitions)]
+
+def _partition(rows, paths, to_record):
+    '''Write keyed rows to one partition file per path by key, as records returned by to_record'''
+
+    with ExitStack() as stack:
+        writers = [
+            csv.writer(stack.enter_context(open(path, 'w', newline='', encoding='utf-8')))
+            for path in paths
+        ]
+
+        for key, row in rows:
+            writers[_get_partition(key, len(paths))].writerow(to_record(key, row))
+
+    return paths
+
+def diff_csv(previous, current, output, key_column=None, partitions=PARTITIONS):
+    # pylint: disable=too-many-arguments,too-many-locals
+    '''
+    Compare two versions of a catalog CSV file and write the rows added or changed to a new file
+
+    Both files are streamed and split into partitions by row ID on disk, so only the IDs and hashes of
+    one partition of the previous file are held in memory at a time. Rows of the delta keep the columns
+    of the current file but are ordered by partition.
+
+    :param file previous: The previous CSV file, any file accepted by open_csv (None if there was none)
+    :param file current: The current CSV file, any file accepted by open_csv
+    :param str output: Path of the CSV file to write the rows added or changed to
+    :param str key_column: The column identifying rows, the first of variation_id, id and item_id in the header if omitted
+    :param int partitions: The number of partitions, more partitions hold less in memory
+
+    :return: CsvDelta
+    '''
+
+    if not isinstance(partitions, int) or partitions < 1:
+        raise ConstructorException('partitions must be a positive integer')
+
+    with TemporaryDirectory() as directory, open_csv(current) as current_stream:
+        current_reader = csv.reader(current_stream)
+        header = next(current_reader, None)
+
+        if not header:
+            raise ConstructorException('current catalog file is empty')
+
+        key_index = _get_key_index(header, key_column)
+        delta = CsvDelta(output, header[key_index])
+        current_paths = _partition(
+            _iter_rows(current_reader, key_index),
+            _get_partition_paths(directory, 'current', partitions),
+            lambda key, row: row,
+        )
+        previous_paths = [None] * partitions
+
+        if previous is not None:
+            with open_csv(previous) as previous_stream:
+                previous_reader = csv.reader(previous_stream)
+                previous_header = next(previous_reader, None) or []
+
+                if previous_header:
+                    previous_paths = _partition(
+                        _iter_rows(previous_reader, _get_key_index(previous_header, delta.key_column)),
+                        _get_partition_paths(directory, 'previous', partitions),
+                        lambda key, row: (key, _get_digest(previous_header, row)),
+                    )
+
+        with open(output, 'w', newline='', encoding='utf-8') as output_stream:
+            writer = csv.writer(output_stream)
+            writer.writerow(header)
+
+            for current_path, previous_path in zip(current_paths, previous_paths):
+                digests = {}
+
+                if previous_path:
+                    with open(previous_path, newline='', encoding='utf-8') as partition:
+                        digests = dict(csv.reader(partition))
+
+                with open(current_path, newline='', encoding='utf-8') as partition:
+                    for row in csv.reader(partition):
+                        key = row[key_index]
+                        digest = digests.pop(key, None)
+
+                        if digest is None:
+                            delta.num_added += 1
+                        elif digest != _get_digest(header, row):
+                            delta.num_changed += 1
+                        else:
+                            delta.num_unchanged += 1
+                            continue
+
+                        writer.writerow(row)
+
+                delta.removed_ids.extend(digests)
+
+    if not delta.num_added and not delta.num_changed:
+        os.remove(output)
+        delta.path = None
+
+    return delta
+
+def build_catalog_delta(previous, current, directory, partitions=PARTITIONS):
+    '''
+    Compare two versions of catalog files and write the rows added or changed to delta files
+
+    :param dict previous: The previous catalog files keyed by file name (items, variations or item_groups)
+    :param dict current: The current catalog files keyed by file name
+    :param str directory: Directory to write the delta files to
+    :param int partitions: The number of partitions each file is split into, see diff_csv
+
+    :return: CatalogDelta
+    '''
+
+    if not isinstance(current, dict) or not current:
+        raise ConstructorException('current is a required parameter of type dict')
+
+    if previous is not None and not isinstance(previous, dict):
+        raise ConstructorException('previous must be a dict')
+
+    deltas = CatalogDelta()
+
+    for name in CATALOG_FILES:
+        if current.get(name) is not None:
+            deltas[name] = diff_csv(
+                (previous or {}).get(name),
+                current.get(name),
+                os.path.join(directory, f'{name}.csv'),
+                partitions=partitions,
+            )
+
+    return deltas
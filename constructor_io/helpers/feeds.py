@@ -0,0 +1,246 @@
+'''Catalog CSV feeds'''
+
+import csv
+import io
+import json
+from itertools import chain, islice
+
+from constructor_io.helpers.exception import ConstructorException
+
+CHUNK_SIZE = 64 * 1024
+SAMPLE_SIZE = 1000
+MULTIPLE_VALUES_DELIMITER = '|'
+
+ITEM_ATTRIBUTES = { 'id': 'id', 'name': 'item_name', 'suggested_score': 'suggested_score' }
+VARIATION_ATTRIBUTES = {
+    'id': 'variation_id',
+    'item_id': 'item_id',
+    'name': 'item_name',
+    'suggested_score': 'suggested_score',
+}
+ITEM_GROUP_ATTRIBUTES = { 'id': 'id', 'name': 'name', 'parent_id': 'parent_id' }
+
+# Attributes of data with columns of their own, the other attributes are metadata
+ITEM_DATA_COLUMNS = ('url', 'image_url', 'description', 'keywords', 'active', 'group_ids')
+VARIATION_DATA_COLUMNS = ('url', 'image_url', 'description', 'keywords', 'active')
+MULTIPLE_VALUES_COLUMNS = ('keywords', 'group_ids')
+
+
+class CsvFeed(io.RawIOBase):
+    '''
+    Catalog CSV file encoded from records as it is read
+
+    A feed is a readable stream that can be given as a file to replace_catalog, update_catalog or
+    patch_catalog. Only the chunk being read is held in memory, so it can only be read once.
+
+    :param iterable chunks: Chunks of bytes of the file
+    '''
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.__chunks = iter(chunks)
+        self.__buffer = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.__buffer:
+            chunk = next(self.__chunks, None)
+
+            if chunk is None:
+                return 0
+
+            self.__buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self.__buffer))
+        buffer[:size] = self.__buffer[:size]
+        self.__buffer = self.__buffer[size:]
+
+        return size
+
+    def close(self):
+        if hasattr(self.__chunks, 'close'):
+            self.__chunks.close()
+
+        super().close()
+
+def _encode_value(value):
+    '''Encode a single value of a column'''
+
+    if value is None:
+        return ''
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    return str(value)
+
+def _encode_values(values):
+    '''Encode the values of a column with multiple values, such as a facet'''
+
+    if isinstance(values, (list, tuple, set)):
+        return MULTIPLE_VALUES_DELIMITER.join(_encode_value(value) for value in values)
+
+    return _encode_value(values)
+
+def _encode_metadata(value):
+    '''Encode a metadata value, lists and objects as JSON'''
+
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+    return _encode_value(value)
+
+def _create_row(record, attributes, data_columns):
+    '''Create the CSV row of a record as a dict of values keyed by column'''
+
+    if not isinstance(record, dict):
+        raise ConstructorException('catalog records must be dicts')
+
+    row = {}
+
+    for key, value in record.items():
+        if key == 'data':
+            continue
+
+        if key not in attributes:
+            raise ConstructorException(f'{key} is not an attribute of catalog records of this feed')
+
+        row[attributes[key]] = _encode_value(value)
+
+    for key, value in (record.get('data') or {}).items():
+        if key == 'facets':
+            for facet_name, facet_values in (value or {}).items():
+                row[f'facet:{facet_name}'] = _encode_values(facet_values)
+        elif key in data_columns:
+            row[key] = _encode_values(value) if key in MULTIPLE_VALUES_COLUMNS else _encode_value(value)
+        else:
+            row[f'metadata:{key}'] = _encode_metadata(value)
+
+    return row
+
+def _get_columns(base_columns, rows):
+    '''Get the base columns found in rows, followed by the facet and metadata columns in the order first found'''
+
+    found = {}
+
+    for row in rows:
+        found.update(dict.fromkeys(row))
+
+    return [column for column in base_columns if column in found] + [
+        column for column in found if column not in base_columns
+    ]
+
+def _iter_csv(rows, base_columns, columns, sample_size):
+    '''Encode rows into chunks of CSV bytes of about CHUNK_SIZE'''
+
+    if columns is None:
+        sample = list(islice(rows, sample_size))
+        columns = _get_columns(base_columns, sample)
+        rows = chain(sample, rows)
+
+    known_columns = set(columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+
+    for row in rows:
+        unknown_columns = row.keys() - known_columns
+
+        if unknown_columns:
+            raise ConstructorException(
+                f'{sorted(unknown_columns)[0]} is not a column of the feed, pass the columns of the feed to include it'
+            )
+
+        writer.writerow([row.get(column, '') for column in columns])
+
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def _check_feed_options(columns, sample_size):
+    '''Raise an exception when columns or sample_size are invalid'''
+
+    if columns is not None and (not isinstance(columns, (list, tuple)) or not columns):
+        raise ConstructorException('columns must be a non-empty list')
+
+    if not isinstance(sample_size, int) or sample_size < 1:
+        raise ConstructorException('sample_size must be a positive integer')
+
+def create_items_feed(items, columns=None, sample_size=SAMPLE_SIZE):
+    '''
+    Create an items.csv file encoded from items as it is read
+
+    Items have the shape of the items API: id, name, suggested_score and data. url, image_url,
+    description, keywords, active and group_ids of data have columns of their own, facets are facet:
+    columns and the other attributes of data are metadata: columns, lists and objects encoded as JSON.
+
+    Columns are found in the first sample_size items unless passed, an item with another column raises
+    an exception when it is read.
+
+    :param iterable items: Items to encode, such as a generator, consumed as the feed is read
+    :param list columns: Columns of the file, such as ['id', 'item_name', 'facet:color']
+    :param int sample_size: The number of items columns are found in, held in memory until read
+
+    :return: CsvFeed
+    '''
+
+    _check_feed_options(columns, sample_size)
+
+    rows = (_create_row(item, ITEM_ATTRIBUTES, ITEM_DATA_COLUMNS) for item in items)
+
+    return CsvFeed(_iter_csv(rows, [*ITEM_ATTRIBUTES.values(), *ITEM_DATA_COLUMNS], columns, sample_size))
+
+def create_variations_feed(variations, columns=None, sample_size=SAMPLE_SIZE):
+    '''
+    Create a variations.csv file encoded from variations as it is read
+
+    Variations have the shape of the variations API: id, item_id, name, suggested_score and data.
+    Accepts the same parameters as :func:`create_items_feed`
+
+    :return: CsvFeed
+    '''
+
+    _check_feed_options(columns, sample_size)
+
+    rows = (_create_row(variation, VARIATION_ATTRIBUTES, VARIATION_DATA_COLUMNS) for variation in variations)
+
+    return CsvFeed(_iter_csv(rows, [*VARIATION_ATTRIBUTES.values(), *VARIATION_DATA_COLUMNS], columns, sample_size))
+
+def iter_item_groups(item_groups):
+    '''Iterate over item groups and their children, giving children the parent_id of their parent'''
+
+    for item_group in item_groups:
+        stack = [(item_group, None)]
+
+        while stack:
+            group, parent_id = stack.pop()
+            flat_group = { key: value for key, value in group.items() if key != 'children' }
+
+            if parent_id is not None:
+                flat_group['parent_id'] = parent_id
+
+            yield flat_group
+            stack.extend((child, group.get('id')) for child in reversed(group.get('children') or []))
+
+def create_item_groups_feed(item_groups, columns=None, sample_size=SAMPLE_SIZE):
+    '''
+    Create an item_groups.csv file encoded from item groups as it is read
+
+    Item groups have the shape of the item groups API: id, name, parent_id, data and children, which
+    are given the parent_id of their parent. Attributes of data are metadata: columns.
+    Accepts the same parameters as :func:`create_items_feed`
+
+    :return: CsvFeed
+    '''
+
+    _check_feed_options(columns, sample_size)
+
+    rows = (_create_row(group, ITEM_GROUP_ATTRIBUTES, ()) for group in iter_item_groups(item_groups))
+
+    return CsvFeed(_iter_csv(rows, list(ITEM_GROUP_ATTRIBUTES.values()), columns, sample_size))
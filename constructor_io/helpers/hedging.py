@@ -0,0 +1,223 @@
+'''Hedged requests'''
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from threading import Lock, Thread
+from time import monotonic
+
+from constructor_io.helpers.cache import get_endpoint_names
+from constructor_io.helpers.concurrency import LazyThreadPoolExecutor
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.transport import Transport
+
+HEDGEABLE_ENDPOINTS = (
+    'autocomplete',
+    'search',
+)
+
+
+class HedgingPolicy:
+    # pylint: disable=too-many-instance-attributes
+    '''
+    Thread-safe policy deciding when a duplicate request is sent for a slow request
+
+    The hedge budget is a token bucket: every request adds `budget` tokens and every hedge spends one,
+    so at most `budget` extra requests are sent per request on average and at most `max_burst` in a row.
+
+    :param float delay: The number of seconds to wait for a response before sending a duplicate request
+    :param float percentile: Percentile of recent latencies used as the delay once `min_samples` were recorded, such as 95
+    :param float budget: The maximum ratio of duplicate requests to requests
+    :param int max_burst: The maximum number of duplicate requests sent in a row
+    :param int window: The number of recent latencies the percentile is computed from
+    :param int min_samples: The number of latencies recorded before the percentile is used instead of delay
+    '''
+
+    def __init__(
+        self,
+        *,
+        delay=None,
+        percentile=None,
+        budget=0.1,
+        max_burst=10,
+        window=1000,
+        min_samples=20,
+    ):
+        # pylint: disable=too-many-arguments
+        if delay is None and percentile is None:
+            raise ConstructorException('hedging policy requires a delay or a percentile')
+
+        if delay is not None and (not isinstance(delay, (int, float)) or delay < 0):
+            raise ConstructorException('delay must be a non-negative number')
+
+        if percentile is not None and (not isinstance(percentile, (int, float)) or not 0 < percentile < 100):
+            raise ConstructorException('percentile must be a number between 0 and 100')
+
+        if not isinstance(budget, (int, float)) or budget < 0:
+            raise ConstructorException('budget must be a non-negative number')
+
+        self.delay = delay
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.__tokens = 0
+        self.__latencies = deque(maxlen=window)
+        self.__lock = Lock()
+
+    def get_delay(self):
+        '''Get the number of seconds to wait before sending a duplicate request'''
+
+        with self.__lock:
+            if self.percentile is None or len(self.__latencies) < max(self.min_samples, 1):
+                return self.delay
+
+            latencies = sorted(self.__latencies)
+
+        return latencies[min(int(len(latencies) * self.percentile / 100), len(latencies) - 1)]
+
+    def record_request(self):
+        '''Add the budget earned by a request'''
+
+        with self.__lock:
+            self.__tokens = min(self.__tokens + self.budget, self.max_burst)
+
+    def acquire_hedge(self):
+        '''Spend budget on a duplicate request, returning False when the budget is exhausted'''
+
+        with self.__lock:
+            if self.__tokens < 1:
+                return False
+
+            self.__tokens -= 1
+            self.hedges += 1
+
+            return True
+
+    def record_latency(self, latency):
+        '''Record the number of seconds a request took'''
+
+        with self.__lock:
+            self.__latencies.append(latency)
+
+    def record_hedge_win(self):
+        '''Record that a duplicate request returned before the original one'''
+
+        with self.__lock:
+            self.hedge_wins += 1
+
+class HedgingTransport(Transport):
+    '''
+    Transport sending a duplicate of slow GET requests and returning whichever response arrives first
+
+    The slower request is not aborted, its response is discarded once it arrives. Each request is sent
+    on a thread of its own as soon as it is made, so hedging does not limit how many requests are in
+    flight and the delay does not include time spent waiting for a thread. Only duplicate requests are
+    sent on a pool of at most max_workers threads.
+
+    :param Transport transport: Transport used to send requests
+    :param dict policies: Hedging options per endpoint, such as { 'search': { 'delay': 0.2, 'budget': 0.05 } }
+    :param str service_url: API URL endpoint the request URLs are relative to
+    :param int max_workers: The maximum number of threads sending duplicate requests
+    '''
+
+    def __init__(self, transport, policies, service_url, max_workers=None):
+        if not isinstance(policies, dict):
+            raise ConstructorException('hedging must be a dictionary')
+
+        for endpoint_name in policies:
+            if endpoint_name not in HEDGEABLE_ENDPOINTS:
+                raise ConstructorException(
+                    f'hedging endpoint must be one of {", ".join(HEDGEABLE_ENDPOINTS)}'
+                )
+
+        self.transport = transport
+        self.service_url = service_url
+        self.policies = {
+            endpoint_name: HedgingPolicy(**(policy or {}))
+            for endpoint_name, policy in policies.items()
+        }
+        # Duplicates wait on their own pool so that callers running on the shared executor cannot deadlock it
+        self.__executor = LazyThreadPoolExecutor(max_workers)
+        self.__requests = set()
+        self.__lock = Lock()
+
+    def __get_policy(self, request):
+        if request.method != 'get':
+            return None
+
+        for endpoint_name in get_endpoint_names(request.url, self.service_url):
+            policy = self.policies.get(endpoint_name)
+
+            if policy is not None:
+                return policy
+
+        return None
+
+    def __send(self, policy, request):
+        start = monotonic()
+        response = self.transport.send(request)
+        policy.record_latency(monotonic() - start)
+
+        return response
+
+    def __start(self, policy, request):
+        # The caller stays free to return a duplicate arriving first, so the request gets a thread of its own
+        future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+
+            try:
+                future.set_result(self.__send(policy, request))
+            except BaseException as exception: # pylint: disable=broad-except
+                future.set_exception(exception)
+            finally:
+                with self.__lock:
+                    self.__requests.discard(future)
+
+        with self.__lock:
+            self.__requests.add(future)
+
+        Thread(target=run, name='constructorio-hedging', daemon=True).start()
+
+        return future
+
+    def send(self, request):
+        policy = self.__get_policy(request)
+
+        if policy is None:
+            return self.transport.send(request)
+
+        policy.record_request()
+        primary = self.__start(policy, request)
+        done, _ = wait([primary], timeout=policy.get_delay())
+
+        if done or not policy.acquire_hedge():
+            return primary.result()
+
+        hedge = self.__executor.submit(self.__send, policy, request)
+        pending = { primary, hedge }
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                # A failed request only fails the call once the other request failed as well
+                if future.exception() is None:
+                    if future is hedge:
+                        policy.record_hedge_win()
+
+                    return future.result()
+
+        return primary.result()
+
+    def close(self):
+        '''Wait for requests in flight to complete and stop their threads'''
+
+        with self.__lock:
+            requests = list(self.__requests)
+
+        wait(requests)
+        self.__executor.shutdown(wait=True)
@@ -0,0 +1,193 @@
+'''Content hash ledger'''
+
+import json
+import sqlite3
+from hashlib import blake2b
+from threading import Lock
+
+from constructor_io.helpers.exception import ConstructorException
+
+# Section of the catalog API requests without one
+DEFAULT_SECTION = 'Products'
+
+# Stay under the default limit of SQLite on the number of parameters of a query
+MAX_QUERY_PARAMETERS = 500
+
+
+def get_content_hash(record):
+    '''Hash the canonical JSON of a record, which does not depend on the order of its keys'''
+
+    content = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+    return blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+def _get_partial_hash(content_hash):
+    '''Hash a content hash again, marking the content as a partial update merged into the record'''
+
+    return blake2b(content_hash, digest_size=16, person=b'partial').digest()
+
+def _iter_batches(values):
+    values = list(values)
+
+    for start in range(0, len(values), MAX_QUERY_PARAMETERS):
+        yield values[start:start + MAX_QUERY_PARAMETERS]
+
+class ContentLedger:
+    '''
+    Local ledger of the content hashes of the items and variations accepted by the API, keyed by section
+    and ID
+
+    Given to a client as the ledger option, items and variations whose content is the same as when they
+    were last accepted are left out of create_or_replace and update requests. Hashes are recorded only
+    once a request succeeds. Updates are merged into the records of the index, so their hashes are
+    recorded as partial and only leave out the same updates, never a replace. Deleting items or
+    variations forgets them, and sending catalog files clears the section, as the index may then differ
+    from the ledger.
+
+    :param str path: Path of the SQLite database storing the ledger, kept in memory if omitted
+    '''
+
+    def __init__(self, path=':memory:'):
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+
+        with self.__lock:
+            if str(path) != ':memory:':
+                self.__connection.execute('PRAGMA journal_mode=WAL')
+                self.__connection.execute('PRAGMA synchronous=NORMAL')
+
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS hashes ('
+                'kind TEXT NOT NULL, section TEXT NOT NULL, id TEXT NOT NULL, item_id TEXT, hash BLOB NOT NULL, '
+                'PRIMARY KEY (kind, section, id)) WITHOUT ROWID'
+            )
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS hashes_item_id ON hashes (section, item_id)')
+
+    def __get_hashes(self, kind, section, ids):
+        hashes = {}
+
+        with self.__lock:
+            for batch in _iter_batches(ids):
+                placeholders = ', '.join('?' * len(batch))
+                hashes.update(self.__connection.execute(
+                    f'SELECT id, hash FROM hashes WHERE kind = ? AND section = ? AND id IN ({placeholders})',
+                    [kind, section, *batch],
+                ))
+
+        return hashes
+
+    def filter_changed(self, kind, section, records, partial=False):
+        '''
+        Leave out the records whose content hash is the one recorded
+
+        Records without an ID are always kept. A replace is left out only when the same record was last
+        replaced, an update when the same content was last replaced or updated.
+
+        :param str kind: 'items' or 'variations'
+        :param str section: The section of the records, Products if omitted
+        :param list records: Records with an id
+        :param bool partial: Whether records are partial updates merged into the records of the index
+
+        :return: tuple of the records changed and their content hashes keyed by ID, to record once accepted
+        '''
+
+        records = list(records)
+        changed_hashes = {}
+        ids = {
+            str(record.get('id'))
+            for record in records
+            if isinstance(record, dict) and record.get('id') is not None
+        }
+        hashes = self.__get_hashes(kind, section or DEFAULT_SECTION, ids)
+        changed = []
+
+        for record in records:
+            if not isinstance(record, dict) or record.get('id') is None:
+                changed.append(record)
+                continue
+
+            record_id = str(record.get('id'))
+            content_hash = get_content_hash(record)
+            unchanged_hashes = (content_hash, _get_partial_hash(content_hash)) if partial else (content_hash,)
+
+            if hashes.get(record_id) not in unchanged_hashes:
+                changed.append(record)
+                changed_hashes[record_id] = (
+                    record.get('item_id'),
+                    _get_partial_hash(content_hash) if partial else content_hash,
+                )
+
+        return changed, changed_hashes
+
+    def record(self, kind, section, hashes):
+        '''
+        Record the content hashes of records accepted by the API
+
+        :param str kind: 'items' or 'variations'
+        :param str section: The section of the records
+        :param dict hashes: Content hashes keyed by ID, as returned by filter_changed
+        '''
+
+        rows = [
+            (kind, section or DEFAULT_SECTION, record_id, None if item_id is None else str(item_id), content_hash)
+            for record_id, (item_id, content_hash) in hashes.items()
+        ]
+
+        with self.__lock:
+            self.__connection.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)', rows)
+
+    def forget(self, kind, section, ids):
+        '''
+        Forget records deleted from the index, and the variations of the items deleted
+
+        :param str kind: 'items' or 'variations'
+        :param str section: The section of the records
+        :param list ids: IDs of the records deleted
+        '''
+
+        ids = [str(record_id) for record_id in ids if record_id is not None]
+
+        with self.__lock:
+            for batch in _iter_batches(ids):
+                placeholders = ', '.join('?' * len(batch))
+                self.__connection.execute(
+                    f'DELETE FROM hashes WHERE kind = ? AND section = ? AND id IN ({placeholders})',
+                    [kind, section or DEFAULT_SECTION, *batch],
+                )
+
+                if kind == 'items':
+                    self.__connection.execute(
+                        f'DELETE FROM hashes WHERE kind = ? AND section = ? AND item_id IN ({placeholders})',
+                        ['variations', section or DEFAULT_SECTION, *batch],
+                    )
+
+    def clear(self, section=None):
+        '''
+        Forget the records of a section, or of every section if omitted
+
+        :param str section: The section to forget
+        '''
+
+        with self.__lock:
+            if section is None:
+                self.__connection.execute('DELETE FROM hashes')
+            else:
+                self.__connection.execute('DELETE FROM hashes WHERE section = ?', [section])
+
+    def __len__(self):
+        with self.__lock:
+            return self.__connection.execute('SELECT COUNT(*) FROM hashes').fetchone()[0]
+
+    def close(self):
+        '''Close the database'''
+
+        with self.__lock:
+            self.__connection.close()
+
+def check_ledger(ledger):
+    '''Raise an exception when the ledger client option is not a ContentLedger'''
+
+    if ledger is not None and not isinstance(ledger, ContentLedger):
+        raise ConstructorException('ledger must be a ContentLedger')
+
+    return ledger
@@ -0,0 +1,113 @@
+'''Streaming multipart encoding'''
+
+import io
+import os
+from binascii import hexlify
+from os import urandom
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _get_content_length(content):
+    '''Get the size in bytes of the content of a file, or None when it can not be known before reading it'''
+
+    if isinstance(content, bytes):
+        return len(content)
+
+    if isinstance(content, str):
+        return len(content.encode('utf-8'))
+
+    if isinstance(content, os.PathLike):
+        return os.path.getsize(content)
+
+    if isinstance(content, io.TextIOBase) or not hasattr(content, 'read'):
+        return None
+
+    try:
+        position = content.tell()
+        size = content.seek(0, io.SEEK_END) - position
+        content.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    return size
+
+def _iter_content(content, chunk_size):
+    '''Iterate over the content of a file as bytes, reading at most chunk_size at a time'''
+
+    if isinstance(content, (bytes, str)):
+        if content:
+            yield content.encode('utf-8') if isinstance(content, str) else content
+    elif isinstance(content, os.PathLike):
+        with open(content, 'rb') as file:
+            yield from _iter_content(file, chunk_size)
+    elif hasattr(content, 'read'):
+        while True:
+            data = content.read(chunk_size)
+
+            if not data:
+                return
+
+            yield data.encode('utf-8') if isinstance(data, str) else data
+    else:
+        for data in content:
+            if data:
+                yield data.encode('utf-8') if isinstance(data, str) else data
+
+class MultipartStream:
+    '''
+    Multipart form data body read from its files as it is sent
+
+    Only a chunk of a file is held in memory at a time. File contents can be bytes, strings, paths
+    (os.PathLike), readable streams or iterables of bytes. A stream is read from its current position,
+    so the body can only be sent once.
+
+    :param dict files: Multipart files as { field_name: (file_name, content) }
+    :param int chunk_size: The maximum number of bytes read from a file at a time
+
+    The len attribute is the size of the body in bytes, or None when it can not be known before sending
+    it, in which case the body is sent with chunked transfer encoding.
+    '''
+
+    def __init__(self, files, chunk_size=CHUNK_SIZE):
+        self.boundary = hexlify(urandom(16)).decode('ascii')
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.chunk_size = chunk_size
+        self.__parts = [
+            (self.__create_part_header(field_name, file_name), content)
+            for field_name, (file_name, content) in files.items()
+        ]
+        self.__trailer = f'--{self.boundary}--\r\n'.encode('utf-8')
+        self.len = self.__get_length()
+
+    def __create_part_header(self, field_name, file_name):
+        def quote(value):
+            return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+        return (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{quote(field_name)}"; filename="{quote(file_name)}"\r\n'
+            '\r\n'
+        ).encode('utf-8')
+
+    def __get_length(self):
+        length = len(self.__trailer)
+
+        for header, content in self.__parts:
+            content_length = _get_content_length(content)
+
+            if content_length is None:
+                return None
+
+            # The content is followed by a line break
+            length += len(header) + content_length + 2
+
+        return length
+
+    def __iter__(self):
+        for header, content in self.__parts:
+            yield header
+            yield from _iter_content(content, self.chunk_size)
+            yield b'\r\n'
+
+        yield self.__trailer
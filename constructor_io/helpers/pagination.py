@@ -0,0 +1,212 @@
+'''Pagination utility functions'''
+
+import asyncio
+from collections import deque
+
+from constructor_io.helpers.exception import ConstructorException
+
+
+def get_page_results(json):
+    '''
+    Get the results and total_num_results of a search or browse response
+
+    A response without results, such as a redirect, is an empty last page.
+    '''
+
+    json_response = json.get('response') or {}
+
+    return json_response.get('results') or [], json_response.get('total_num_results')
+
+def _is_last_page(page, results, page_size, total):
+    '''Tell whether a page is the last one given its results, the size of full pages and the total number of results'''
+
+    return not results or len(results) < page_size or (total is not None and page * page_size >= total)
+
+def iter_pages(executor, fetch_page, page=1):
+    '''
+    Iterate over the results of consecutive pages, fetching the next page in the background while the
+    results of the current one are consumed
+
+    Iteration stops at an empty or partial page, or once total_num_results are consumed. Closing the
+    iterator cancels the next page if it has not started yet.
+
+    :param concurrent.futures.Executor executor: Executor fetching the next pages
+    :param function fetch_page: Function taking a page number and returning a tuple of (results, total_num_results)
+    :param int page: The page number to start from
+
+    :return: generator of results
+    '''
+
+    results, total = fetch_page(page)
+    page_size = len(results)
+    next_page = None
+
+    try:
+        while True:
+            if not _is_last_page(page, results, page_size, total):
+                next_page = executor.submit(fetch_page, page + 1)
+
+            yield from results
+
+            if next_page is None:
+                return
+
+            results, total = next_page.result()
+            next_page = None
+            page += 1
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+async def aiter_pages(fetch_page, page=1):
+    '''
+    Iterate asynchronously over the results of consecutive pages, fetching the next page in the
+    background while the results of the current one are consumed
+
+    Accepts the same parameters as :func:`iter_pages` except executor, fetch_page is a coroutine
+    function. Closing the iterator cancels the next page.
+
+    :return: async generator of results
+    '''
+
+    results, total = await fetch_page(page)
+    page_size = len(results)
+    next_page = None
+
+    try:
+        while True:
+            if not _is_last_page(page, results, page_size, total):
+                next_page = asyncio.ensure_future(fetch_page(page + 1))
+
+            for result in results:
+                yield result
+
+            if next_page is None:
+                return
+
+            results, total = await next_page
+            next_page = None
+            page += 1
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+def _check_max_concurrency(max_concurrency):
+    '''Raise an exception when max_concurrency is not a positive integer'''
+
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ConstructorException('max_concurrency must be a positive integer')
+
+def _get_last_page(total, page_size):
+    '''Get the last page number given the total number of results and the size of full pages'''
+
+    return max(-(-total // page_size), 1)
+
+class PageIterator:
+    '''
+    Iterator over the results of consecutive pages, fetching up to max_concurrency pages at a time
+
+    The first page gives the total number of results, the following pages are then fetched concurrently
+    in a sliding window. Results are returned in page order and at most max_concurrency pages are held in
+    memory. Closing the iterator cancels the pages not started yet.
+
+    The checkpoint attribute is the page of the next result. When iteration fails, a new iterator started
+    from the checkpoint resumes it, results of that page returned before the failure are returned again.
+
+    :param concurrent.futures.Executor executor: Executor fetching the pages
+    :param function fetch_page: Function taking a page number and returning a tuple of (results, total number of results)
+    :param int page_size: The number of results of a full page
+    :param int page: The page number to start from
+    :param int max_concurrency: The maximum number of pages fetched at the same time
+    '''
+
+    def __init__(self, executor, fetch_page, page_size, page=1, max_concurrency=4):
+        # pylint: disable=too-many-arguments
+        _check_max_concurrency(max_concurrency)
+
+        self.checkpoint = page
+        self.__results = self.__iter_results(executor, fetch_page, page_size, max_concurrency)
+
+    def __iter_results(self, executor, fetch_page, page_size, max_concurrency):
+        results, total = fetch_page(self.checkpoint)
+        last_page = _get_last_page(total, page_size)
+        next_page = self.checkpoint + 1
+        pages = deque()
+
+        try:
+            while True:
+                while next_page <= last_page and len(pages) < max_concurrency:
+                    pages.append(executor.submit(fetch_page, next_page))
+                    next_page += 1
+
+                yield from results
+
+                if not pages or not results:
+                    return
+
+                self.checkpoint += 1
+                results, _ = pages.popleft().result()
+        finally:
+            for future in pages:
+                future.cancel()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.__results)
+
+    def close(self):
+        '''Stop iterating and cancel the pages not started yet'''
+
+        self.__results.close()
+
+class AsyncPageIterator:
+    '''
+    Asynchronous iterator over the results of consecutive pages, fetching up to max_concurrency pages at
+    a time
+
+    Accepts the same parameters as :class:`PageIterator` except executor, fetch_page is a coroutine
+    function. Closing the iterator cancels the pages in flight.
+    '''
+
+    def __init__(self, fetch_page, page_size, page=1, max_concurrency=4):
+        _check_max_concurrency(max_concurrency)
+
+        self.checkpoint = page
+        self.__results = self.__iter_results(fetch_page, page_size, max_concurrency)
+
+    async def __iter_results(self, fetch_page, page_size, max_concurrency):
+        results, total = await fetch_page(self.checkpoint)
+        last_page = _get_last_page(total, page_size)
+        next_page = self.checkpoint + 1
+        pages = deque()
+
+        try:
+            while True:
+                while next_page <= last_page and len(pages) < max_concurrency:
+                    pages.append(asyncio.ensure_future(fetch_page(next_page)))
+                    next_page += 1
+
+                for result in results:
+                    yield result
+
+                if not pages or not results:
+                    return
+
+                self.checkpoint += 1
+                results, _ = await pages.popleft()
+        finally:
+            for task in pages:
+                task.cancel()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.__results.__anext__()
+
+    async def aclose(self):
+        '''Stop iterating and cancel the pages in flight'''
+
+        await self.__results.aclose()
@@ -0,0 +1,306 @@
+'''Transports used to send requests to the Constructor.io API'''
+
+import json as jsonlib
+from abc import ABC, abstractmethod
+from base64 import b64encode
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import requests as r
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from constructor_io.helpers.multipart import MultipartStream
+
+
+def create_requests_session(pool_size=10, pool_connections=10, pool_block=False):
+    '''
+    Create a keep-alive requests session backed by a connection pool per host
+
+    :param int pool_size: The maximum number of connections kept alive per host
+    :param int pool_connections: The number of hosts to keep connection pools for
+    :param bool pool_block: Block when no free connections are available in a host pool
+
+    :return: requests.Session
+    '''
+
+    session = r.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_size,
+        pool_block=pool_block,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+class Request:
+    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-arguments
+    '''
+    HTTP request sent through a transport
+
+    :param str method: Lowercase HTTP method - 'get', 'post', 'put', 'patch' or 'delete'
+    :param str url: Fully qualified request URL including the query string
+    :param dict headers: Request headers
+    :param tuple auth: Basic auth (username, password) pair
+    :param object json: JSON serializable request body
+    :param dict files: Multipart files as { field_name: (file_name, content) }, content is bytes, a string (sent as is), a path (os.PathLike), a readable stream or an iterable of bytes
+    :param object data: Raw request body, as bytes or an iterable of bytes, with its Content-Type in headers
+    '''
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+        json: Any = None,
+        files: Optional[Dict[str, Tuple[str, Any]]] = None,
+        data: Any = None,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        self.auth = auth
+        self.json = json
+        self.files = files
+        self.data = data
+
+class Response:
+    '''
+    HTTP response returned by a transport
+
+    :param int status_code: HTTP status code
+    :param bytes content: Raw response body
+    :param dict headers: Response headers
+    :param str url: URL of the request that produced the response
+    '''
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes = b'',
+        headers: Optional[Dict[str, str]] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def ok(self) -> bool: # pylint: disable=invalid-name
+        '''True if the status code is less than 400'''
+
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        '''Response body decoded as UTF-8'''
+
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        '''Parse the response body as JSON, returning a new object on each call'''
+
+        return jsonlib.loads(self.content)
+
+class Transport(ABC):
+    '''
+    Base class for transports sending requests to the Constructor.io API
+
+    Middleware can be implemented as a transport wrapping another transport
+    '''
+
+    @abstractmethod
+    def send(self, request: Request) -> Response:
+        '''Send a request and return its response'''
+
+    def close(self) -> None:
+        '''Release any resources held by the transport'''
+
+class AsyncTransport(ABC):
+    '''Base class for transports sending requests to the Constructor.io API from asyncio code'''
+
+    @abstractmethod
+    async def send(self, request: Request) -> Response:
+        '''Send a request and return its response'''
+
+    async def close(self) -> None:
+        '''Release any resources held by the transport'''
+
+class RequestsTransport(Transport):
+    '''
+    Transport built on the requests library
+
+    :param object requests: Requests module or session used to send requests (a pooled session owned by the transport is created if omitted)
+    :param int pool_size: The maximum number of keep-alive connections per host
+    :param bool pool_block: Block when all connections to a host are in use instead of opening extra ones
+    '''
+
+    def __init__(self, requests: Any = None, pool_size: int = 10, pool_block: bool = False) -> None:
+        self.__owns_session = requests is None
+        self.requests = requests or create_requests_session(pool_size=pool_size, pool_block=pool_block)
+
+    def send(self, request: Request) -> Response:
+        kwargs: Dict[str, Any] = { 'auth': request.auth, 'headers': request.headers }
+
+        if request.json is not None:
+            kwargs['json'] = request.json
+
+        if request.files:
+            # Stream the files rather than letting requests build the whole body in memory
+            body = MultipartStream(request.files)
+            kwargs['data'] = body
+            kwargs['headers'] = { **request.headers, 'Content-Type': body.content_type }
+
+        if request.data is not None:
+            kwargs['data'] = request.data
+
+        response = getattr(self.requests, request.method)(request.url, **kwargs)
+
+        return Response(response.status_code, response.content, dict(response.headers), response.url)
+
+    def close(self) -> None:
+        if self.__owns_session:
+            self.requests.close()
+
+class Urllib3Transport(Transport):
+    '''
+    Lean transport built directly on a urllib3 connection pool
+
+    Skips the session, hook, cookie and auth handling of the requests library. Basic auth and static
+    headers are encoded once per set of credentials and reused for every request.
+
+    :param int pool_size: The maximum number of keep-alive connections per host
+    :param bool pool_block: Block when all connections to a host are in use instead of opening extra ones
+    :param float timeout: Timeout in seconds for connecting and reading responses (no timeout if omitted)
+    :param urllib3.PoolManager pool_manager: Pool manager used to send requests (one owned by the transport is created if omitted)
+    '''
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        pool_block: bool = False,
+        timeout: Optional[float] = None,
+        pool_manager: Optional[urllib3.PoolManager] = None,
+    ) -> None:
+        self.__owns_pool_manager = pool_manager is None
+        self.__timeout = urllib3.Timeout(total=timeout) if timeout else None
+        self.__static_headers: Dict[Optional[Tuple[str, str]], Dict[str, str]] = {}
+        self.pool_manager = pool_manager or urllib3.PoolManager(
+            num_pools=10,
+            maxsize=pool_size,
+            block=pool_block,
+        )
+
+    def __get_static_headers(self, auth: Optional[Tuple[str, str]]) -> Dict[str, str]:
+        static_headers = self.__static_headers.get(auth)
+
+        if static_headers is None:
+            static_headers = { 'Accept': '*/*', 'Accept-Encoding': 'gzip, deflate' }
+
+            if auth:
+                username, password = auth
+                credentials = f'{username or ""}:{password or ""}'.encode('latin1')
+                static_headers['Authorization'] = 'Basic ' + b64encode(credentials).decode('ascii')
+
+            self.__static_headers[auth] = static_headers
+
+        return static_headers
+
+    def send(self, request: Request) -> Response:
+        headers = self.__get_static_headers(request.auth)
+        body = None
+
+        if request.headers or request.json is not None or request.files:
+            headers = { **headers, **request.headers }
+
+        if request.data is not None:
+            # Iterable bodies are sent with chunked transfer encoding
+            body = request.data
+        elif request.json is not None:
+            body = jsonlib.dumps(request.json).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif request.files:
+            body = MultipartStream(request.files)
+            headers['Content-Type'] = body.content_type
+
+            # Without a length, urllib3 sends the body with chunked transfer encoding
+            if body.len is not None:
+                headers['Content-Length'] = str(body.len)
+
+        response = self.pool_manager.urlopen(
+            request.method.upper(),
+            request.url,
+            body=body,
+            headers=headers,
+            retries=False,
+            timeout=self.__timeout,
+        )
+
+        return Response(response.status, response.data, dict(response.headers), request.url)
+
+    def close(self) -> None:
+        if self.__owns_pool_manager:
+            self.pool_manager.clear()
+
+ResponseHandler = Union[Response, Callable[[Request], Response]]
+
+class FakeTransport(Transport):
+    '''
+    In-memory transport returning canned responses, for tests and benchmarks
+
+    Responses are matched against the request method and URL path prefix in the order they were added.
+    Every request sent is recorded in `requests`.
+    '''
+
+    def __init__(self) -> None:
+        self.requests: List[Request] = []
+        self.__routes: List[Tuple[str, str, ResponseHandler]] = []
+
+    def add_response(
+        self,
+        method: str,
+        path: str,
+        json: Any = None,
+        status_code: int = 200,
+        handler: Optional[Callable[[Request], Response]] = None,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        '''
+        Register a canned response
+
+        :param str method: Lowercase HTTP method to match
+        :param str path: URL path prefix to match, such as '/search/'
+        :param object json: JSON serializable response body
+        :param int status_code: HTTP status code of the response
+        :param callable handler: Function creating the response from the request, used instead of json
+        '''
+
+        response = handler or Response(status_code, jsonlib.dumps(json).encode('utf-8'))
+        self.__routes.append((method, path, response))
+
+    def send(self, request: Request) -> Response:
+        self.requests.append(request)
+        path = '/' + request.url.split('://', 1)[-1].split('/', 1)[-1]
+
+        for method, path_prefix, response in self.__routes:
+            if method == request.method and path.startswith(path_prefix):
+                if callable(response):
+                    return response(request)
+
+                return Response(response.status_code, response.content, response.headers, request.url)
+
+        return Response(404, b'{"message": "Not found", "status": 404}', url=request.url)
+
+class AsyncFakeTransport(AsyncTransport):
+    '''In-memory transport for asyncio code, delegating to a FakeTransport'''
+
+    def __init__(self, fake_transport: Optional[FakeTransport] = None) -> None:
+        self.fake_transport = fake_transport or FakeTransport()
+
+    async def send(self, request: Request) -> Response:
+        return self.fake_transport.send(request)
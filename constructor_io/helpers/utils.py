@@ -4,14 +4,22 @@ import json
 from re import sub
 from urllib.parse import parse_qs, quote, unquote
 
+import requests as r
+
+from constructor_io.helpers.compression import compress_body
 from constructor_io.helpers.exception import (ConstructorException,
                                               HttpException)
+from constructor_io.helpers.transport import Request, RequestsTransport
 
 
 def throw_http_exception_from_response(response):
     '''Throw custom HTTP exception from an API response'''
 
-    response_json = response.json()
+    throw_http_exception_from_json(response.json())
+
+def throw_http_exception_from_json(response_json):
+    '''Throw custom HTTP exception from a parsed API response body'''
+
     exception = HttpException(
         response_json.get('message'),
         response_json.get('status'),
@@ -27,6 +35,39 @@ def create_auth_header(options):
 
     return (options.get('api_token'),'')
 
+def create_request(options, method, url, *, headers=None, json=None, files=None):
+    # pylint: disable=too-many-arguments
+    # pylint: disable=redefined-outer-name
+    '''Create an API request from options, compressing its body when compression is enabled'''
+
+    data = None
+    compressed = compress_body(options, headers, json, files)
+
+    if compressed is not None:
+        headers, data = compressed
+        json = None
+        files = None
+
+    return Request(
+        method,
+        url,
+        headers=headers,
+        auth=create_auth_header(options),
+        json=json,
+        files=files,
+        data=data,
+    )
+
+def send_request(options, method, url, *, headers=None, json=None, files=None):
+    # pylint: disable=too-many-arguments
+    # pylint: disable=redefined-outer-name
+    '''Send an API request through the transport from options and return the response'''
+
+    transport = options.get('transport') or RequestsTransport(options.get('requests') or r)
+    request = create_request(options, method, url, headers=headers, json=json, files=files)
+
+    return transport.send(request)
+
 def clean_params(params_obj):
     '''Clean query parameters'''
 
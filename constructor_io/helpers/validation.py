@@ -0,0 +1,422 @@
+'''Catalog validation'''
+
+import csv
+import io
+import json
+
+from constructor_io.helpers.bulk import MAX_CHUNK_BYTES, MAX_CHUNK_SIZE
+from constructor_io.helpers.delta import CATALOG_FILES, open_csv
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.feeds import (ITEM_ATTRIBUTES,
+                                          ITEM_GROUP_ATTRIBUTES,
+                                          MULTIPLE_VALUES_DELIMITER,
+                                          VARIATION_ATTRIBUTES,
+                                          iter_item_groups)
+
+MAX_ERRORS = 1000
+BLOCK_SIZE = 10000
+
+# Item groups first, so items and then variations can reference them
+VALIDATION_ORDER = ('item_groups', 'items', 'variations')
+
+ID_COLUMNS = { 'items': 'id', 'variations': 'variation_id', 'item_groups': 'id' }
+REQUIRED_COLUMNS = {
+    'items': ('id', 'item_name'),
+    'variations': ('variation_id', 'item_id'),
+    'item_groups': ('id', 'name'),
+}
+
+# Columns referencing the IDs of a catalog file, as (column, referenced file)
+REFERENCE_COLUMNS = {
+    'items': ('group_ids', 'item_groups'),
+    'variations': ('item_id', 'items'),
+    'item_groups': ('parent_id', 'item_groups'),
+}
+
+RECORD_ATTRIBUTES = {
+    'items': { *ITEM_ATTRIBUTES, 'data' },
+    'variations': { *VARIATION_ATTRIBUTES, 'data' },
+    'item_groups': { *ITEM_GROUP_ATTRIBUTES, 'data' },
+}
+REQUIRED_ATTRIBUTES = { 'items': ('id', 'name'), 'variations': ('id', 'item_id'), 'item_groups': ('id', 'name') }
+
+
+class RowError:
+    # pylint: disable=too-few-public-methods
+    '''
+    Error found in a row of a catalog file or a record of a batch
+
+    :param str kind: The catalog file or records of the error (items, variations or item_groups)
+    :param int row: The line number of the first line of the row in the file or the index of the record in the batch, None for errors of the whole file or batch
+    :param str column: The column or attribute of the error, None for errors of the whole row
+    :param str message: Description of the error
+    '''
+
+    def __init__(self, kind, row, column, message):
+        self.kind = kind
+        self.row = row
+        self.column = column
+        self.message = message
+
+    def __repr__(self):
+        location = ''.join([
+            self.kind,
+            f' row {self.row}' if self.row is not None else '',
+            f' {self.column}' if self.column is not None else '',
+        ])
+
+        return f'{location}: {self.message}'
+
+class ValidationReport:
+    '''
+    Errors found in catalog files or records
+
+    :param int num_rows: The number of rows or records validated
+    :param int num_errors: The number of errors found, only the first max_errors are kept
+    :param list errors: RowError of each error kept, in the order found
+    '''
+
+    def __init__(self, max_errors=MAX_ERRORS):
+        self.num_rows = 0
+        self.num_errors = 0
+        self.errors = []
+        self.__max_errors = max_errors
+
+    @property
+    def ok(self):
+        '''Whether no error was found'''
+
+        return not self.num_errors
+
+    def add_error(self, kind, row, column, message):
+        '''Record an error'''
+
+        self.num_errors += 1
+
+        if len(self.errors) < self.__max_errors:
+            self.errors.append(RowError(kind, row, column, message))
+
+    def raise_for_errors(self):
+        '''Raise an exception listing the first errors when any was found'''
+
+        if not self.ok:
+            errors = '; '.join(repr(error) for error in self.errors[:10])
+
+            raise ConstructorException(f'{self.num_errors} catalog validation errors: {errors}')
+
+class _Columns:
+    # pylint: disable=too-few-public-methods
+    '''Indexes of the columns of a catalog file checked with each block of rows'''
+
+    def __init__(self, name, header):
+        reference_column, _ = REFERENCE_COLUMNS[name]
+
+        self.header = header
+        self.id_index = header.index(ID_COLUMNS[name])
+        self.reference_index = header.index(reference_column) if reference_column in header else None
+        self.required_indexes = [header.index(column) for column in REQUIRED_COLUMNS[name]]
+        self.json_indexes = [index for index, column in enumerate(header) if column.startswith('metadata:')]
+
+def _check_row(columns, line, row, errors):
+    '''Check the values of a row, adding errors as tuples of the line number, column and message'''
+
+    header = columns.header
+
+    if len(row) != len(header):
+        errors.append((line, None, f'row has {len(row)} columns, the header has {len(header)}'))
+        return
+
+    for index in columns.required_indexes:
+        if not row[index].strip():
+            errors.append((line, header[index], 'value is required'))
+
+    for index in columns.json_indexes:
+        value = row[index]
+
+        if value and value[0] in '{[':
+            try:
+                json.loads(value)
+            except ValueError:
+                errors.append((line, header[index], 'value is not valid JSON'))
+
+def _check_rows(columns, first_line, text):
+    '''
+    Parse and check a block of rows of a catalog file
+
+    :param _Columns columns: The columns of the file
+    :param int first_line: The line number of the first line of the block
+    :param str text: Lines of the block, ending at the end of a row
+
+    :return: tuple of the errors, the IDs and the references of rows as tuples starting with their line number
+    '''
+
+    errors = []
+    ids = []
+    references = []
+    reader = csv.reader(io.StringIO(text, newline=''), strict=True)
+    line = first_line
+
+    try:
+        for row in reader:
+            if any(row):
+                _check_row(columns, line, row, errors)
+                ids.append((line, row[columns.id_index] if columns.id_index < len(row) else ''))
+
+                if columns.reference_index is not None and columns.reference_index < len(row):
+                    references.append((line, row[columns.reference_index]))
+
+            # The next row starts on the line after the last line of this one
+            line = first_line + reader.line_num
+    except csv.Error as exception:
+        errors.append((line, None, f'row is not valid CSV: {exception}'))
+
+    return errors, ids, references
+
+def _iter_blocks(lines, first_line):
+    '''
+    Split lines of a CSV file into blocks of about BLOCK_SIZE lines ending at the end of a row
+
+    A row continues on the next line while it has an odd number of quotes. A quoted value can not be
+    longer than the field size limit of the csv module, so past that the quote was a literal one.
+
+    :return: generator of tuples of the line number of the first line and the text of a block
+    '''
+
+    block = []
+    in_quotes = False
+    quoted_size = 0
+    field_size_limit = csv.field_size_limit()
+
+    for line in lines:
+        block.append(line)
+
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+
+        if in_quotes:
+            quoted_size += len(line)
+            in_quotes = quoted_size <= field_size_limit
+        else:
+            quoted_size = 0
+
+        if not in_quotes and len(block) >= BLOCK_SIZE:
+            yield first_line, ''.join(block)
+            first_line += len(block)
+            block = []
+
+    if block:
+        yield first_line, ''.join(block)
+
+def _check_header(name, header, report):
+    '''Check the columns of a catalog file, return whether its rows can be validated'''
+
+    if not header:
+        report.add_error(name, 1, None, 'file is empty')
+        return False
+
+    for column in {column for column in header if header.count(column) > 1}:
+        report.add_error(name, 1, column, 'column is duplicated')
+
+    missing_columns = [column for column in REQUIRED_COLUMNS[name] if column not in header]
+
+    for column in missing_columns:
+        report.add_error(name, 1, column, 'column is required')
+
+    return not missing_columns
+
+def _read_header(stream):
+    '''Read the header of a CSV file, return it with the number of lines read'''
+
+    reader = csv.reader(stream)
+    header = next(reader, None)
+
+    return header, reader.line_num
+
+def _check_ids(name, columns, ids, file_ids, *, referenced_ids, references, errors):
+    # pylint: disable=too-many-arguments
+    '''Check that the IDs of a block of rows are unique and that their references exist'''
+
+    header = columns.header
+
+    for line, row_id in ids:
+        if row_id in file_ids:
+            errors.append((line, header[columns.id_index], f'{row_id} is not unique'))
+        elif row_id:
+            file_ids.add(row_id)
+
+    if referenced_ids is None:
+        return
+
+    for line, reference in references:
+        for referenced_id in reference.split(MULTIPLE_VALUES_DELIMITER) if reference else ():
+            if referenced_id not in referenced_ids:
+                column = header[columns.reference_index]
+                errors.append((line, column, f'{referenced_id} is not in {REFERENCE_COLUMNS[name][1]}'))
+
+def _validate_file(name, file, ids, report):
+    # pylint: disable=too-many-locals
+    '''
+    Validate a catalog file, adding its IDs to ids[name] and checking references to the IDs of the files
+    validated before
+    '''
+
+    with open_csv(file) as stream:
+        try:
+            header, num_header_lines = _read_header(stream)
+        except csv.Error as exception:
+            report.add_error(name, 1, None, f'row is not valid CSV: {exception}')
+            return
+
+        if not _check_header(name, header, report):
+            return
+
+        columns = _Columns(name, header)
+        file_ids = ids.setdefault(name, set())
+        # Parents of item groups may be listed after their children, so they are checked at the end
+        parent_references = []
+        referenced_ids = None if name == 'item_groups' else ids.get(REFERENCE_COLUMNS[name][1])
+
+        for first_line, text in _iter_blocks(stream, num_header_lines + 1):
+            errors, block_ids, references = _check_rows(columns, first_line, text)
+
+            report.num_rows += len(block_ids)
+            _check_ids(
+                name,
+                columns,
+                block_ids,
+                file_ids,
+                referenced_ids=referenced_ids,
+                references=references,
+                errors=errors,
+            )
+
+            if name == 'item_groups':
+                parent_references.extend(references)
+
+            # Errors are reported in the order of rows
+            for line, column, message in sorted(errors, key=lambda error: error[0]):
+                report.add_error(name, line, column, message)
+
+        errors = []
+        _check_ids(name, columns, [], file_ids, referenced_ids=file_ids, references=parent_references, errors=errors)
+
+        for line, column, message in errors:
+            report.add_error(name, line, column, message)
+
+def validate_catalog_files(files, max_errors=MAX_ERRORS):
+    '''
+    Validate catalog files before they are sent
+
+    Files are streamed, so only the IDs of rows are held in memory. Checks that the required columns
+    are present and filled, that IDs are unique, that metadata values starting with { or [ are valid
+    JSON and that parent_id of item groups, group_ids of items and item_id of variations reference
+    rows of the files validated.
+
+    Rows are parsed and checked in blocks of 10,000 lines. Rows are parsed strictly, values with quotes
+    or line breaks must be quoted. A block with a row that is not valid CSV is not checked further than
+    that row.
+
+    :param dict files: Catalog files keyed by file name (items, variations or item_groups), as bytes, CSV text (str), paths (os.PathLike), streams or iterables of bytes
+    :param int max_errors: The maximum number of errors kept
+
+    :return: ValidationReport
+    '''
+
+    if not isinstance(files, dict) or not files:
+        raise ConstructorException('files is a required parameter of type dict')
+
+    report = ValidationReport(max_errors)
+    ids = {}
+
+    for name in VALIDATION_ORDER:
+        if files.get(name) is not None:
+            _validate_file(name, files.get(name), ids, report)
+
+    return report
+
+def _check_record(kind, index, record, partial, report):
+    '''Check the attributes of a record, return its serialized size or None if it can not be serialized'''
+
+    if not isinstance(record, dict):
+        report.add_error(kind, index, None, 'record must be a dict')
+        return None
+
+    for key in record.keys() - RECORD_ATTRIBUTES[kind]:
+        report.add_error(kind, index, key, 'attribute is unknown')
+
+    for key in REQUIRED_ATTRIBUTES[kind][:1] if partial else REQUIRED_ATTRIBUTES[kind]:
+        value = record.get(key)
+
+        if value is None or (isinstance(value, str) and not value.strip()):
+            report.add_error(kind, index, key, 'attribute is required')
+        elif key.endswith('id') and (not isinstance(value, (str, int)) or isinstance(value, bool)):
+            report.add_error(kind, index, key, 'attribute must be a string or an integer')
+
+    data = record.get('data')
+
+    if data is not None and not isinstance(data, dict):
+        report.add_error(kind, index, 'data', 'attribute must be a dict')
+    elif data and data.get('facets') is not None and not isinstance(data.get('facets'), dict):
+        report.add_error(kind, index, 'data.facets', 'attribute must be a dict')
+
+    if kind == 'item_groups' and record.get('parent_id') is not None and record.get('parent_id') == record.get('id'):
+        report.add_error(kind, index, 'parent_id', 'item group is its own parent')
+
+    try:
+        return len(json.dumps(record).encode('utf-8'))
+    except (TypeError, ValueError) as exception:
+        report.add_error(kind, index, None, f'record is not JSON serializable: {exception}')
+
+    return None
+
+def validate_records(kind, records, partial=False, max_errors=MAX_ERRORS):
+    '''
+    Validate a batch of items, variations or item groups before it is sent
+
+    Checks that records are JSON serializable dicts with known and required attributes, that their IDs
+    are unique and that the batch fits in one chunk of the SDK's bulk uploads (MAX_CHUNK_SIZE records
+    and MAX_CHUNK_BYTES bytes of JSON, 1,000 records and 8 MB).
+
+    :param str kind: The kind of records (items, variations or item_groups)
+    :param list records: Records as sent to create_or_replace_items, update_variations, create_item_groups, etc. Item groups are indexed with their children, parents first
+    :param bool partial: Whether records are partial updates, requiring their IDs only
+    :param int max_errors: The maximum number of errors kept
+
+    :return: ValidationReport
+    '''
+
+    if kind not in CATALOG_FILES:
+        raise ConstructorException(f'kind must be one of {", ".join(CATALOG_FILES)}')
+
+    if not isinstance(records, (list, tuple)):
+        raise ConstructorException('records is a required parameter of type list')
+
+    report = ValidationReport(max_errors)
+    ids = set()
+    num_bytes = 0
+
+    if kind == 'item_groups':
+        records = [
+            flat_group
+            for group in records
+            for flat_group in (iter_item_groups([group]) if isinstance(group, dict) else [group])
+        ]
+
+    for index, record in enumerate(records):
+        report.num_rows += 1
+        size = _check_record(kind, index, record, partial, report)
+        num_bytes += size or 0
+
+        if size is not None and isinstance(record.get('id'), (str, int)):
+            if record.get('id') in ids:
+                report.add_error(kind, index, 'id', f'{record.get("id")} is not unique')
+
+            ids.add(record.get('id'))
+
+    if kind != 'item_groups' and len(records) > MAX_CHUNK_SIZE:
+        report.add_error(kind, None, None, f'batch has {len(records)} records, the chunk limit is {MAX_CHUNK_SIZE}')
+
+    if num_bytes > MAX_CHUNK_BYTES:
+        report.add_error(kind, None, None, f'batch has {num_bytes} bytes, the chunk limit is {MAX_CHUNK_BYTES}')
+
+    return report
@@ -1,14 +1,19 @@
 '''Autocomplete Module'''
 
+import asyncio
+from concurrent.futures import Future, wait
+from copy import deepcopy
+from threading import Event, Lock, RLock
 from time import time
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import send_async_request
+from constructor_io.helpers.cache import LRUCache
+from constructor_io.helpers.concurrency import get_executor
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -50,12 +55,245 @@ def _create_autocomplete_url_filters_by_section(query_params, filters):
     else:
         raise ConstructorException('filters must be a dictionary')
 
+def _process_autocomplete_response(json):
+    '''Validate autocomplete response data and append result_id to each item'''
+
+    if json.get('sections'):
+        if json.get('result_id'):
+            for section_items in json.get('sections').values():
+                for item in section_items:
+                    item['result_id'] = json.get('result_id')
+
+        return json
+
+    raise ConstructorException('get_autocomplete_results response data is malformed')
+
+def _get_session_id(user_parameters):
+    '''Get the session_id the latest request of a user is tracked by'''
+
+    session_id = (user_parameters or {}).get('session_id')
+
+    if session_id is None:
+        raise ConstructorException('user_parameters.session_id is a required parameter')
+
+    return session_id
+
+class _LatestRequest:
+    '''Request of a session that is discarded once a newer request of the same session is made'''
+
+    def __init__(self, future):
+        self.future = future
+        self.superseded = False
+        self.done = Event()
+        future.add_done_callback(lambda _: self.done.set())
+
+    def supersede(self):
+        '''Cancel the request if it has not started yet and release its caller'''
+
+        self.superseded = True
+        self.future.cancel()
+        self.done.set()
+
+class _PrefixNode:
+    # pylint: disable=too-few-public-methods
+    '''Prefix trie node holding the popularity of the continuations of a prefix'''
+
+    def __init__(self):
+        self.children = {}
+        self.weight = 0
+
+class AutocompleteSession:
+    # pylint: disable=too-many-instance-attributes
+    '''
+    Autocomplete session answering repeated and typed-ahead prefixes from memory
+
+    Results are cached per prefix, keeping the max_size most recently used prefixes for ttl seconds. When
+    prefetch queries (for example from recent query logs) are provided, they are indexed in a trie and the
+    most likely next keystrokes after each requested prefix are fetched in the background.
+
+    :param Autocomplete autocomplete: Autocomplete module used to request results
+    :param dict parameters: Additional parameters to refine result set, see Autocomplete.get_autocomplete_results
+    :param dict user_parameters: Parameters relevant to the user request, see Autocomplete.get_autocomplete_results
+    :param list|dict prefetch_queries: Likely queries, or a mapping of queries to their frequency
+    :param int prefetch_count: The number of likely next prefixes fetched after each request
+    :param concurrent.futures.Executor executor: Executor used for prefetching, such as the executor shared between modules (nothing is prefetched if omitted)
+    :param int max_size: The maximum number of prefixes whose results are kept in memory
+    :param float ttl: The number of seconds the results of a prefix are kept for
+    '''
+
+    def __init__(
+        self,
+        autocomplete,
+        parameters=None,
+        user_parameters=None,
+        *,
+        prefetch_queries=None,
+        prefetch_count=2,
+        executor=None,
+        max_size=1000,
+        ttl=300,
+    ):
+        # pylint: disable=too-many-arguments
+        self.autocomplete = autocomplete
+        self.parameters = parameters or {}
+        self.user_parameters = user_parameters or {}
+        self.prefetch_count = prefetch_count
+        self.__results = LRUCache(max_size=max_size, ttl=ttl)
+        self.__root = _PrefixNode()
+        # Reentrant as prefetches done before their callback is added discard themselves while it is held
+        self.__lock = RLock()
+        self.__executor = executor
+        self.__prefetches = set()
+
+        if isinstance(prefetch_queries, dict):
+            for query, weight in prefetch_queries.items():
+                self.__add_query(query, weight)
+        else:
+            for query in prefetch_queries or []:
+                self.__add_query(query, 1)
+
+    def __add_query(self, query, weight):
+        node = self.__root
+
+        for character in query:
+            node = node.children.setdefault(character, _PrefixNode())
+            node.weight += weight
+
+    def __find_node(self, prefix):
+        node = self.__root
+
+        for character in prefix:
+            node = node.children.get(character)
+
+            if node is None:
+                return None
+
+        return node
+
+    def __fetch(self, prefix):
+        return self.autocomplete.get_autocomplete_results(prefix, self.parameters, self.user_parameters)
+
+    def __prefetch_done(self, future):
+        with self.__lock:
+            self.__prefetches.discard(future)
+
+    def __prefetch_next(self, prefix):
+        node = self.__find_node(prefix)
+
+        if not self.__executor or not self.prefetch_count or node is None:
+            return
+
+        likely_children = sorted(node.children.items(), key=lambda child: child[1].weight, reverse=True)
+
+        for character, _ in likely_children[:self.prefetch_count]:
+            if self.__results.get(prefix + character) is None:
+                future = self.__executor.submit(self.__fetch, prefix + character)
+                self.__results.set(prefix + character, future)
+                self.__prefetches.add(future)
+                future.add_done_callback(self.__prefetch_done)
+
+    def get_autocomplete_results(self, query):
+        '''
+        Retrieve autocomplete results for a query, from memory when it was requested or prefetched before
+
+        :param str query: Autocomplete query
+
+        :return: dict
+        '''
+
+        if not query or not isinstance(query, str):
+            raise ConstructorException('query is a required parameter of type string')
+
+        with self.__lock:
+            future = self.__results.get(query)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self.__results.set(query, future)
+
+            self.__prefetch_next(query)
+
+        if owner:
+            try:
+                future.set_result(self.__fetch(query))
+            except Exception as exception: # pylint: disable=broad-except
+                future.set_exception(exception)
+
+        try:
+            return deepcopy(future.result())
+        except Exception:
+            # Failed requests are not cached so that the next keystroke retries them
+            with self.__lock:
+                if self.__results.get(query) is future:
+                    self.__results.delete(query)
+
+            raise
+
+    def clear(self):
+        '''Remove all cached results'''
+
+        self.__results.clear()
+
+    def close(self):
+        '''Wait for the prefetches in progress to complete'''
+
+        with self.__lock:
+            prefetches = list(self.__prefetches)
+
+        wait(prefetches)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 class Autocomplete:
     # pylint: disable=too-few-public-methods
     '''Autocomplete Class'''
 
     def __init__(self, options):
         self.__options = options or {}
+        self.__latest_requests = {}
+        self.__lock = Lock()
+
+    def create_session(
+        self,
+        parameters=None,
+        user_parameters=None,
+        prefetch_queries=None,
+        prefetch_count=2,
+        *,
+        max_size=1000,
+        ttl=300,
+    ):
+        # pylint: disable=too-many-arguments
+        '''
+        Create an autocomplete session caching results per prefix and prefetching likely next prefixes
+
+        Prefetches run on the executor shared between modules.
+
+        :param dict parameters: Additional parameters to refine result set, see get_autocomplete_results
+        :param dict user_parameters: Parameters relevant to the user request, see get_autocomplete_results
+        :param list|dict prefetch_queries: Likely queries, or a mapping of queries to their frequency (for example from recent query logs)
+        :param int prefetch_count: The number of likely next prefixes fetched after each request
+        :param int max_size: The maximum number of prefixes whose results are kept in memory
+        :param float ttl: The number of seconds the results of a prefix are kept for
+
+        :return: AutocompleteSession
+        '''
+
+        return AutocompleteSession(
+            self,
+            parameters,
+            user_parameters,
+            prefetch_queries=prefetch_queries,
+            prefetch_count=prefetch_count,
+            executor=get_executor(self.__options),
+            max_size=max_size,
+            ttl=ttl,
+        )
 
     def get_autocomplete_results(self, query, parameters=None, user_parameters=None):
         '''
@@ -87,25 +325,122 @@ class Autocomplete:
             user_parameters = {}
 
         request_url = _create_autocomplete_url(query, parameters, user_parameters, self.__options)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
+        return _process_autocomplete_response(response.json())
+
+    def get_latest_autocomplete_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Retrieve autocomplete results from API, discarding the request once a newer one is made for the same session
+
+        Intended for search-as-you-type, where only the results of the last prefix typed are shown. Requests
+        that have not started yet are cancelled when superseded, freeing the thread pool, and the callers of
+        superseded requests are released immediately instead of waiting for their response.
+
+        Accepts the same parameters as get_autocomplete_results, user_parameters.session_id is required
+
+        :return: dict, or None if the request was superseded by a newer request of the same session
+        '''
+
+        session_id = _get_session_id(user_parameters)
+        future = get_executor(self.__options).submit(
+            self.get_autocomplete_results,
+            query,
+            parameters,
+            user_parameters,
+        )
+        latest_request = _LatestRequest(future)
+
+        with self.__lock:
+            previous_request = self.__latest_requests.get(session_id)
+            self.__latest_requests[session_id] = latest_request
+
+        if previous_request is not None:
+            previous_request.supersede()
+
+        latest_request.done.wait()
+
+        with self.__lock:
+            if self.__latest_requests.get(session_id) is latest_request:
+                del self.__latest_requests[session_id]
+
+        if latest_request.superseded:
+            return None
+
+        return future.result()
+
+class AsyncAutocomplete:
+    # pylint: disable=too-few-public-methods
+    '''Async Autocomplete Class'''
+
+    def __init__(self, options):
+        self.__options = options or {}
+        self.__latest_tasks = {}
+
+    async def get_autocomplete_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Retrieve autocomplete results from API asynchronously
+
+        Accepts the same parameters as :meth:`Autocomplete.get_autocomplete_results`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_autocomplete_url(query, parameters, user_parameters, self.__options)
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options, user_parameters)
+        )
+
+        return _process_autocomplete_response(json)
+
+    async def get_latest_autocomplete_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Retrieve autocomplete results from API asynchronously, cancelling the request once superseded
+
+        Superseded requests are cancelled while in flight, releasing their connection to the pool.
+
+        Accepts the same parameters as :meth:`Autocomplete.get_latest_autocomplete_results`
+
+        :return: dict, or None if the request was superseded by a newer request of the same session
+        '''
+
+        session_id = _get_session_id(user_parameters)
+        task = asyncio.ensure_future(self.get_autocomplete_results(query, parameters, user_parameters))
+        previous_task = self.__latest_tasks.get(session_id)
+        self.__latest_tasks[session_id] = task
+
+        if previous_task is not None:
+            previous_task.cancel()
+
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            # Only swallow the cancellation when it comes from a newer request rather than from the caller
+            if self.__latest_tasks.get(session_id) is task:
+                raise
 
-        if json.get('sections'):
-            if json.get('result_id'):
-                for section_items in json.get('sections').values():
-                    for item in section_items:
-                        item['result_id'] = json.get('result_id')
+            return None
+        finally:
+            superseded = self.__latest_tasks.get(session_id) is not task
 
-            return json
+            if not superseded:
+                del self.__latest_tasks[session_id]
 
-        raise ConstructorException('get_autocomplete_results response data is malformed')
+        return None if superseded else result
@@ -1,14 +1,20 @@
 '''Browse Module'''
 
+from functools import partial
 from time import time
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import (gather_with_concurrency,
+                                                send_async_request)
+from constructor_io.helpers.concurrency import (check_timeout, get_executor,
+                                                get_results_or_exceptions,
+                                                submit_all)
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.pagination import (aiter_pages, get_page_results,
+                                               iter_pages)
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -32,6 +38,57 @@ def _create_browse_url(prefix, parameters, user_parameters, options, omit_timest
 
     return f'{options.get("service_url")}/{prefix}?{query_string}'
 
+def _process_browse_results_response(json, method_name):
+    '''Validate browse results response data and append result_id to each result'''
+
+    json_response = json.get('response')
+
+    if json_response:
+        if json_response.get('results') or json_response.get('results') == []:
+            result_id = json.get('result_id')
+
+            if result_id:
+                for result in json_response.get('results'):
+                    result['result_id'] = result_id
+
+            return json
+
+    raise ConstructorException(f'{method_name} response data is malformed')
+
+def _process_browse_list_response(json, key, method_name):
+    '''Validate browse groups / facets response data'''
+
+    json_response = json.get('response')
+
+    if json_response:
+        if json_response.get(key) or json_response.get(key) == []:
+            return json
+
+    raise ConstructorException(f'{method_name} response data is malformed')
+
+def _normalize_browse_specs(specs):
+    '''
+    Validate the specs of a browse fan-out and convert them to (filter_name, filter_value, parameters,
+    user_parameters) tuples
+
+    :return: tuple of the keys of the specs (None for a list) and the list of converted specs
+    '''
+
+    if isinstance(specs, dict):
+        keys = tuple(specs.keys())
+        specs = list(specs.values())
+    elif isinstance(specs, (list, tuple)):
+        keys = None
+    else:
+        raise ConstructorException('specs is a required parameter of type dict or list')
+
+    return keys, [tuple(spec) for spec in specs]
+
+def _key_browse_results(keys, results):
+    '''Key fan-out results by the keys of the specs, when they were given as a dict'''
+
+    return results if keys is None else dict(zip(keys, results))
+
 class Browse:
     '''Browse Class'''
 
@@ -88,30 +145,63 @@ class Browse:
             self.__options
         )
 
-        requests = self.__options.get('requests') or r
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
+        return _process_browse_results_response(response.json(), 'get_browse_results')
+
+    def get_browse_results_many(self, specs, max_concurrency=None, timeout=None):
+        '''
+        Retrieve browse results for many filters concurrently, sharing a single deadline
+
+        Requests share the client connection pool and run on its executor. A failed request does not
+        abort the fan-out, its exception is returned in place of its results. Requests not done by the
+        deadline are cancelled and a concurrent.futures.TimeoutError is returned in their place.
 
-        if json_response:
-            if json_response.get('results') or json_response.get('results') == []:
-                result_id = json.get('result_id')
+        :param dict specs: Tuples of (filter_name, filter_value, parameters, user_parameters) keyed by any hashable, see get_browse_results. A list of tuples is also accepted
+        :param int max_concurrency: The maximum number of requests in flight at the same time (limited by the client max_workers if omitted)
+        :param float timeout: Seconds to wait for all requests (no deadline if omitted)
 
-                if result_id:
-                    for result in json_response.get('results'):
-                        result['result_id'] = result_id
+        :return: dict of results (dict) or exceptions with the keys of specs, or list in the order of specs
+        '''
+
+        check_timeout(timeout)
+        keys, specs = _normalize_browse_specs(specs)
+        futures = submit_all(
+            get_executor(self.__options),
+            [partial(self.get_browse_results, *spec) for spec in specs],
+            max_concurrency,
+        )
+
+        return _key_browse_results(keys, get_results_or_exceptions(futures, timeout))
+
+    def iter_browse_results(self, filter_name, filter_value, parameters=None, user_parameters=None):
+        '''
+        Iterate over the browse results of all pages, from parameters.page on
+
+        The next page is fetched in the background while the results of the current one are consumed.
+        Iteration stops once total_num_results are consumed.
+
+        Accepts the same parameters as get_browse_results
+
+        :return: generator of results (dict)
+        '''
+
+        parameters = parameters or {}
 
-                return json
+        def fetch_page(page):
+            return get_page_results(
+                self.get_browse_results(filter_name, filter_value, { **parameters, 'page': page }, user_parameters)
+            )
 
-        raise ConstructorException('get_browse_results response data is malformed')
+        return iter_pages(get_executor(self.__options), fetch_page, parameters.get('page') or 1)
 
 
     def get_browse_results_for_item_ids(self, item_ids, parameters=None, user_parameters=None):
@@ -157,30 +247,17 @@ class Browse:
             user_parameters,
             self.__options
         )
-        requests = self.__options.get('requests') or r
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
-
-        if json_response:
-            if json_response.get('results') or json_response.get('results') == []:
-                result_id = json.get('result_id')
-
-                if result_id:
-                    for result in json_response.get('results'):
-                        result['result_id'] = result_id
-
-                return json
-
-        raise ConstructorException('get_browse_results_for_item_ids response data is malformed')
+        return _process_browse_results_response(response.json(), 'get_browse_results_for_item_ids')
 
 
     def get_browse_groups(self, parameters=None, user_parameters=None):
@@ -217,23 +294,16 @@ class Browse:
             self.__options,
             True
         )
-        requests = self.__options.get('requests') or r
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
-
-        if json_response:
-            if json_response.get('groups') or json_response.get('groups') == []:
-                return json
-
-        raise ConstructorException('get_browse_groups response data is malformed')
+        return _process_browse_list_response(response.json(), 'groups', 'get_browse_groups')
 
 
     def get_browse_facets(self, parameters=None, user_parameters=None):
@@ -272,23 +342,16 @@ class Browse:
             self.__options,
             True
         )
-        requests = self.__options.get('requests') or r
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
-
-        if json_response:
-            if json_response.get('facets') or json_response.get('facets') == []:
-                return json
-
-        raise ConstructorException('get_browse_facets response data is malformed')
+        return _process_browse_list_response(response.json(), 'facets', 'get_browse_facets')
 
     def get_browse_facet_options(self, facet_name, parameters=None, user_parameters=None):
         '''
@@ -327,20 +390,196 @@ class Browse:
             self.__options,
             True
         )
-        requests = self.__options.get('requests') or r
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
+        return _process_browse_list_response(response.json(), 'facets', 'get_browse_facet_options')
+
+
+class AsyncBrowse:
+    '''Async Browse Class'''
+
+
+    def __init__(self, options):
+        self.__options = options or {}
+
+
+    async def __get(self, request_url, user_parameters):
+        return await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options, user_parameters)
+        )
+
+
+    async def get_browse_results(self, filter_name, filter_value, parameters=None, user_parameters=None):
+        '''
+        Retrieve browse results from API asynchronously
+
+        Accepts the same parameters as :meth:`Browse.get_browse_results`
+
+        :return: dict
+        '''
+
+        if not filter_name or not isinstance(filter_name, str):
+            raise ConstructorException('filter_name is a required parameter of type string')
+
+        if not filter_value or not isinstance(filter_value, str):
+            raise ConstructorException('filter_value is a required parameter of type string')
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        url_prefix = f'browse/{quote(filter_name)}/{quote(filter_value)}'
+        request_url = _create_browse_url(url_prefix, parameters, user_parameters, self.__options)
+        json = await self.__get(request_url, user_parameters)
+
+        return _process_browse_results_response(json, 'get_browse_results')
+
+
+    async def get_browse_results_many(self, specs, max_concurrency=None, timeout=None):
+        '''
+        Retrieve browse results for many filters concurrently, sharing a single deadline
+
+        Accepts the same parameters as :meth:`Browse.get_browse_results_many`, requests not done by the
+        deadline return an asyncio.TimeoutError
+
+        :return: dict of results (dict) or exceptions with the keys of specs, or list in the order of specs
+        '''
+
+        keys, specs = _normalize_browse_specs(specs)
+        results = await gather_with_concurrency(
+            [self.get_browse_results(*spec) for spec in specs],
+            max_concurrency,
+            timeout,
+        )
+
+        return _key_browse_results(keys, results)
+
+
+    async def get_browse_results_for_item_ids(self, item_ids, parameters=None, user_parameters=None):
+        '''
+        Retrieve browse results from API using item ID's asynchronously
+
+        Accepts the same parameters as :meth:`Browse.get_browse_results_for_item_ids`
+
+        :return: dict
+        '''
+
+        if not item_ids or not isinstance(item_ids, list):
+            raise ConstructorException('item_ids is a required parameter of type list')
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_browse_url(
+            'browse/items',
+            { **parameters, 'item_ids': item_ids},
+            user_parameters,
+            self.__options
+        )
+        json = await self.__get(request_url, user_parameters)
+
+        return _process_browse_results_response(json, 'get_browse_results_for_item_ids')
+
+
+    async def get_browse_groups(self, parameters=None, user_parameters=None):
+        '''
+        Retrieve groups from API asynchronously
+
+        Accepts the same parameters as :meth:`Browse.get_browse_groups`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_browse_url('browse/groups', parameters, user_parameters, self.__options, True)
+        json = await self.__get(request_url, user_parameters)
+
+        return _process_browse_list_response(json, 'groups', 'get_browse_groups')
+
+
+    async def get_browse_facets(self, parameters=None, user_parameters=None):
+        '''
+        Retrieve facets from API asynchronously
+
+        Accepts the same parameters as :meth:`Browse.get_browse_facets`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_browse_url('browse/facets', parameters, user_parameters, self.__options, True)
+        json = await self.__get(request_url, user_parameters)
+
+        return _process_browse_list_response(json, 'facets', 'get_browse_facets')
+
+
+    async def get_browse_facet_options(self, facet_name, parameters=None, user_parameters=None):
+        '''
+        Retrieve facet options for a given facet group from the API asynchronously
+
+        Accepts the same parameters as :meth:`Browse.get_browse_facet_options`
+
+        :return: dict
+        '''
+
+        if not facet_name or not isinstance(facet_name, str):
+            raise ConstructorException('facet_name is a required parameter of type string')
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_browse_url(
+            'browse/facet_options',
+            { **parameters, 'facet_name': facet_name},
+            user_parameters,
+            self.__options,
+            True
+        )
+        json = await self.__get(request_url, user_parameters)
+
+        return _process_browse_list_response(json, 'facets', 'get_browse_facet_options')
+
+
+    def iter_browse_results(self, filter_name, filter_value, parameters=None, user_parameters=None):
+        '''
+        Iterate asynchronously over the browse results of all pages, from parameters.page on
+
+        Accepts the same parameters as :meth:`Browse.iter_browse_results`
+
+        :return: async generator of results (dict)
+        '''
+
+        parameters = parameters or {}
 
-        if json_response:
-            if json_response.get('facets') or json_response.get('facets') == []:
-                return json
+        async def fetch_page(page):
+            return get_page_results(await self.get_browse_results(
+                filter_name,
+                filter_value,
+                { **parameters, 'page': page },
+                user_parameters,
+            ))
 
-        raise ConstructorException('get_browse_facet_options response data is malformed')
+        return aiter_pages(fetch_page, parameters.get('page') or 1)
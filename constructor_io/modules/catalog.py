@@ -2,12 +2,14 @@
 
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import send_async_request
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.ledger import DEFAULT_SECTION
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
+                                          send_request,
                                           throw_http_exception_from_response)
+from constructor_io.modules.catalog_bulk import (AsyncBulkCatalogMixin,
+                                                 BulkCatalogMixin)
 
 
 def _create_query_params_and_file_data(parameters):
@@ -126,10 +128,51 @@ def _create_item_groups_url(path, options, additional_query_params):
 
     return f'{options.get("service_url")}/v1/{quote(path)}?{query_string}'
 
-class Catalog:
+def _filter_unchanged(options, key, parameters, partial=False):
+    '''
+    Leave out the records whose content is the same as when last accepted, when the client has a ledger
+
+    Partial updates are recorded apart from replaces, so a replace is not left out after an update.
+
+    :return: tuple of the parameters with the records to send and their content hashes to record once accepted (None without a ledger)
+    '''
+
+    ledger = options.get('ledger')
+
+    if ledger is None or not parameters:
+        return parameters, None
+
+    records, hashes = ledger.filter_changed(key, parameters.get('section'), parameters.get(key) or [], partial)
+
+    return { **parameters, key: records }, hashes
+
+def _record_accepted(options, key, parameters, hashes):
+    '''Record the content hashes of the records accepted by the API in the ledger of the client'''
+
+    if hashes:
+        options.get('ledger').record(key, parameters.get('section'), hashes)
+
+def _forget_deleted(options, key, parameters, records):
+    '''Forget the records deleted from the index in the ledger of the client'''
+
+    ledger = options.get('ledger')
+
+    if ledger is not None:
+        ledger.forget(key, parameters.get('section'), [record.get('id') for record in records])
+
+def _clear_ledger(options, parameters):
+    '''Forget the section of the catalog files sent in the ledger of the client, the index may now differ from it'''
+
+    ledger = options.get('ledger')
+
+    if ledger is not None:
+        ledger.clear((parameters or {}).get('section') or DEFAULT_SECTION)
+
+class Catalog(BulkCatalogMixin):
     '''Catalog Class'''
 
     def __init__(self, options):
+        super().__init__(options)
         self.__options = options or {}
 
     def replace_catalog(self, parameters=None):
@@ -140,18 +183,18 @@ class Catalog:
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the catalog even if it will invalidate a large number of existing items
-        :param file parameters.items: The CSV file with all new items
-        :param file parameters.variations: The CSV file with all new variations
-        :param file parameters.item_groups: The CSV file with all new item_groups
+        :param file parameters.items: The CSV file with all new items, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.variations: The CSV file with all new variations, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.item_groups: The CSV file with all new item_groups, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
         '''
 
         query_params, file_data = _create_query_params_and_file_data(parameters)
         request_url = _create_catalog_url('catalog', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.put(
+        response = send_request(
+            self.__options,
+            'put',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             files=file_data
         )
@@ -160,6 +203,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _clear_ledger(self.__options, parameters)
 
         return json
 
@@ -171,18 +215,18 @@ class Catalog:
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the catalog even if it will invalidate a large number of existing items
-        :param file parameters.items: The CSV file with all new items
-        :param file parameters.variations: The CSV file with all new variations
-        :param file parameters.item_groups: The CSV file with all new item_groups
+        :param file parameters.items: The CSV file with all new items, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.variations: The CSV file with all new variations, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.item_groups: The CSV file with all new item_groups, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
         '''
 
         query_params, file_data = _create_query_params_and_file_data(parameters)
         request_url = _create_catalog_url('catalog', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.patch(
+        response = send_request(
+            self.__options,
+            'patch',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             files=file_data
         )
@@ -191,6 +235,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _clear_ledger(self.__options, parameters)
 
         return json
 
@@ -202,18 +247,18 @@ class Catalog:
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the catalog even if it will invalidate a large number of existing items
-        :param file parameters.items: The CSV file with all new items
-        :param file parameters.variations: The CSV file with all new variations
-        :param file parameters.item_groups: The CSV file with all new item_groups
+        :param file parameters.items: The CSV file with all new items, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.variations: The CSV file with all new variations, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
+        :param file parameters.item_groups: The CSV file with all new item_groups, as bytes, CSV text (str), a path (os.PathLike) read while uploading, a stream or an iterable of bytes
         '''
 
         query_params, file_data = _create_query_params_and_file_data(parameters)
         request_url = _create_catalog_url('catalog', self.__options, { **query_params, 'patch_delta': True })
-        requests = self.__options.get('requests') or r
 
-        response = requests.patch(
+        response = send_request(
+            self.__options,
+            'patch',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             files=file_data
         )
@@ -222,6 +267,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _clear_ledger(self.__options, parameters)
 
         return json
 
@@ -229,19 +275,27 @@ class Catalog:
         '''
         Add multiple items to index whilst replacing existing ones (limit of 1,000)
 
+        Items unchanged since the API last accepted them are left out when the client has a ledger.
+        No request is sent and None is returned when none changed.
+
         :param list parameters.items: A list of items with the same attributes as defined in https://docs.constructor.com/reference/catalog-items
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the update even if it will invalidate a large number of existing items
         '''
 
+        parameters, hashes = _filter_unchanged(self.__options, 'items', parameters)
+
+        if hashes is not None and not parameters.get('items'):
+            return None
+
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('items', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.put(
+        response = send_request(
+            self.__options,
+            'put',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'items': parameters.get('items') }
         )
@@ -250,6 +304,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _record_accepted(self.__options, 'items', parameters, hashes)
 
         return json
 
@@ -257,19 +312,27 @@ class Catalog:
         '''
         Update multiple items in the index (limit of 1,000)
 
+        Items unchanged since the API last accepted them are left out when the client has a ledger.
+        No request is sent and None is returned when none changed.
+
         :param list parameters.items: A list of items with the same attributes as defined in https://docs.constructor.com/reference/catalog-items
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the update even if it will invalidate a large number of existing items
         '''
 
+        parameters, hashes = _filter_unchanged(self.__options, 'items', parameters, partial=True)
+
+        if hashes is not None and not parameters.get('items'):
+            return None
+
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('items', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.patch(
+        response = send_request(
+            self.__options,
+            'patch',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'items': parameters.get('items') }
         )
@@ -278,6 +341,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _record_accepted(self.__options, 'items', parameters, hashes)
 
         return json
 
@@ -293,13 +357,13 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('items', self.__options, query_params)
-        requests = self.__options.get('requests') or r
         items = parameters.get('items') or []
         items_with_only_ids = list(map(lambda x: { 'id': x.get('id') }, items))
 
-        response = requests.delete(
+        response = send_request(
+            self.__options,
+            'delete',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'items': items_with_only_ids }
         )
@@ -308,6 +372,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _forget_deleted(self.__options, 'items', parameters, items_with_only_ids)
 
         return json
 
@@ -327,11 +392,11 @@ class Catalog:
         query_params = _create_query_params_for_items(parameters)
 
         request_url = _create_items_url('items', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
         )
 
@@ -346,19 +411,27 @@ class Catalog:
         '''
         Add multiple variations to index whilst replacing existing ones (limit of 1,000)
 
+        Variations unchanged since the API last accepted them are left out when the client has a ledger.
+        No request is sent and None is returned when none changed.
+
         :param list parameters.variations: A list of variations with the same attributes as defined in https://docs.constructor.com/reference/catalog-variations
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the update even if it will invalidate a large number of existing variations
         '''
 
+        parameters, hashes = _filter_unchanged(self.__options, 'variations', parameters)
+
+        if hashes is not None and not parameters.get('variations'):
+            return None
+
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('variations', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.put(
+        response = send_request(
+            self.__options,
+            'put',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'variations': parameters.get('variations') }
         )
@@ -367,6 +440,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _record_accepted(self.__options, 'variations', parameters, hashes)
 
         return json
 
@@ -374,19 +448,27 @@ class Catalog:
         '''
         Update multiple variations in the index (limit of 1,000)
 
+        Variations unchanged since the API last accepted them are left out when the client has a ledger.
+        No request is sent and None is returned when none changed.
+
         :param list parameters.variations: A list of variations with the same attributes as defined in https://docs.constructor.com/reference/catalog-variations
         :param str parameters.section: The section to update
         :param str parameters.notification_email: An email address to receive an email notification if the task fails
         :param bool parameters.force: Process the update even if it will invalidate a large number of existing variations
         '''
 
+        parameters, hashes = _filter_unchanged(self.__options, 'variations', parameters, partial=True)
+
+        if hashes is not None and not parameters.get('variations'):
+            return None
+
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('variations', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.patch(
+        response = send_request(
+            self.__options,
+            'patch',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'variations': parameters.get('variations') }
         )
@@ -395,6 +477,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _record_accepted(self.__options, 'variations', parameters, hashes)
 
         return json
 
@@ -410,13 +493,13 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_items_url('variations', self.__options, query_params)
-        requests = self.__options.get('requests') or r
         variations = parameters.get('variations') or []
         variations_with_only_ids = list(map(lambda x: { 'id': x.get('id') }, variations))
 
-        response = requests.delete(
+        response = send_request(
+            self.__options,
+            'delete',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'variations': variations_with_only_ids }
         )
@@ -425,6 +508,7 @@ class Catalog:
             throw_http_exception_from_response(response)
 
         json = response.json()
+        _forget_deleted(self.__options, 'variations', parameters, variations_with_only_ids)
 
         return json
 
@@ -449,11 +533,11 @@ class Catalog:
             query_params['item_id'] = item_id
 
         request_url = _create_items_url('variations', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
         )
 
@@ -473,11 +557,11 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_item_groups_url('item_groups', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options)
         )
 
@@ -498,11 +582,11 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_item_groups_url('item_groups', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.post(
+        response = send_request(
+            self.__options,
+            'post',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'item_groups': parameters.get('item_groups') }
         )
@@ -526,11 +610,11 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_item_groups_url('item_groups', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.put(
+        response = send_request(
+            self.__options,
+            'put',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'item_groups': parameters.get('item_groups') }
         )
@@ -553,11 +637,11 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_item_groups_url('item_groups', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.patch(
+        response = send_request(
+            self.__options,
+            'patch',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options),
             json={ 'item_groups': parameters.get('item_groups') }
         )
@@ -578,11 +662,11 @@ class Catalog:
 
         query_params = _create_query_params_for_items(parameters)
         request_url = _create_item_groups_url('item_groups', self.__options, query_params)
-        requests = self.__options.get('requests') or r
 
-        response = requests.delete(
+        response = send_request(
+            self.__options,
+            'delete',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options)
         )
 
@@ -592,3 +676,273 @@ class Catalog:
         json = response.json()
 
         return json
+
+class AsyncCatalog(AsyncBulkCatalogMixin):
+    '''Async Catalog Class'''
+
+    def __init__(self, options):
+        self.__options = options or {}
+
+    async def __send(self, method, request_url, json=None, files=None):
+        return await send_async_request(
+            self.__options,
+            method,
+            request_url,
+            headers=create_request_headers(self.__options),
+            json=json,
+            files=files
+        )
+
+    async def replace_catalog(self, parameters=None):
+        '''
+        Send full catalog files to replace the current catalog asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.replace_catalog`
+        '''
+
+        query_params, file_data = _create_query_params_and_file_data(parameters)
+        request_url = _create_catalog_url('catalog', self.__options, query_params)
+
+        json = await self.__send('put', request_url, files=file_data)
+        _clear_ledger(self.__options, parameters)
+
+        return json
+
+    async def update_catalog(self, parameters=None):
+        '''
+        Send full catalog files to update the current catalog asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.update_catalog`
+        '''
+
+        query_params, file_data = _create_query_params_and_file_data(parameters)
+        request_url = _create_catalog_url('catalog', self.__options, query_params)
+
+        json = await self.__send('patch', request_url, files=file_data)
+        _clear_ledger(self.__options, parameters)
+
+        return json
+
+    async def patch_catalog(self, parameters=None):
+        '''
+        Send catalog delta files to patch the current catalog asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.patch_catalog`
+        '''
+
+        query_params, file_data = _create_query_params_and_file_data(parameters)
+        request_url = _create_catalog_url('catalog', self.__options, { **query_params, 'patch_delta': True })
+
+        json = await self.__send('patch', request_url, files=file_data)
+        _clear_ledger(self.__options, parameters)
+
+        return json
+
+    async def create_or_replace_items(self, parameters=None):
+        '''
+        Add multiple items to index whilst replacing existing ones (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.create_or_replace_items`
+        '''
+
+        parameters, hashes = _filter_unchanged(self.__options, 'items', parameters)
+
+        if hashes is not None and not parameters.get('items'):
+            return None
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('items', self.__options, query_params)
+
+        json = await self.__send('put', request_url, json={ 'items': parameters.get('items') })
+        _record_accepted(self.__options, 'items', parameters, hashes)
+
+        return json
+
+    async def update_items(self, parameters=None):
+        '''
+        Update multiple items in the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.update_items`
+        '''
+
+        parameters, hashes = _filter_unchanged(self.__options, 'items', parameters, partial=True)
+
+        if hashes is not None and not parameters.get('items'):
+            return None
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('items', self.__options, query_params)
+
+        json = await self.__send('patch', request_url, json={ 'items': parameters.get('items') })
+        _record_accepted(self.__options, 'items', parameters, hashes)
+
+        return json
+
+    async def delete_items(self, parameters=None):
+        '''
+        Delete multiple items from the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.delete_items`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('items', self.__options, query_params)
+        items = parameters.get('items') or []
+        items_with_only_ids = list(map(lambda x: { 'id': x.get('id') }, items))
+
+        json = await self.__send('delete', request_url, json={ 'items': items_with_only_ids })
+        _forget_deleted(self.__options, 'items', parameters, items_with_only_ids)
+
+        return json
+
+    async def retrieve_items(self, parameters=None):
+        '''
+        Retrieves multiple items from the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.retrieve_items`
+        '''
+
+        if not parameters:
+            parameters = {}
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('items', self.__options, query_params)
+
+        return await self.__send('get', request_url)
+
+    async def create_or_replace_variations(self, parameters=None):
+        '''
+        Add multiple variations to index whilst replacing existing ones (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.create_or_replace_variations`
+        '''
+
+        parameters, hashes = _filter_unchanged(self.__options, 'variations', parameters)
+
+        if hashes is not None and not parameters.get('variations'):
+            return None
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('variations', self.__options, query_params)
+
+        json = await self.__send('put', request_url, json={ 'variations': parameters.get('variations') })
+        _record_accepted(self.__options, 'variations', parameters, hashes)
+
+        return json
+
+    async def update_variations(self, parameters=None):
+        '''
+        Update multiple variations in the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.update_variations`
+        '''
+
+        parameters, hashes = _filter_unchanged(self.__options, 'variations', parameters, partial=True)
+
+        if hashes is not None and not parameters.get('variations'):
+            return None
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('variations', self.__options, query_params)
+
+        json = await self.__send('patch', request_url, json={ 'variations': parameters.get('variations') })
+        _record_accepted(self.__options, 'variations', parameters, hashes)
+
+        return json
+
+    async def delete_variations(self, parameters=None):
+        '''
+        Delete multiple variations from the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.delete_variations`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_items_url('variations', self.__options, query_params)
+        variations = parameters.get('variations') or []
+        variations_with_only_ids = list(map(lambda x: { 'id': x.get('id') }, variations))
+
+        json = await self.__send('delete', request_url, json={ 'variations': variations_with_only_ids })
+        _forget_deleted(self.__options, 'variations', parameters, variations_with_only_ids)
+
+        return json
+
+    async def retrieve_variations(self, parameters=None):
+        '''
+        Retrieves multiple variations from the index (limit of 1,000) asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.retrieve_variations`
+        '''
+
+        if not parameters:
+            parameters = {}
+
+        query_params = _create_query_params_for_items(parameters)
+        item_id = parameters.get('item_id')
+
+        if item_id:
+            query_params['item_id'] = item_id
+
+        request_url = _create_items_url('variations', self.__options, query_params)
+
+        return await self.__send('get', request_url)
+
+    async def retrieve_item_groups(self, parameters=None):
+        '''
+        Retrieve all item groups asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.retrieve_item_groups`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_item_groups_url('item_groups', self.__options, query_params)
+
+        return await self.__send('get', request_url)
+
+    async def create_item_groups(self, parameters=None):
+        '''
+        Create new item groups asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.create_item_groups`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_item_groups_url('item_groups', self.__options, query_params)
+
+        return await self.__send('post', request_url, json={ 'item_groups': parameters.get('item_groups') })
+
+    async def create_or_replace_item_groups(self, parameters=None):
+        '''
+        Create or replace item groups asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.create_or_replace_item_groups`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_item_groups_url('item_groups', self.__options, query_params)
+
+        return await self.__send('put', request_url, json={ 'item_groups': parameters.get('item_groups') })
+
+    async def create_or_update_item_groups(self, parameters=None):
+        '''
+        Update item groups asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.create_or_update_item_groups`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_item_groups_url('item_groups', self.__options, query_params)
+
+        return await self.__send('patch', request_url, json={ 'item_groups': parameters.get('item_groups') })
+
+    async def delete_item_groups(self, parameters=None):
+        '''
+        Delete all item groups asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.delete_item_groups`
+        '''
+
+        query_params = _create_query_params_for_items(parameters)
+        request_url = _create_item_groups_url('item_groups', self.__options, query_params)
+
+        return await self.__send('delete', request_url)
@@ -0,0 +1,466 @@
+'''Catalog Bulk Operations Module'''
+
+import asyncio
+from functools import partial
+from tempfile import TemporaryDirectory
+
+from constructor_io.helpers.bulk import (MAX_CHUNK_BYTES, MAX_CHUNK_SIZE,
+                                         flatten_item_groups, iter_chunks,
+                                         upload_chunks, upload_chunks_async,
+                                         upload_levels, upload_levels_async)
+from constructor_io.helpers.concurrency import get_executor
+from constructor_io.helpers.delta import PARTITIONS, build_catalog_delta
+from constructor_io.helpers.pagination import AsyncPageIterator, PageIterator
+
+
+def _create_page_fetcher(retrieve, key, parameters):
+    '''
+    Create a function fetching a page of items or variations for a page iterator
+
+    :return: tuple of the fetching function and the page size
+    '''
+
+    page_size = parameters.get('num_results_per_page') or 100
+
+    def fetch_page(page):
+        json = retrieve({ **parameters, 'page': page, 'num_results_per_page': page_size })
+
+        return json.get(key), json.get('total_count')
+
+    return fetch_page, page_size
+
+def _create_async_page_fetcher(retrieve, key, parameters):
+    '''Create a coroutine function fetching a page of items or variations for an async page iterator'''
+
+    page_size = parameters.get('num_results_per_page') or 100
+
+    async def fetch_page(page):
+        json = await retrieve({ **parameters, 'page': page, 'num_results_per_page': page_size })
+
+        return json.get(key), json.get('total_count')
+
+    return fetch_page, page_size
+
+def _create_delta_parameters(parameters, delta):
+    '''Create the parameters of patch_catalog sending the files of a delta'''
+
+    return {
+        **{ key: parameters.get(key) for key in ('section', 'notification_email', 'force') },
+        **delta.files,
+    }
+
+def _create_chunker(parameters):
+    '''Create the function splitting records into chunks of the size set by the parameters of a bulk upload'''
+
+    return partial(
+        iter_chunks,
+        max_size=parameters.get('chunk_size') or MAX_CHUNK_SIZE,
+        max_bytes=parameters.get('max_chunk_bytes') or MAX_CHUNK_BYTES,
+    )
+
+def _create_bulk_upload(upload, key, parameters):
+    '''
+    Create the chunks of a bulk upload and the function uploading a chunk with the other parameters
+
+    :return: tuple of the chunks (generator) and the uploading function
+    '''
+
+    parameters = parameters or {}
+    chunks = _create_chunker(parameters)(parameters.get(key) or [])
+
+    return chunks, lambda records: upload({ **parameters, key: records })
+
+def _create_bulk_delete(delete, key, parameters):
+    '''
+    Create the chunks of a bulk delete from the IDs of the parameters and the function deleting a chunk
+    with the other parameters
+
+    :return: tuple of the chunks (generator) and the deleting function
+    '''
+
+    parameters = parameters or {}
+    ids = (item_id.strip() if isinstance(item_id, str) else item_id for item_id in parameters.get('ids') or [])
+    records = ({ 'id': item_id } for item_id in ids if item_id)
+    chunks = _create_chunker(parameters)(records)
+    # The IDs are sent in the body of each chunk, left in the parameters they would be sent as query params
+    chunk_parameters = {
+        name: value
+        for name, value in parameters.items()
+        if name not in ('ids', 'chunk_size', 'max_chunk_bytes')
+    }
+
+    return chunks, lambda records: delete({ **chunk_parameters, key: records })
+
+def _create_item_groups_sync(upload, parameters):
+    '''
+    Create the levels of a bulk item groups sync, the function splitting them into chunks and the function
+    uploading a chunk with the other parameters
+
+    :return: tuple of the levels, the chunking function and the uploading function
+    '''
+
+    parameters = parameters or {}
+    levels = flatten_item_groups(parameters.get('item_groups'))
+
+    return levels, _create_chunker(parameters), lambda records: upload({ **parameters, 'item_groups': records })
+
+class BulkCatalogMixin:
+    '''
+    Catalog operations built on the requests of the Catalog class: catalog deltas, bulk uploads and
+    deletes, and iterators over all items and variations
+    '''
+
+    def __init__(self, options):
+        self.__options = options or {}
+
+    def patch_catalog_delta(self, parameters=None):
+        '''
+        Compare the previous and current versions of catalog files and patch the catalog with the rows
+        added or changed only
+
+        Files are compared on disk in partitions by row ID, so they can be larger than memory. Rows
+        removed since the previous files are not deleted, their IDs are returned so they can be sent to
+        bulk_delete_items and bulk_delete_variations.
+
+        :param dict parameters.previous: The catalog files last sent, keyed by file name (items, variations or item_groups), as bytes, CSV text (str), paths (os.PathLike), streams or iterables of bytes
+        :param dict parameters.current: The current catalog files, keyed by file name
+        :param str parameters.section: The section to update
+        :param str parameters.notification_email: An email address to receive an email notification if the task fails
+        :param bool parameters.force: Process the catalog even if it will invalidate a large number of existing items
+        :param int parameters.partitions: The number of partitions the files are split into, more partitions hold less in memory. Defaults to 16
+
+        :return: CatalogDelta, with the response of patch_catalog (None if no row was added or changed). The delta files are removed once sent
+        '''
+
+        parameters = parameters or {}
+
+        with TemporaryDirectory() as directory:
+            delta = build_catalog_delta(
+                parameters.get('previous'),
+                parameters.get('current'),
+                directory,
+                parameters.get('partitions') or PARTITIONS,
+            )
+
+            if delta.files:
+                delta.response = self.patch_catalog(_create_delta_parameters(parameters, delta))
+
+        return delta
+
+    def bulk_create_or_replace_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Add any number of items to index whilst replacing existing ones, in concurrent chunks
+
+        Items are consumed lazily and sent in chunks of at most chunk_size items and max_chunk_bytes
+        bytes, at most max_concurrency chunks at a time. A chunk failing with a rate limit, server or
+        network error is sent again up to retries times. Failed chunks do not stop the upload.
+
+        :param iterable parameters.items: Items with the same attributes as defined in https://docs.constructor.com/reference/catalog-items, such as a generator
+        :param str parameters.section: The section to update
+        :param str parameters.notification_email: An email address to receive an email notification if a task fails
+        :param bool parameters.force: Process the update even if it will invalidate a large number of existing items
+        :param int parameters.chunk_size: The maximum number of items of a chunk. Defaults to 1,000
+        :param int parameters.max_chunk_bytes: The maximum size of the serialized items of a chunk. Defaults to 8 MB
+        :param int max_concurrency: The maximum number of chunks uploaded at the same time
+        :param int retries: The number of times a failed chunk is sent again
+
+        :return: BulkReport
+        '''
+
+        chunks, upload = _create_bulk_upload(self.create_or_replace_items, 'items', parameters)
+
+        return upload_chunks(
+            get_executor(self.__options),
+            chunks,
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+    def bulk_update_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Update any number of items in the index, in concurrent chunks
+
+        Accepts the same parameters as bulk_create_or_replace_items
+
+        :return: BulkReport
+        '''
+
+        chunks, upload = _create_bulk_upload(self.update_items, 'items', parameters)
+
+        return upload_chunks(
+            get_executor(self.__options),
+            chunks,
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+    def bulk_delete_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Delete any number of items from the index, streaming their IDs in concurrent chunks
+
+        IDs are consumed lazily, such as the lines of a file, and sent in chunks of at most chunk_size IDs,
+        at most max_concurrency chunks at a time, so only the chunks in flight are held in memory. A chunk
+        failing with a rate limit, server or network error is sent again up to retries times.
+
+        :param iterable parameters.ids: IDs of the items to delete, surrounding whitespace and blank IDs are ignored
+        :param str parameters.section: The section to update
+        :param str parameters.notification_email: An email address to receive an email notification if a task fails
+        :param bool parameters.force: Process the update even if it will invalidate a large number of existing items
+        :param int parameters.chunk_size: The maximum number of IDs of a chunk. Defaults to 1,000
+        :param int max_concurrency: The maximum number of chunks deleted at the same time
+        :param int retries: The number of times a failed chunk is sent again
+
+        :return: BulkReport
+        '''
+
+        chunks, delete = _create_bulk_delete(self.delete_items, 'items', parameters)
+
+        return upload_chunks(
+            get_executor(self.__options),
+            chunks,
+            delete,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+    def bulk_delete_variations(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Delete any number of variations from the index, streaming their IDs in concurrent chunks
+
+        IDs are consumed lazily, such as the lines of a file, and sent in chunks of at most chunk_size IDs,
+        at most max_concurrency chunks at a time, so only the chunks in flight are held in memory. A chunk
+        failing with a rate limit, server or network error is sent again up to retries times.
+
+        :param iterable parameters.ids: IDs of the variations to delete, surrounding whitespace and blank IDs are ignored
+        :param str parameters.section: The section to update
+        :param str parameters.notification_email: An email address to receive an email notification if a task fails
+        :param bool parameters.force: Process the update even if it will invalidate a large number of existing variations
+        :param int parameters.chunk_size: The maximum number of IDs of a chunk. Defaults to 1,000
+        :param int max_concurrency: The maximum number of chunks deleted at the same time
+        :param int retries: The number of times a failed chunk is sent again
+
+        :return: BulkReport
+        '''
+
+        chunks, delete = _create_bulk_delete(self.delete_variations, 'variations', parameters)
+
+        return upload_chunks(
+            get_executor(self.__options),
+            chunks,
+            delete,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+    def iter_all_items(self, parameters=None, max_concurrency=4):
+        '''
+        Iterate over all items of the index, fetching up to max_concurrency pages at a time
+
+        Items are returned in page order. When iteration fails, the checkpoint attribute of the iterator is
+        the page to resume from with parameters.page.
+
+        :param str parameters.section: The section to retrieve from
+        :param int parameters.num_results_per_page: The number of items per page. Defaults to 100. Maximum value 100
+        :param int parameters.page: The page to start from. Defaults to 1
+        :param int max_concurrency: The maximum number of pages fetched at the same time
+
+        :return: PageIterator of items (dict)
+        '''
+
+        parameters = parameters or {}
+        fetch_page, page_size = _create_page_fetcher(self.retrieve_items, 'items', parameters)
+
+        return PageIterator(
+            get_executor(self.__options),
+            fetch_page,
+            page_size,
+            parameters.get('page') or 1,
+            max_concurrency,
+        )
+
+    def iter_all_variations(self, parameters=None, max_concurrency=4):
+        '''
+        Iterate over all variations of the index, fetching up to max_concurrency pages at a time
+
+        Variations are returned in page order. When iteration fails, the checkpoint attribute of the
+        iterator is the page to resume from with parameters.page.
+
+        :param str parameters.item_id: Item ID of variations to retrieve
+        :param str parameters.section: The section to retrieve from
+        :param int parameters.num_results_per_page: The number of variations per page. Defaults to 100. Maximum value 100
+        :param int parameters.page: The page to start from. Defaults to 1
+        :param int max_concurrency: The maximum number of pages fetched at the same time
+
+        :return: PageIterator of variations (dict)
+        '''
+
+        parameters = parameters or {}
+        fetch_page, page_size = _create_page_fetcher(self.retrieve_variations, 'variations', parameters)
+
+        return PageIterator(
+            get_executor(self.__options),
+            fetch_page,
+            page_size,
+            parameters.get('page') or 1,
+            max_concurrency,
+        )
+
+    def bulk_sync_item_groups(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Create or update any number of item groups, parents before children, in concurrent chunks
+
+        The tree of item groups is flattened, children are given the parent_id of their parent. Levels of
+        the tree are uploaded one after the other, the chunks of a level at most max_concurrency at a time.
+        A chunk failing with a rate limit, server or network error is sent again up to retries times. Item
+        groups whose parent failed to upload are not sent and are reported as failed.
+
+        :param list parameters.item_groups: A list of item groups with their children
+        :param str parameters.section: The section to update
+        :param int parameters.chunk_size: The maximum number of item groups of a chunk. Defaults to 1,000
+        :param int parameters.max_chunk_bytes: The maximum size of the serialized item groups of a chunk. Defaults to 8 MB
+        :param int max_concurrency: The maximum number of chunks uploaded at the same time
+        :param int retries: The number of times a failed chunk is sent again
+
+        :return: BulkReport
+        '''
+
+        levels, create_chunks, upload = _create_item_groups_sync(self.create_or_update_item_groups, parameters)
+
+        return upload_levels(
+            get_executor(self.__options),
+            levels,
+            create_chunks,
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
+
+class AsyncBulkCatalogMixin:
+    '''Catalog operations built on the requests of the AsyncCatalog class'''
+
+    async def patch_catalog_delta(self, parameters=None):
+        '''
+        Compare the previous and current versions of catalog files and patch the catalog with the rows
+        added or changed only asynchronously, the files are compared in a thread
+
+        Accepts the same parameters as :meth:`Catalog.patch_catalog_delta`
+
+        :return: CatalogDelta
+        '''
+
+        parameters = parameters or {}
+
+        with TemporaryDirectory() as directory:
+            delta = await asyncio.get_running_loop().run_in_executor(None, partial(
+                build_catalog_delta,
+                parameters.get('previous'),
+                parameters.get('current'),
+                directory,
+                parameters.get('partitions') or PARTITIONS,
+            ))
+
+            if delta.files:
+                delta.response = await self.patch_catalog(_create_delta_parameters(parameters, delta))
+
+        return delta
+
+    async def bulk_create_or_replace_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Add any number of items to index whilst replacing existing ones, in concurrent chunks asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.bulk_create_or_replace_items`
+
+        :return: BulkReport
+        '''
+
+        chunks, upload = _create_bulk_upload(self.create_or_replace_items, 'items', parameters)
+
+        return await upload_chunks_async(chunks, upload, max_concurrency=max_concurrency, retries=retries)
+
+    async def bulk_update_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Update any number of items in the index, in concurrent chunks asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.bulk_update_items`
+
+        :return: BulkReport
+        '''
+
+        chunks, upload = _create_bulk_upload(self.update_items, 'items', parameters)
+
+        return await upload_chunks_async(chunks, upload, max_concurrency=max_concurrency, retries=retries)
+
+    async def bulk_delete_items(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Delete any number of items from the index, streaming their IDs in concurrent chunks asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.bulk_delete_items`
+
+        :return: BulkReport
+        '''
+
+        chunks, delete = _create_bulk_delete(self.delete_items, 'items', parameters)
+
+        return await upload_chunks_async(chunks, delete, max_concurrency=max_concurrency, retries=retries)
+
+    async def bulk_delete_variations(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Delete any number of variations from the index, streaming their IDs in concurrent chunks asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.bulk_delete_variations`
+
+        :return: BulkReport
+        '''
+
+        chunks, delete = _create_bulk_delete(self.delete_variations, 'variations', parameters)
+
+        return await upload_chunks_async(chunks, delete, max_concurrency=max_concurrency, retries=retries)
+
+    def iter_all_items(self, parameters=None, max_concurrency=4):
+        '''
+        Iterate asynchronously over all items of the index, fetching up to max_concurrency pages at a time
+
+        Accepts the same parameters as :meth:`Catalog.iter_all_items`
+
+        :return: AsyncPageIterator of items (dict)
+        '''
+
+        parameters = parameters or {}
+        fetch_page, page_size = _create_async_page_fetcher(self.retrieve_items, 'items', parameters)
+
+        return AsyncPageIterator(fetch_page, page_size, parameters.get('page') or 1, max_concurrency)
+
+    def iter_all_variations(self, parameters=None, max_concurrency=4):
+        '''
+        Iterate asynchronously over all variations of the index, fetching up to max_concurrency pages at a time
+
+        Accepts the same parameters as :meth:`Catalog.iter_all_variations`
+
+        :return: AsyncPageIterator of variations (dict)
+        '''
+
+        parameters = parameters or {}
+        fetch_page, page_size = _create_async_page_fetcher(self.retrieve_variations, 'variations', parameters)
+
+        return AsyncPageIterator(fetch_page, page_size, parameters.get('page') or 1, max_concurrency)
+
+    async def bulk_sync_item_groups(self, parameters=None, max_concurrency=4, retries=2):
+        '''
+        Create or update any number of item groups, parents before children, in concurrent chunks asynchronously
+
+        Accepts the same parameters as :meth:`Catalog.bulk_sync_item_groups`
+
+        :return: BulkReport
+        '''
+
+        levels, create_chunks, upload = _create_item_groups_sync(self.create_or_update_item_groups, parameters)
+
+        return await upload_levels_async(
+            levels,
+            create_chunks,
+            upload,
+            max_concurrency=max_concurrency,
+            retries=retries,
+        )
@@ -3,12 +3,11 @@
 from time import time
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import send_async_request
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -50,6 +49,15 @@ def _create_quizzes_url(quiz_id, parameters, user_parameters, options, path):
 
     return f'{quiz_service_url}/v1/quizzes/{quote(quiz_id)}/{quote(path)}?{query_string}&{ans_query_string}'
 
+def _process_quiz_response(json, method_name):
+    '''Validate quiz response data'''
+
+    if json:
+        if json.get('quiz_version_id'):
+            return json
+
+    raise ConstructorException(f'{method_name} response data is malformed')
+
 class Quizzes:
     # pylint: disable=too-few-public-methods
     '''Quizzes Class'''
@@ -81,24 +89,18 @@ class Quizzes:
             user_parameters = {}
 
         request_url = _create_quizzes_url(quiz_id, parameters, user_parameters, self.__options, 'next') # pylint: disable=line-too-long
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-
-        if json:
-            if json.get('quiz_version_id'):
-                return json
-
-        raise ConstructorException('get_quiz_next_question response data is malformed')
+        return _process_quiz_response(response.json(), 'get_quiz_next_question')
 
     def get_quiz_results(self, quiz_id, parameters=None, user_parameters=None):
         '''
@@ -124,21 +126,70 @@ class Quizzes:
             user_parameters = {}
 
         request_url = _create_quizzes_url(quiz_id, parameters, user_parameters, self.__options, 'results') #pylint: disable=line-too-long
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
+        return _process_quiz_response(response.json(), 'get_quiz_results')
+
+class AsyncQuizzes:
+    # pylint: disable=too-few-public-methods
+    '''Async Quizzes Class'''
+
+    def __init__(self, options):
+        self.__options = options or {}
+
+    async def get_quiz_next_question(self, quiz_id, parameters=None, user_parameters=None):
+        '''
+        Retrieve next question from API asynchronously
+
+        Accepts the same parameters as :meth:`Quizzes.get_quiz_next_question`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
 
-        if json:
-            if json.get('quiz_version_id'):
-                return json
+        request_url = _create_quizzes_url(quiz_id, parameters, user_parameters, self.__options, 'next') # pylint: disable=line-too-long
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options, user_parameters)
+        )
+
+        return _process_quiz_response(json, 'get_quiz_next_question')
+
+    async def get_quiz_results(self, quiz_id, parameters=None, user_parameters=None):
+        '''
+        Retrieve quiz results from API asynchronously
+
+        Accepts the same parameters as :meth:`Quizzes.get_quiz_results`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_quizzes_url(quiz_id, parameters, user_parameters, self.__options, 'results') #pylint: disable=line-too-long
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options, user_parameters)
+        )
 
-        raise ConstructorException('get_quiz_results response data is malformed')
+        return _process_quiz_response(json, 'get_quiz_results')
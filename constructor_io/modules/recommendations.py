@@ -1,14 +1,18 @@
 '''Recommendations Module'''
 
+from functools import partial
 from time import time
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import (gather_with_concurrency,
+                                                send_async_request)
+from constructor_io.helpers.concurrency import (check_timeout, get_executor,
+                                                get_results_or_exceptions,
+                                                submit_all)
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -36,7 +40,37 @@ def _create_recommendations_url(pod_id, parameters, user_parameters, options):
 
     return f'{options.get("service_url")}/recommendations/v1/pods/{quote(pod_id)}?{query_string}'
 
+def _process_recommendations_response(json):
+    '''Validate recommendations response data and append result_id to each result'''
+
+    json_response = json.get('response')
+
+    if json_response:
+        if json_response.get('results') or json_response.get('results') == []:
+            result_id = json.get('result_id')
+
+            if result_id:
+                for result in json_response.get('results'):
+                    result['result_id'] = result_id
+
+        return json
+
+    raise ConstructorException('get_recommendation_results response data is malformed')
+
+def _normalize_pods(pods, parameters):
+    '''
+    Validate the pods of a multi-pod request and merge the parameters shared by all pods under the
+    parameters of each pod
 
+    :return: dict of pod_id -> parameters
+    '''
+
+    if isinstance(pods, (list, tuple)):
+        pods = dict.fromkeys(pods)
+    elif not isinstance(pods, dict):
+        raise ConstructorException('pods is a required parameter of type dict or list')
+
+    return { pod_id: { **(parameters or {}), **(pod_parameters or {}) } for pod_id, pod_parameters in pods.items() }
 
 class Recommendations:
     '''Recommendations Class'''
@@ -73,29 +107,137 @@ class Recommendations:
         if not user_parameters:
             user_parameters = {}
 
+        return self.__get(pod_id, parameters, user_parameters, create_request_headers(self.__options, user_parameters))
+
+    def get_recommendation_results_many(
+        self,
+        pods,
+        parameters=None,
+        user_parameters=None,
+        max_concurrency=None,
+        timeout=None,
+    ):
+        # pylint: disable=too-many-arguments
+        '''
+        Retrieve recommendation results for many pods concurrently
+
+        Requests share the client connection pool and run on its executor, the request headers are built
+        once for all pods. A failed request does not abort the others, its exception is returned in place of
+        its results. Requests not done by the deadline are cancelled and a concurrent.futures.TimeoutError is
+        returned in their place.
+
+        :param dict pods: Parameters of each pod keyed by pod_id, see get_recommendation_results. A list of pod_ids is also accepted
+        :param dict parameters: Parameters shared by all pods, such as item_ids, overridden by the parameters of each pod
+        :param dict user_parameters: Parameters relevant to the user request, see get_recommendation_results
+        :param int max_concurrency: The maximum number of requests in flight at the same time (limited by the client max_workers if omitted)
+        :param float timeout: Seconds to wait for all requests (no deadline if omitted)
+
+        :return: dict of pod_id -> results (dict) or exception
+        '''
+
+        check_timeout(timeout)
+        pods = _normalize_pods(pods, parameters)
+
+        if not user_parameters:
+            user_parameters = {}
+
+        headers = create_request_headers(self.__options, user_parameters)
+        futures = submit_all(
+            get_executor(self.__options),
+            [
+                partial(self.__get, pod_id, pod_parameters, user_parameters, headers)
+                for pod_id, pod_parameters in pods.items()
+            ],
+            max_concurrency,
+        )
+
+        return dict(zip(pods.keys(), get_results_or_exceptions(futures, timeout)))
+
+    def __get(self, pod_id, parameters, user_parameters, headers):
         request_url = _create_recommendations_url(pod_id, parameters, user_parameters, self.__options)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
-            headers=create_request_headers(self.__options, user_parameters)
+            headers=headers
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
+        return _process_recommendations_response(response.json())
+
+class AsyncRecommendations:
+    '''Async Recommendations Class'''
+
+    def __init__(self, options):
+        self.__options = options or {}
+
+    async def get_recommendation_results(self, pod_id, parameters=None, user_parameters=None):
+        '''
+        Retrieve recommendation results from API asynchronously
+
+        Accepts the same parameters as :meth:`Recommendations.get_recommendation_results`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        return await self.__get(
+            pod_id,
+            parameters,
+            user_parameters,
+            create_request_headers(self.__options, user_parameters)
+        )
+
+    async def get_recommendation_results_many(
+        self,
+        pods,
+        parameters=None,
+        user_parameters=None,
+        max_concurrency=None,
+        timeout=None,
+    ):
+        # pylint: disable=too-many-arguments
+        '''
+        Retrieve recommendation results for many pods concurrently
+
+        Accepts the same parameters as :meth:`Recommendations.get_recommendation_results_many`, requests
+        not done by the deadline return an asyncio.TimeoutError
 
-        if json_response:
-            if json_response.get('results') or json_response.get('results') == []:
-                result_id = json.get('result_id')
+        :return: dict of pod_id -> results (dict) or exception
+        '''
 
-                if result_id:
-                    for result in json_response.get('results'):
-                        result['result_id'] = result_id
+        check_timeout(timeout)
+        pods = _normalize_pods(pods, parameters)
+
+        if not user_parameters:
+            user_parameters = {}
 
-            return json
+        headers = create_request_headers(self.__options, user_parameters)
+        results = await gather_with_concurrency(
+            [
+                self.__get(pod_id, pod_parameters, user_parameters, headers)
+                for pod_id, pod_parameters in pods.items()
+            ],
+            max_concurrency,
+            timeout,
+        )
+
+        return dict(zip(pods.keys(), results))
+
+    async def __get(self, pod_id, parameters, user_parameters, headers):
+        request_url = _create_recommendations_url(pod_id, parameters, user_parameters, self.__options)
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=headers
+        )
 
-        raise ConstructorException('get_recommendation_results response data is malformed')
+        return _process_recommendations_response(json)
@@ -1,14 +1,20 @@
 '''Search Module'''
 
+from functools import partial
 from time import time
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import (gather_with_concurrency,
+                                                send_async_request)
+from constructor_io.helpers.concurrency import (get_executor,
+                                                get_result_or_exception,
+                                                submit_all)
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.pagination import (aiter_pages, get_page_results,
+                                               iter_pages)
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -27,8 +33,35 @@ def _create_search_url(query, parameters, user_parameters, options):
 
     return f'{options.get("service_url")}/search/{quote(query)}?{query_string}'
 
+def _process_search_response(json):
+    '''Validate search response data and append result_id to each result'''
+
+    json_response = json.get('response')
+
+    if json_response:
+        if json_response.get('results') or json_response.get('results') == []:
+            result_id = json.get('result_id')
+            if result_id:
+                for result in json_response.get('results'):
+                    result['result_id'] = result_id
+
+            return json
+
+        # Redirect rules
+        if json_response.get('redirect'):
+            return json
+
+    raise ConstructorException('get_search_results response data is malformed')
+
+def _normalize_searches(searches):
+    '''Validate the searches of a batch and convert them to (query, parameters, user_parameters) tuples'''
+
+    if not isinstance(searches, (list, tuple)):
+        raise ConstructorException('searches is a required parameter of type list')
+
+    return [(search,) if isinstance(search, str) else tuple(search) for search in searches]
+
 class Search:
-    # pylint: disable=too-few-public-methods
     '''Search Class'''
 
     def __init__(self, options) -> None:
@@ -68,31 +101,117 @@ class Search:
             user_parameters = {}
 
         request_url = _create_search_url(query, parameters, user_parameters, self.__options)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options, user_parameters)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-        json_response = json.get('response')
+        return _process_search_response(response.json())
+
+    def get_search_results_many(self, searches, max_concurrency=None):
+        '''
+        Retrieve search results for many queries concurrently
+
+        Requests share the client connection pool and run on its executor. A failed request does not
+        abort the batch, its exception is returned in place of its results.
+
+        :param list searches: Tuples of (query, parameters, user_parameters), or queries, see get_search_results
+        :param int max_concurrency: The maximum number of requests in flight at the same time (limited by the client max_workers if omitted)
+
+        :return: list of results (dict) or exceptions, in the order of searches
+        '''
+
+        futures = submit_all(
+            get_executor(self.__options),
+            [partial(self.get_search_results, *search) for search in _normalize_searches(searches)],
+            max_concurrency,
+        )
+
+        return [get_result_or_exception(future) for future in futures]
+
+    def iter_search_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Iterate over the search results of all pages, from parameters.page on
+
+        The next page is fetched in the background while the results of the current one are consumed.
+        Iteration stops once total_num_results are consumed.
+
+        Accepts the same parameters as get_search_results
+
+        :return: generator of results (dict)
+        '''
+
+        parameters = parameters or {}
+
+        def fetch_page(page):
+            return get_page_results(self.get_search_results(query, { **parameters, 'page': page }, user_parameters))
+
+        return iter_pages(get_executor(self.__options), fetch_page, parameters.get('page') or 1)
+
+class AsyncSearch:
+    '''Async Search Class'''
+
+    def __init__(self, options) -> None:
+        self.__options = options or {}
+
+    async def get_search_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Retrieve search results from API asynchronously
+
+        Accepts the same parameters as :meth:`Search.get_search_results`
+
+        :return: dict
+        '''
+
+        if not parameters:
+            parameters = {}
+        if not user_parameters:
+            user_parameters = {}
+
+        request_url = _create_search_url(query, parameters, user_parameters, self.__options)
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options, user_parameters)
+        )
+
+        return _process_search_response(json)
 
-        if json_response:
-            if json_response.get('results') or json_response.get('results') == []:
-                result_id = json.get('result_id')
-                if result_id:
-                    for result in json_response.get('results'):
-                        result['result_id'] = result_id
+    async def get_search_results_many(self, searches, max_concurrency=None):
+        '''
+        Retrieve search results for many queries concurrently
+
+        Accepts the same parameters as :meth:`Search.get_search_results_many`
+
+        :return: list of results (dict) or exceptions, in the order of searches
+        '''
+
+        return await gather_with_concurrency(
+            [self.get_search_results(*search) for search in _normalize_searches(searches)],
+            max_concurrency,
+        )
+
+    def iter_search_results(self, query, parameters=None, user_parameters=None):
+        '''
+        Iterate asynchronously over the search results of all pages, from parameters.page on
+
+        Accepts the same parameters as :meth:`Search.iter_search_results`
+
+        :return: async generator of results (dict)
+        '''
 
-                return json
+        parameters = parameters or {}
 
-            # Redirect rules
-            if json_response.get('redirect'):
-                return json
+        async def fetch_page(page):
+            return get_page_results(
+                await self.get_search_results(query, { **parameters, 'page': page }, user_parameters)
+            )
 
-        raise ConstructorException('get_search_results response data is malformed')
+        return aiter_pages(fetch_page, parameters.get('page') or 1)
@@ -2,12 +2,11 @@
 
 from urllib.parse import quote, urlencode
 
-import requests as r
-
+from constructor_io.helpers.async_utils import send_async_request
 from constructor_io.helpers.exception import ConstructorException
-from constructor_io.helpers.utils import (clean_params, create_auth_header,
-                                          create_request_headers,
+from constructor_io.helpers.utils import (clean_params, create_request_headers,
                                           create_shared_query_params,
+                                          send_request,
                                           throw_http_exception_from_response)
 
 
@@ -35,6 +34,24 @@ def _create_tasks_url(url_prefix, parameters, options, api_version='v1'):
 
     return f'{options.get("service_url")}/{api_version}/{url_prefix}?{query_string}'
 
+def _process_all_tasks_response(json):
+    '''Validate tasks response data'''
+
+    if json:
+        if json.get('total_count') is not None:
+            return json
+
+    raise ConstructorException('get_all_tasks response data is malformed')
+
+def _process_task_response(json):
+    '''Validate task response data'''
+
+    if json:
+        if json.get('status'):
+            return json
+
+    raise ConstructorException('get_task response data is malformed')
+
 class Tasks:
     # pylint: disable=too-few-public-methods
     '''Tasks Class'''
@@ -61,24 +78,18 @@ class Tasks:
 
         url_prefix = 'tasks'
         request_url = _create_tasks_url(url_prefix, parameters, self.__options)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
-
-        if json:
-            if json.get('total_count') is not None:
-                return json
-
-        raise ConstructorException('get_all_tasks response data is malformed')
+        return _process_all_tasks_response(response.json())
 
     def get_task(self, task_id):
         '''
@@ -92,21 +103,64 @@ class Tasks:
 
         url_prefix = f'tasks/{quote(str(task_id))}'
         request_url = _create_tasks_url(url_prefix, None, self.__options)
-        requests = self.__options.get('requests') or r
 
-        response = requests.get(
+        response = send_request(
+            self.__options,
+            'get',
             request_url,
-            auth=create_auth_header(self.__options),
             headers=create_request_headers(self.__options)
         )
 
         if not response.ok:
             throw_http_exception_from_response(response)
 
-        json = response.json()
+        return _process_task_response(response.json())
+
+class AsyncTasks:
+    # pylint: disable=too-few-public-methods
+    '''Async Tasks Class'''
+
+    def __init__(self, options) -> None:
+        self.__options = options or {}
+
+    async def get_all_tasks(self, parameters=None):
+        '''
+        Retrieve tasks from API asynchronously
+
+        Accepts the same parameters as :meth:`Tasks.get_all_tasks`
+
+        :return: dict
+        '''
 
-        if json:
-            if json.get('status'):
-                return json
+        if not parameters:
+            parameters = {}
+
+        request_url = _create_tasks_url('tasks', parameters, self.__options)
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options)
+        )
+
+        return _process_all_tasks_response(json)
+
+    async def get_task(self, task_id):
+        '''
+        Retrieve specific task from API asynchronously
+
+        :param int task_id: The id of the task to retrieve
+        :return: dict
+        '''
+        if not task_id or not isinstance(task_id, int):
+            raise ConstructorException('task_id is a required parameter of type int')
+
+        request_url = _create_tasks_url(f'tasks/{quote(str(task_id))}', None, self.__options)
+        json = await send_async_request(
+            self.__options,
+            'get',
+            request_url,
+            headers=create_request_headers(self.__options)
+        )
 
-        raise ConstructorException('get_task response data is malformed')
+        return _process_task_response(json)
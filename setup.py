@@ -19,6 +19,10 @@ setup(
     install_requires=[
         'requests~=2.26'
     ],
+    extras_require={
+        'async': ['aiohttp>=3.8'],
+        'zstd': ['zstandard>=0.18'],
+    },
     packages = find_packages(exclude=["tests.*", "tests"]),
     long_description=long_description,
     long_description_content_type='text/markdown',
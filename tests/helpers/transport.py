@@ -0,0 +1,70 @@
+'''Fake Transport Utils'''
+
+import json
+from email.parser import BytesParser
+from email.policy import HTTP
+from threading import Lock
+from time import sleep
+
+from constructor_io.helpers.multipart import MultipartStream
+from constructor_io.helpers.transport import FakeTransport, Response
+
+
+def create_json_response(body, status_code=200):
+    '''Create a response with a JSON body'''
+
+    return Response(status_code, json.dumps(body).encode('utf-8'))
+
+def parse_multipart(body, content_type):
+    '''Parse a multipart body into { field_name: (file_name, content) }'''
+
+    message = BytesParser(policy=HTTP).parsebytes(b'Content-Type: ' + content_type.encode('utf-8') + b'\r\n\r\n' + body)
+
+    return {
+        part.get_param('name', header='content-disposition'): (part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    }
+
+def get_uploaded_files(request):
+    '''Encode the files of a request like transports do and parse them back into { field_name: (file_name, content) }'''
+
+    stream = MultipartStream(request.files)
+
+    return parse_multipart(b''.join(stream), stream.content_type)
+
+def create_transport(routes, max_in_flight=None, delay=0):
+    '''
+    Create a fake transport answering requests with handlers and recording the peak number of requests in flight
+
+    :param list routes: Tuples of the method, path prefix and handler creating the response of each route
+    :param list max_in_flight: List whose first element is raised to the peak number of requests in flight
+    :param float|callable delay: Seconds each request takes, or a function returning them from the request
+    '''
+
+    lock = Lock()
+    in_flight = [0]
+
+    def track(handler):
+        def tracking_handler(request):
+            with lock:
+                in_flight[0] += 1
+
+                if max_in_flight is not None:
+                    max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+
+            try:
+                sleep(delay(request) if callable(delay) else delay)
+
+                return handler(request)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        return tracking_handler
+
+    transport = FakeTransport()
+
+    for method, path, handler in routes:
+        transport.add_response(method, path, handler=track(handler))
+
+    return transport
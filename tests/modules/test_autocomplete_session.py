@@ -0,0 +1,306 @@
+'''ConstructorIO Python Client - Autocomplete Session Tests'''
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+from unittest import mock
+from urllib.parse import unquote, urlsplit
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import (AsyncTransport, FakeTransport,
+                                              Response)
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def autocomplete_handler(request):
+    '''Return a response containing the requested query'''
+
+    query = unquote(urlsplit(request.url).path.split('/')[-1])
+    body = { 'sections': { 'Products': [{ 'value': query }] }, 'result_id': 'result-id' }
+
+    return Response(200, json.dumps(body).encode('utf-8'))
+
+def create_client():
+    '''Create a client sending requests to a fake transport'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/autocomplete/', handler=autocomplete_handler)
+
+    return ConstructorIO({ **VALID_OPTIONS, 'transport': transport }), transport
+
+def requested_queries(transport):
+    '''Return the queries requested through the fake transport'''
+
+    return sorted(unquote(urlsplit(request.url).path.split('/')[-1]) for request in transport.requests)
+
+def test_with_repeated_prefix():
+    '''Should answer a repeated prefix from memory'''
+
+    client, transport = create_client()
+
+    with client.autocomplete.create_session({ 'num_results': 5 }, { 'session_id': 1 }) as session:
+        first = session.get_autocomplete_results('sh')
+        second = session.get_autocomplete_results('sh')
+
+    assert len(transport.requests) == 1
+    assert first == second
+    assert first is not second
+    assert first.get('sections').get('Products')[0].get('result_id') == 'result-id'
+    assert 'num_results=5' in transport.requests[0].url
+
+def test_with_prefetch_queries():
+    '''Should prefetch the most likely next prefixes'''
+
+    client, transport = create_client()
+    prefetch_queries = { 'shoes': 10, 'shirt': 5, 'socks': 2, 'sandals': 1 }
+
+    with client.autocomplete.create_session(prefetch_queries=prefetch_queries, prefetch_count=1) as session:
+        session.get_autocomplete_results('s')
+
+    assert requested_queries(transport) == ['s', 'sh']
+
+    response = session.get_autocomplete_results('sh')
+
+    assert response.get('sections').get('Products')[0].get('value') == 'sh'
+    assert len(transport.requests) == 2
+
+def test_with_prefetch_count():
+    '''Should prefetch up to prefetch_count next prefixes'''
+
+    client, transport = create_client()
+
+    with client.autocomplete.create_session(prefetch_queries=['shoes', 'socks', 'sandals']) as session:
+        session.get_autocomplete_results('s')
+
+    assert len(transport.requests) == 3
+
+def test_with_client_executor():
+    '''Should prefetch on the executor shared between modules'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/autocomplete/', handler=autocomplete_handler)
+
+    with ThreadPoolExecutor(1) as executor:
+        submit = mock.Mock(side_effect=executor.submit)
+        client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'executor': mock.Mock(submit=submit) })
+
+        with client.autocomplete.create_session(prefetch_queries=['shoes']) as session:
+            session.get_autocomplete_results('s')
+
+    assert submit.call_count == 1
+    assert requested_queries(transport) == ['s', 'sh']
+
+def test_with_max_size():
+    '''Should only keep the results of the most recently used prefixes'''
+
+    client, transport = create_client()
+    session = client.autocomplete.create_session(max_size=2)
+
+    for query in ['s', 'sh', 's', 'sho', 's', 'sh']:
+        session.get_autocomplete_results(query)
+
+    assert requested_queries(transport) == ['s', 'sh', 'sh', 'sho']
+
+def test_with_ttl():
+    '''Should request prefixes again once their results expired'''
+
+    client, transport = create_client()
+    session = client.autocomplete.create_session(ttl=10)
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=0):
+        session.get_autocomplete_results('sh')
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=5):
+        session.get_autocomplete_results('sh')
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=20):
+        session.get_autocomplete_results('sh')
+
+    assert len(transport.requests) == 2
+
+def test_with_failed_request():
+    '''Should not cache failed requests'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/autocomplete/', { 'message': 'error' }, status_code=500)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    session = client.autocomplete.create_session()
+
+    for _ in range(2):
+        with raises(HttpException):
+            session.get_autocomplete_results('sh')
+
+    assert len(transport.requests) == 2
+
+def test_with_invalid_query():
+    '''Should raise exception when invalid query is provided'''
+
+    client, _ = create_client()
+
+    with raises(ConstructorException, match=r'query is a required parameter of type string'):
+        client.autocomplete.create_session().get_autocomplete_results(None)
+
+def create_blocking_client(options=None):
+    '''Create a client whose autocomplete requests for queries starting with "block" wait for release'''
+
+    release = Event()
+    started = Event()
+
+    def handler(request):
+        if '/autocomplete/block' in request.url:
+            started.set()
+            release.wait(5)
+
+        return autocomplete_handler(request)
+
+    transport = FakeTransport()
+    transport.add_response('get', '/autocomplete/', handler=handler)
+    client = ConstructorIO({ **VALID_OPTIONS, **(options or {}), 'transport': transport })
+
+    return client, transport, started, release
+
+def test_latest_with_superseded_request():
+    '''Should discard the results of a request superseded by a newer request of the same session'''
+
+    client, _, started, release = create_blocking_client()
+    results = {}
+
+    def get_results(query):
+        results[query] = client.autocomplete.get_latest_autocomplete_results(query, None, { 'session_id': 1 })
+
+    thread = Thread(target=get_results, args=('block',))
+    thread.start()
+    started.wait(5)
+    get_results('blue')
+    thread.join(5)
+    release.set()
+    client.close()
+
+    assert results.get('block') is None
+    assert results.get('blue').get('sections').get('Products')[0].get('value') == 'blue'
+
+def test_latest_with_pending_superseded_request():
+    '''Should cancel superseded requests that have not been sent yet'''
+
+    client, transport, started, release = create_blocking_client({ 'max_workers': 1 })
+    results = {}
+
+    def get_results(query, session_id):
+        results[query] = client.autocomplete.get_latest_autocomplete_results(
+            query,
+            None,
+            { 'session_id': session_id },
+        )
+
+    blocking_thread = Thread(target=get_results, args=('block', 1))
+    blocking_thread.start()
+    started.wait(5)
+    pending_thread = Thread(target=get_results, args=('sh', 2))
+    pending_thread.start()
+    pending_thread.join(0.1)
+    latest_thread = Thread(target=get_results, args=('sho', 2))
+    latest_thread.start()
+    pending_thread.join(5)
+    release.set()
+
+    for thread in (blocking_thread, latest_thread):
+        thread.join(5)
+
+    client.close()
+
+    assert results.get('sh') is None
+    assert results.get('sho').get('sections').get('Products')[0].get('value') == 'sho'
+    assert results.get('block').get('sections').get('Products')[0].get('value') == 'block'
+    assert requested_queries(transport) == ['block', 'sho']
+
+def test_latest_with_different_sessions():
+    '''Should not discard the requests of other sessions'''
+
+    client, _ = create_client()
+
+    with client:
+        first = client.autocomplete.get_latest_autocomplete_results('sh', None, { 'session_id': 1 })
+        second = client.autocomplete.get_latest_autocomplete_results('sh', None, { 'session_id': 2 })
+
+    assert first == second
+
+def test_latest_with_failed_request():
+    '''Should raise the exception of the latest request'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/autocomplete/', { 'message': 'error' }, status_code=500)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        with raises(HttpException):
+            client.autocomplete.get_latest_autocomplete_results('sh', None, { 'session_id': 1 })
+
+def test_latest_without_session_id():
+    '''Should raise exception when session_id is not provided'''
+
+    client, _ = create_client()
+
+    with raises(ConstructorException, match=r'user_parameters.session_id is a required parameter'):
+        client.autocomplete.get_latest_autocomplete_results('sh')
+
+class SlowAsyncTransport(AsyncTransport):
+    '''Async transport answering autocomplete requests after a delay, recording cancelled requests'''
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def send(self, request):
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.cancelled.append(request)
+            raise
+
+        return autocomplete_handler(request)
+
+def test_async_latest_with_superseded_request():
+    '''Should cancel in-flight requests superseded by a newer request of the same session'''
+
+    transport = SlowAsyncTransport()
+
+    async def get_results(client, query, delay):
+        await asyncio.sleep(delay)
+
+        return await client.autocomplete.get_latest_autocomplete_results(query, None, { 'session_id': 1 })
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await asyncio.gather(*[
+                get_results(client, query, index * 0.01)
+                for index, query in enumerate(['s', 'sh', 'sho'])
+            ])
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [None, None]
+    assert results[2].get('sections').get('Products')[0].get('value') == 'sho'
+    assert len(transport.cancelled) == 2
+
+def test_async_latest_with_cancelled_caller():
+    '''Should propagate the cancellation of the caller'''
+
+    transport = SlowAsyncTransport()
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            task = asyncio.ensure_future(
+                client.autocomplete.get_latest_autocomplete_results('sh', None, { 'session_id': 1 })
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+            with raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(run())
+
+    assert len(transport.cancelled) == 1
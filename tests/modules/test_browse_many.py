@@ -0,0 +1,139 @@
+'''ConstructorIO Python Client - Browse Fan-out Tests'''
+
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import monotonic
+from urllib.parse import unquote, urlsplit
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import AsyncTransport
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def get_filter_value(request):
+    '''Get the filter value of a browse request'''
+
+    return unquote(urlsplit(request.url).path.split('/')[-1])
+
+def browse_handler(request):
+    '''Answer a browse request, failing filter values named "error"'''
+
+    filter_value = get_filter_value(request)
+
+    if filter_value == 'error':
+        return create_json_response({ 'message': 'error' }, 500)
+
+    return create_json_response({ 'response': { 'results': [{ 'value': filter_value }] }, 'result_id': 'result-id' })
+
+def create_browse_transport(max_in_flight, slow_delay=0.5):
+    '''
+    Create a fake transport answering browse requests, sleeping slow_delay seconds on filter values named
+    "slow" and recording the peak number of requests in flight
+    '''
+
+    return create_transport(
+        [('get', '/browse/', browse_handler)],
+        max_in_flight,
+        delay=lambda request: slow_delay if get_filter_value(request) == 'slow' else 0.02,
+    )
+
+class SlowAsyncTransport(AsyncTransport):
+    '''Async transport waiting without blocking the event loop on filter values named "slow"'''
+
+    def __init__(self):
+        self.fake_transport = create_browse_transport([0], slow_delay=0)
+
+    async def send(self, request):
+        if request.url.split('?')[0].endswith('/slow'):
+            await asyncio.sleep(0.5)
+
+        return self.fake_transport.send(request)
+
+def get_value(result):
+    '''Get the value of the first result'''
+
+    return result.get('response').get('results')[0].get('value')
+
+def test_with_keyed_specs():
+    '''Should return results keyed like specs and exceptions in place of failed requests'''
+
+    max_in_flight = [0]
+    transport = create_browse_transport(max_in_flight)
+    specs = {
+        'shoes': ('group_id', 'shoes', { 'page': 2 }, { 'session_id': 1 }),
+        'error': ('brand', 'error'),
+        'invalid': ('group_id', ''),
+    }
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.browse.get_browse_results_many(specs)
+
+    assert list(results.keys()) == ['shoes', 'error', 'invalid']
+    assert get_value(results['shoes']) == 'shoes'
+    assert isinstance(results['error'], HttpException)
+    assert isinstance(results['invalid'], ConstructorException)
+    assert any('page=2' in request.url for request in transport.requests)
+    assert max_in_flight[0] > 1
+
+def test_with_list_of_specs():
+    '''Should return results in the order of specs, at most max_concurrency at a time'''
+
+    max_in_flight = [0]
+    transport = create_browse_transport(max_in_flight)
+    specs = [('group_id', f'group{index}') for index in range(6)]
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.browse.get_browse_results_many(specs, max_concurrency=2)
+
+    assert [get_value(result) for result in results] == [spec[1] for spec in specs]
+    assert max_in_flight[0] == 2
+
+def test_with_timeout():
+    '''Should return a timeout error in place of requests not done by the deadline'''
+
+    transport = create_browse_transport([0])
+    specs = { 'fast': ('group_id', 'fast'), 'slow': ('group_id', 'slow') }
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        start = monotonic()
+        results = client.browse.get_browse_results_many(specs, timeout=0.2)
+
+        assert monotonic() - start < 0.4
+
+    assert get_value(results['fast']) == 'fast'
+    assert isinstance(results['slow'], FutureTimeoutError)
+
+def test_with_invalid_specs():
+    '''Should raise exception when specs is neither a dict nor a list'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'specs is a required parameter of type dict or list'):
+            client.browse.get_browse_results_many('group_id')
+
+def test_with_invalid_timeout():
+    '''Should raise exception when timeout is not a positive number'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'timeout must be a positive number'):
+            client.browse.get_browse_results_many([('group_id', 'shoes')], timeout=0)
+
+def test_async_with_keyed_specs():
+    '''Should return results keyed like specs and a timeout error in place of requests not done by the deadline'''
+
+    transport = SlowAsyncTransport()
+    specs = { 'fast': ('group_id', 'fast'), 'slow': ('group_id', 'slow'), 'error': ('brand', 'error') }
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.browse.get_browse_results_many(specs, timeout=0.2)
+
+    results = asyncio.run(run())
+
+    assert get_value(results['fast']) == 'fast'
+    assert isinstance(results['slow'], asyncio.TimeoutError)
+    assert isinstance(results['error'], HttpException)
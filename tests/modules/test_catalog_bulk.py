@@ -0,0 +1,296 @@
+'''ConstructorIO Python Client - Catalog Bulk Upload Tests'''
+
+import asyncio
+from threading import Lock
+from time import sleep
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.bulk import flatten_item_groups, iter_chunks
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Response)
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def create_bulk_transport(uploads, max_in_flight, failures=None):
+    '''
+    Create a fake transport recording the items uploaded and the peak number of requests in flight, and
+    answering with a status code from failures[first item ID] while there are some left
+    '''
+
+    lock = Lock()
+
+    def handler(request):
+        items = request.json.get('items')
+
+        with lock:
+            status_codes = (failures or {}).get(items[0].get('id'))
+            status_code = status_codes.pop(0) if status_codes else 200
+
+            if status_code == 200:
+                uploads.append(items)
+
+        if status_code != 200:
+            return create_json_response({ 'message': 'error', 'status': status_code }, status_code)
+
+        return create_json_response({ 'task_id': int(items[0].get('id')) })
+
+    return create_transport([('put', '/v2/items', handler), ('patch', '/v2/items', handler)], max_in_flight, delay=0.02)
+
+def create_items(num_items):
+    '''Create a generator of items'''
+
+    return ({ 'id': str(index), 'name': f'Item {index}' } for index in range(num_items))
+
+def test_iter_chunks_by_size_and_bytes():
+    '''Should split records by count and by serialized size'''
+
+    records = [{ 'id': 'a' * 10 }] * 5
+
+    assert [len(chunk) for chunk in iter_chunks(records, max_size=2)] == [2, 2, 1]
+    assert [len(chunk) for chunk in iter_chunks(records, max_bytes=45)] == [2, 2, 1]
+    assert [len(chunk) for chunk in iter_chunks(records, max_bytes=1)] == [1, 1, 1, 1, 1]
+
+def test_bulk_create_or_replace_items():
+    '''Should upload all items in chunks concurrently and report the task IDs in the order of chunks'''
+
+    uploads = []
+    max_in_flight = [0]
+    transport = create_bulk_transport(uploads, max_in_flight)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        report = client.catalog.bulk_create_or_replace_items(
+            { 'items': create_items(2500), 'section': 'Products' },
+            max_concurrency=2,
+        )
+
+    assert report.ok
+    assert report.num_chunks == 3
+    assert report.num_records == 2500
+    assert report.task_ids == [0, 1000, 2000]
+    assert sorted(len(items) for items in uploads) == [500, 1000, 1000]
+    assert max_in_flight[0] == 2
+    assert all(request.method == 'put' and 'section=Products' in request.url for request in transport.requests)
+
+def test_bulk_update_items_with_failures():
+    '''Should retry chunks failing with a server error and report chunks failing otherwise'''
+
+    uploads = []
+    failures = { '0': [503], '20': [400] }
+    transport = create_bulk_transport(uploads, [0], failures)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        report = client.catalog.bulk_update_items({ 'items': create_items(30), 'chunk_size': 10 })
+
+    assert not report.ok
+    assert report.task_ids == [0, 10]
+    assert [failure.index for failure in report.failures] == [2]
+    assert isinstance(report.failures[0].exception, HttpException)
+    assert report.failures[0].records[0].get('id') == '20'
+    assert len(transport.requests) == 4
+    assert all(request.method == 'patch' for request in transport.requests)
+
+def test_bulk_create_or_replace_items_with_invalid_max_concurrency():
+    '''Should raise exception when max_concurrency is not a positive integer'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'max_concurrency must be a positive integer'):
+            client.catalog.bulk_create_or_replace_items({ 'items': [] }, max_concurrency=0)
+
+def test_async_bulk_create_or_replace_items():
+    '''Should upload all items in chunks and report the task IDs in the order of chunks'''
+
+    uploads = []
+    transport = AsyncFakeTransport(create_bulk_transport(uploads, [0]))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.catalog.bulk_create_or_replace_items({ 'items': create_items(25), 'chunk_size': 10 })
+
+    report = asyncio.run(run())
+
+    assert report.ok
+    assert report.task_ids == [0, 10, 20]
+    assert sum(len(items) for items in uploads) == 25
+
+def create_item_groups_transport(uploads, failing_ids=()):
+    '''Create a fake transport recording the item groups uploaded and failing chunks containing failing_ids'''
+
+    lock = Lock()
+
+    def handler(request):
+        item_groups = request.json.get('item_groups')
+
+        if any(group.get('id') in failing_ids for group in item_groups):
+            return Response(400, b'{"message": "error", "status": 400}')
+
+        with lock:
+            uploads.append(item_groups)
+
+        return Response(200, b'{"item_groups": {"processed": 1}}')
+
+    transport = FakeTransport()
+    transport.add_response('patch', '/v1/item_groups', handler=handler)
+
+    return transport
+
+def create_tree():
+    '''Create a tree of item groups'''
+
+    return [
+        { 'id': 'a', 'name': 'A', 'children': [
+            { 'id': 'a1', 'name': 'A1', 'children': [{ 'id': 'a11', 'name': 'A11', 'children': [] }] },
+            { 'id': 'a2', 'name': 'A2', 'children': [] },
+        ] },
+        { 'id': 'b', 'name': 'B', 'children': [{ 'id': 'b1', 'name': 'B1' }] },
+        { 'id': 'b2', 'name': 'B2', 'parent_id': 'b' },
+    ]
+
+def test_flatten_item_groups():
+    '''Should flatten item groups into levels with the parent_id of their parent'''
+
+    levels = flatten_item_groups(create_tree())
+
+    assert [[group.get('id') for group in level] for level in levels] == [['a', 'b'], ['a1', 'a2', 'b1', 'b2'], ['a11']]
+    assert levels[2][0] == { 'id': 'a11', 'name': 'A11', 'parent_id': 'a1' }
+
+def test_flatten_item_groups_with_cycle():
+    '''Should raise exception when an item group is its own ancestor'''
+
+    with raises(ConstructorException, match=r'is its own ancestor'):
+        flatten_item_groups([{ 'id': 'a', 'parent_id': 'b' }, { 'id': 'b', 'parent_id': 'a' }])
+
+def test_bulk_sync_item_groups():
+    '''Should upload the levels of item groups in order, in chunks'''
+
+    uploads = []
+    transport = create_item_groups_transport(uploads)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        report = client.catalog.bulk_sync_item_groups({ 'item_groups': create_tree(), 'chunk_size': 2 })
+
+    assert report.ok
+    assert report.num_chunks == 4
+    assert report.num_records == 7
+    assert sorted(group.get('id') for group in uploads[0]) == ['a', 'b']
+    assert sorted(group.get('id') for chunk in uploads[1:3] for group in chunk) == ['a1', 'a2', 'b1', 'b2']
+    assert [group.get('id') for group in uploads[3]] == ['a11']
+
+def test_bulk_sync_item_groups_with_failed_parent():
+    '''Should not upload item groups whose parent failed to upload'''
+
+    uploads = []
+    transport = create_item_groups_transport(uploads, ('a',))
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        report = client.catalog.bulk_sync_item_groups({ 'item_groups': create_tree(), 'chunk_size': 1 })
+
+    uploaded_ids = sorted(group.get('id') for chunk in uploads for group in chunk)
+    failed_ids = sorted(failure.records[0].get('id') for failure in report.failures)
+
+    assert uploaded_ids == ['b', 'b1', 'b2']
+    assert failed_ids == ['a', 'a1', 'a11', 'a2']
+    assert isinstance(report.failures[0].exception, HttpException)
+    assert str(report.failures[-1].exception) == 'parent item group was not uploaded'
+
+def test_async_bulk_sync_item_groups():
+    '''Should upload the levels of item groups in order'''
+
+    uploads = []
+    transport = AsyncFakeTransport(create_item_groups_transport(uploads))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.catalog.bulk_sync_item_groups({ 'item_groups': create_tree() })
+
+    report = asyncio.run(run())
+
+    assert report.ok
+    assert [sorted(group.get('id') for group in chunk) for chunk in uploads] == [
+        ['a', 'b'], ['a1', 'a2', 'b1', 'b2'], ['a11']
+    ]
+
+def create_delete_transport(deletes, consumed):
+    '''Create a fake transport recording the IDs deleted and the number of IDs consumed at each request'''
+
+    lock = Lock()
+
+    def handler(request):
+        key = 'items' if '/items' in request.url else 'variations'
+
+        assert 'id=' not in request.url
+
+        with lock:
+            deletes.append(([record.get('id') for record in request.json.get(key)], consumed[0]))
+
+        sleep(0.01)
+
+        return Response(200, b'{"task_id": 1}')
+
+    transport = FakeTransport()
+    transport.add_response('delete', '/v2/items', handler=handler)
+    transport.add_response('delete', '/v2/variations', handler=handler)
+
+    return transport
+
+def test_bulk_delete_items_streams_ids():
+    '''Should delete all IDs in chunks while holding only the chunks in flight'''
+
+    deletes = []
+    consumed = [0]
+
+    def read_ids():
+        for index in range(100):
+            consumed[0] += 1
+
+            yield f'{index}\n'
+
+        yield '\n'
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': create_delete_transport(deletes, consumed) }) as client:
+        report = client.catalog.bulk_delete_items({ 'ids': read_ids(), 'chunk_size': 10 }, max_concurrency=2)
+
+    assert report.ok
+    assert report.num_chunks == 10
+    assert sorted(int(item_id) for ids, _ in deletes for item_id in ids) == list(range(100))
+    assert max(num_consumed for _, num_consumed in deletes[:2]) <= 30
+
+def test_bulk_delete_items_without_ids_in_url():
+    '''Should send the IDs of each chunk in its body only, keeping the other parameters in the URL'''
+
+    transport = FakeTransport()
+    transport.add_response('delete', '/v2/items', { 'task_id': 1 })
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        report = client.catalog.bulk_delete_items(
+            { 'ids': ['a', 'b', 'c'], 'chunk_size': 2, 'section': 'Products' },
+            max_concurrency=1,
+        )
+
+    assert report.ok
+    assert [request.json for request in transport.requests] == [
+        { 'items': [{ 'id': 'a' }, { 'id': 'b' }] },
+        { 'items': [{ 'id': 'c' }] },
+    ]
+    assert all('id=' not in request.url for request in transport.requests)
+    assert all('chunk_size' not in request.url for request in transport.requests)
+    assert all('section=Products' in request.url for request in transport.requests)
+
+def test_async_bulk_delete_variations():
+    '''Should delete all IDs in chunks'''
+
+    deletes = []
+    transport = AsyncFakeTransport(create_delete_transport(deletes, [0]))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.catalog.bulk_delete_variations({ 'ids': iter(['a', 'b', 'c']), 'chunk_size': 2 })
+
+    report = asyncio.run(run())
+
+    assert report.ok
+    assert sorted(item_id for ids, _ in deletes for item_id in ids) == ['a', 'b', 'c']
@@ -0,0 +1,198 @@
+'''ConstructorIO Python Client - Catalog Delta Tests'''
+
+import asyncio
+import io
+import json
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.delta import diff_csv
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Response)
+from tests.helpers.transport import get_uploaded_files
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+PREVIOUS_ITEMS = (
+    'id,item_name,url\n'
+    '1,Item 1,https://example.com/1\n'
+    '2,Item 2,https://example.com/2\n'
+    '3,Item 3,https://example.com/3\n'
+)
+CURRENT_ITEMS = (
+    'url,id,item_name\n'
+    'https://example.com/1,1,Item 1\n'
+    'https://example.com/2,2,Item two\n'
+    '\n'
+    'https://example.com/4,4,"Item 4, new"\n'
+)
+
+def sort_rows(text):
+    '''Split the lines of a CSV file, sorting the rows after the header'''
+
+    lines = text.splitlines()
+
+    return lines[:1] + sorted(lines[1:])
+
+def read_rows(path):
+    '''Read the lines of a CSV file, sorting the rows after the header'''
+
+    with open(path, encoding='utf-8') as file:
+        return sort_rows(file.read())
+
+def create_transport(uploads):
+    '''Create a fake transport recording the rows of the catalog files in the multipart body of patches'''
+
+    def handler(request):
+        uploads.append({
+            name: (file_name, sort_rows(content.decode('utf-8')))
+            for name, (file_name, content) in get_uploaded_files(request).items()
+        })
+
+        return Response(200, json.dumps({ 'task_id': 1 }).encode('utf-8'))
+
+    transport = FakeTransport()
+    transport.add_response('patch', '/v1/catalog', handler=handler)
+
+    return transport
+
+def test_diff_csv(tmp_path):
+    '''Should write the rows added or changed and list the IDs removed, whatever the column order'''
+
+    output = tmp_path / 'items.csv'
+    delta = diff_csv(PREVIOUS_ITEMS.encode('utf-8'), io.StringIO(CURRENT_ITEMS, newline=''), output, partitions=3)
+
+    assert (delta.num_added, delta.num_changed, delta.num_unchanged) == (1, 1, 1)
+    assert delta.removed_ids == ['3']
+    assert delta.key_column == 'id'
+    assert read_rows(output) == [
+        'url,id,item_name',
+        'https://example.com/2,2,Item two',
+        'https://example.com/4,4,"Item 4, new"',
+    ]
+
+def test_diff_csv_with_paths_and_binary_streams(tmp_path):
+    '''Should read files from paths and binary streams, and leave streams open'''
+
+    previous = tmp_path / 'previous.csv'
+    previous.write_text('variation_id,item_id,color\nv1,1,red\nv2,1,blue\n', encoding='utf-8')
+    current = io.BytesIO(b'variation_id,item_id,color,size\nv1,1,red,\nv2,1,green,\n')
+
+    delta = diff_csv(previous, current, tmp_path / 'variations.csv')
+
+    assert not current.closed
+    assert delta.key_column == 'variation_id'
+    assert (delta.num_added, delta.num_changed, delta.num_unchanged) == (0, 1, 1)
+    assert read_rows(tmp_path / 'variations.csv') == ['variation_id,item_id,color,size', 'v2,1,green,']
+
+def test_diff_csv_with_text_and_chunks(tmp_path):
+    '''Should read strings as the content of files, not as paths, and iterables of chunks'''
+
+    current = (chunk.encode('utf-8') for chunk in ['id,item_name,url\n1,Item 1,https://exa', 'mple.com/1\n'])
+
+    delta = diff_csv(PREVIOUS_ITEMS, current, tmp_path / 'items.csv')
+
+    assert (delta.num_added, delta.num_changed, delta.num_unchanged) == (0, 0, 1)
+    assert sorted(delta.removed_ids) == ['2', '3']
+
+def test_diff_csv_without_previous(tmp_path):
+    '''Should add every row without a previous file'''
+
+    delta = diff_csv(None, CURRENT_ITEMS.encode('utf-8'), tmp_path / 'items.csv')
+
+    assert (delta.num_added, delta.num_changed, delta.num_unchanged) == (3, 0, 0)
+    assert not delta.removed_ids
+
+def test_diff_csv_without_changes(tmp_path):
+    '''Should not write a delta file when no row was added or changed'''
+
+    delta = diff_csv(PREVIOUS_ITEMS.encode('utf-8'), PREVIOUS_ITEMS.encode('utf-8'), tmp_path / 'items.csv')
+
+    assert delta.path is None
+    assert delta.num_unchanged == 3
+    assert not (tmp_path / 'items.csv').exists()
+
+def test_diff_csv_with_invalid_files(tmp_path):
+    '''Should raise an exception when a file has no ID column, a row has no ID or partitions is invalid'''
+
+    with raises(ConstructorException, match='no variation_id or id or item_id column'):
+        diff_csv(None, b'name\nItem\n', tmp_path / 'items.csv')
+
+    with raises(ConstructorException, match='row 3 of catalog file has no ID'):
+        diff_csv(None, b'id,name\n1,Item\n,Item\n', tmp_path / 'items.csv')
+
+    with raises(ConstructorException, match='current catalog file is empty'):
+        diff_csv(None, b'', tmp_path / 'items.csv')
+
+    with raises(ConstructorException, match='partitions must be a positive integer'):
+        diff_csv(None, b'id\n1\n', tmp_path / 'items.csv', partitions=0)
+
+def test_patch_catalog_delta(tmp_path):
+    '''Should patch the catalog with the rows added or changed only'''
+
+    (tmp_path / 'previous.csv').write_text(PREVIOUS_ITEMS, encoding='utf-8')
+    uploads = []
+    transport = create_transport(uploads)
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': transport }).catalog
+
+    delta = catalog.patch_catalog_delta({
+        'previous': { 'items': tmp_path / 'previous.csv', 'item_groups': b'id,name\n1,Group\n' },
+        'current': { 'items': CURRENT_ITEMS.encode('utf-8'), 'item_groups': b'id,name\n1,Group\n' },
+        'section': 'Products',
+    })
+
+    assert delta.response == { 'task_id': 1 }
+    assert delta.removed_ids == { 'items': ['3'] }
+    assert delta['item_groups'].num_unchanged == 1
+    assert 'patch_delta=True' in transport.requests[0].url
+    assert 'section=Products' in transport.requests[0].url
+    assert uploads == [{
+        'items': (
+            'items.csv',
+            ['url,id,item_name', 'https://example.com/2,2,Item two', 'https://example.com/4,4,"Item 4, new"'],
+        ),
+    }]
+
+def test_patch_catalog_delta_without_changes():
+    '''Should not patch the catalog when no row was added or changed'''
+
+    uploads = []
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(uploads) }).catalog
+
+    delta = catalog.patch_catalog_delta({
+        'previous': { 'items': PREVIOUS_ITEMS.encode('utf-8') },
+        'current': { 'items': PREVIOUS_ITEMS.encode('utf-8') },
+    })
+
+    assert delta.response is None
+    assert not uploads
+
+def test_patch_catalog_delta_without_current():
+    '''Should raise an exception when current files are not passed'''
+
+    catalog = ConstructorIO(VALID_OPTIONS).catalog
+
+    with raises(ConstructorException, match='current is a required parameter of type dict'):
+        catalog.patch_catalog_delta({ 'previous': { 'items': PREVIOUS_ITEMS.encode('utf-8') } })
+
+def test_async_patch_catalog_delta():
+    '''Should patch the catalog with the rows added or changed only asynchronously'''
+
+    uploads = []
+    transport = AsyncFakeTransport(create_transport(uploads))
+    catalog = AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }).catalog
+
+    delta = asyncio.run(catalog.patch_catalog_delta({
+        'previous': { 'items': PREVIOUS_ITEMS.encode('utf-8') },
+        'current': { 'items': CURRENT_ITEMS.encode('utf-8') },
+    }))
+
+    assert delta.response == { 'task_id': 1 }
+    assert delta['items'].removed_ids == ['3']
+    assert uploads == [{
+        'items': (
+            'items.csv',
+            ['url,id,item_name', 'https://example.com/2,2,Item two', 'https://example.com/4,4,"Item 4, new"'],
+        ),
+    }]
@@ -0,0 +1,115 @@
+'''ConstructorIO Python Client - Catalog Iterators Tests'''
+
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import AsyncFakeTransport
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def get_page(request):
+    '''Get the page number of a request'''
+
+    return int(parse_qs(urlsplit(request.url).query).get('page')[0])
+
+def create_catalog_transport(total, max_in_flight=None, failing_pages=None):
+    '''
+    Create a fake transport paginating total items and variations, failing the first request of each of
+    failing_pages and recording the peak number of requests in flight
+    '''
+
+    def handler(request):
+        url = urlsplit(request.url)
+        page = get_page(request)
+        per_page = int(parse_qs(url.query).get('num_results_per_page')[0])
+        key = url.path.split('/')[-1]
+
+        if failing_pages and page in failing_pages:
+            failing_pages.discard(page)
+
+            return create_json_response({ 'message': 'error' }, 500)
+
+        results = [{ 'id': str(index) } for index in range((page - 1) * per_page, min(page * per_page, total))]
+
+        return create_json_response({ key: results, 'total_count': total })
+
+    return create_transport(
+        [('get', '/v2/items', handler), ('get', '/v2/variations', handler)],
+        max_in_flight,
+        # Later pages answer first, so results are only in order if the iterator orders them
+        delay=lambda request: 0.01 * (5 - get_page(request) % 5),
+    )
+
+def get_ids(results):
+    '''Get the IDs of items or variations'''
+
+    return [int(result.get('id')) for result in results]
+
+def test_iter_all_items():
+    '''Should return all items in page order, fetching pages concurrently'''
+
+    max_in_flight = [0]
+    transport = create_catalog_transport(95, max_in_flight)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        items = list(client.catalog.iter_all_items({ 'num_results_per_page': 10 }, max_concurrency=3))
+
+    assert get_ids(items) == list(range(95))
+    assert len(transport.requests) == 10
+    assert max_in_flight[0] == 3
+
+def test_iter_all_variations_with_section():
+    '''Should return all variations with the parameters of every page'''
+
+    transport = create_catalog_transport(250)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        variations = list(client.catalog.iter_all_variations({ 'section': 'Products', 'item_id': 'item' }))
+
+    assert get_ids(variations) == list(range(250))
+    assert len(transport.requests) == 3
+    assert all('section=Products' in request.url and 'item_id=item' in request.url for request in transport.requests)
+
+def test_iter_all_items_resumes_from_checkpoint():
+    '''Should expose the page to resume from when a page fails'''
+
+    transport = create_catalog_transport(50, failing_pages={ 3 })
+    items = []
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        iterator = client.catalog.iter_all_items({ 'num_results_per_page': 10 })
+
+        with raises(HttpException):
+            for item in iterator:
+                items.append(item)
+
+        assert iterator.checkpoint == 3
+        items.extend(client.catalog.iter_all_items({ 'num_results_per_page': 10, 'page': iterator.checkpoint }))
+
+    assert get_ids(items) == list(range(50))
+
+def test_iter_all_items_with_invalid_max_concurrency():
+    '''Should raise exception when max_concurrency is not a positive integer'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'max_concurrency must be a positive integer'):
+            client.catalog.iter_all_items(max_concurrency=0)
+
+def test_async_iter_all_items():
+    '''Should return all items in page order'''
+
+    transport = AsyncFakeTransport(create_catalog_transport(45))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return [item async for item in client.catalog.iter_all_items({ 'num_results_per_page': 10 })]
+
+    items = asyncio.run(run())
+
+    assert get_ids(items) == list(range(45))
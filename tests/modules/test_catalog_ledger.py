@@ -0,0 +1,188 @@
+'''ConstructorIO Python Client - Catalog Content Ledger Tests'''
+
+import asyncio
+import json
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.ledger import ContentLedger
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Response)
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def create_transport(sent, status_code=200):
+    '''Create a fake transport recording the IDs of the items and variations sent'''
+
+    def handler(request):
+        key = 'items' if '/v2/items' in request.url else 'variations'
+        sent.append((request.method, [record.get('id') for record in request.json.get(key)]))
+
+        if status_code != 200:
+            return Response(status_code, json.dumps({ 'message': 'error', 'status': status_code }).encode('utf-8'))
+
+        return Response(200, json.dumps({ 'task_id': 1 }).encode('utf-8'))
+
+    transport = FakeTransport()
+
+    for method in ('put', 'patch', 'delete'):
+        transport.add_response(method, '/v2/items', handler=handler)
+        transport.add_response(method, '/v2/variations', handler=handler)
+
+    transport.add_response('put', '/v1/catalog', { 'task_id': 2 })
+
+    return transport
+
+def create_items(*names):
+    '''Create items named by ID'''
+
+    return [{ 'id': str(index), 'name': name } for index, name in enumerate(names)]
+
+def test_with_unchanged_items():
+    '''Should only send the items changed since they were last accepted'''
+
+    sent = []
+    ledger = ContentLedger()
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ledger }).catalog
+
+    assert catalog.create_or_replace_items({ 'items': create_items('a', 'b', 'c') }) == { 'task_id': 1 }
+    assert catalog.create_or_replace_items({ 'items': create_items('a', 'B', 'c') }) == { 'task_id': 1 }
+    assert catalog.create_or_replace_items({ 'items': create_items('a', 'B', 'c') }) is None
+    assert sent == [('put', ['0', '1', '2']), ('put', ['1'])]
+    assert len(ledger) == 3
+
+def test_with_key_order():
+    '''Should hash items by canonical JSON, whatever the order of their keys'''
+
+    sent = []
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ContentLedger() }).catalog
+
+    catalog.update_items({ 'items': [{ 'id': '1', 'name': 'a', 'data': { 'x': 1, 'y': 2 } }] })
+    catalog.update_items({ 'items': [{ 'data': { 'y': 2, 'x': 1 }, 'name': 'a', 'id': '1' }] })
+
+    assert sent == [('patch', ['1'])]
+
+def test_with_replace_after_update():
+    '''Should send a replace after an update of the same content, the update was merged into the item'''
+
+    sent = []
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ContentLedger() }).catalog
+
+    catalog.create_or_replace_items({ 'items': [{ 'id': '1', 'name': 'A', 'data': { 'brand': 'x' } }] })
+    catalog.update_items({ 'items': [{ 'id': '1', 'name': 'B' }] })
+    catalog.update_items({ 'items': [{ 'id': '1', 'name': 'B' }] })
+    catalog.create_or_replace_items({ 'items': [{ 'id': '1', 'name': 'B' }] })
+    catalog.update_items({ 'items': [{ 'id': '1', 'name': 'B' }] })
+
+    assert sent == [('put', ['1']), ('patch', ['1']), ('put', ['1'])]
+
+def test_with_sections():
+    '''Should key hashes by section'''
+
+    sent = []
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ContentLedger() }).catalog
+
+    catalog.create_or_replace_items({ 'items': create_items('a') })
+    catalog.create_or_replace_items({ 'items': create_items('a'), 'section': 'Products' })
+    catalog.create_or_replace_items({ 'items': create_items('a'), 'section': 'Search Suggestions' })
+
+    assert sent == [('put', ['0']), ('put', ['0'])]
+
+def test_with_failed_request():
+    '''Should not record the hashes of items the API did not accept'''
+
+    sent = []
+    ledger = ContentLedger()
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent, 400), 'ledger': ledger }).catalog
+
+    with raises(HttpException):
+        catalog.create_or_replace_items({ 'items': create_items('a') })
+
+    assert len(ledger) == 0
+
+def test_with_deleted_items():
+    '''Should forget deleted items and the variations of deleted items'''
+
+    sent = []
+    ledger = ContentLedger()
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ledger }).catalog
+    variations = [{ 'id': 'v0', 'item_id': '0', 'name': 'a' }, { 'id': 'v1', 'item_id': '1', 'name': 'b' }]
+
+    catalog.create_or_replace_items({ 'items': create_items('a', 'b') })
+    catalog.create_or_replace_variations({ 'variations': variations })
+    catalog.delete_items({ 'items': [{ 'id': '0' }] })
+    catalog.delete_variations({ 'variations': [{ 'id': 'v1' }] })
+    catalog.create_or_replace_items({ 'items': create_items('a', 'b') })
+    catalog.update_variations({ 'variations': variations })
+
+    assert sent[4:] == [('put', ['0']), ('patch', ['v0', 'v1'])]
+
+def test_with_catalog_files():
+    '''Should forget the section of the catalog files sent'''
+
+    sent = []
+    ledger = ContentLedger()
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ledger }).catalog
+
+    catalog.create_or_replace_items({ 'items': create_items('a') })
+    catalog.create_or_replace_items({ 'items': create_items('a'), 'section': 'Content' })
+    catalog.replace_catalog({ 'items': b'id,item_name\n0,a\n' })
+
+    assert len(ledger) == 1
+
+def test_with_bulk_upload():
+    '''Should leave unchanged items out of the chunks of bulk uploads'''
+
+    sent = []
+    catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ContentLedger() }).catalog
+    items = [{ 'id': str(index), 'name': 'a' } for index in range(1200)]
+
+    catalog.bulk_create_or_replace_items({ 'items': items }, max_concurrency=2)
+    items[1100]['name'] = 'b'
+    report = catalog.bulk_create_or_replace_items({ 'items': items }, max_concurrency=2)
+
+    assert report.ok
+    assert sorted(len(ids) for _, ids in sent) == [1, 200, 1000]
+
+def test_with_persistent_ledger(tmp_path):
+    '''Should keep hashes in a SQLite database between clients'''
+
+    sent = []
+
+    for _ in range(2):
+        ledger = ContentLedger(tmp_path / 'ledger.sqlite3')
+        catalog = ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(sent), 'ledger': ledger }).catalog
+        catalog.create_or_replace_items({ 'items': create_items('a') })
+        ledger.close()
+
+    assert sent == [('put', ['0'])]
+
+def test_with_invalid_ledger():
+    '''Should raise an exception when the ledger is not a ContentLedger'''
+
+    with raises(ConstructorException, match='ledger must be a ContentLedger'):
+        ConstructorIO({ **VALID_OPTIONS, 'ledger': 'ledger.sqlite3' })
+
+def test_async_with_unchanged_items():
+    '''Should only send the variations changed since they were last accepted asynchronously'''
+
+    sent = []
+    transport = AsyncFakeTransport(create_transport(sent))
+    catalog = AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'ledger': ContentLedger() }).catalog
+
+    async def upload():
+        variations = [{ 'id': 'v0', 'item_id': '0' }, { 'id': 'v1', 'item_id': '0' }]
+
+        await catalog.create_or_replace_variations({ 'variations': variations })
+        variations[0]['name'] = 'a'
+
+        return (
+            await catalog.update_variations({ 'variations': variations }),
+            await catalog.update_variations({ 'variations': variations }),
+        )
+
+    assert asyncio.run(upload()) == ({ 'task_id': 1 }, None)
+    assert sent == [('put', ['v0', 'v1']), ('patch', ['v0'])]
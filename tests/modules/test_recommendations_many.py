@@ -0,0 +1,97 @@
+'''ConstructorIO Python Client - Multi-pod Recommendations Tests'''
+
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Response)
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def create_transport():
+    '''Create a fake transport failing pods named "error" and echoing the pod_id and query parameters'''
+
+    def handler(request):
+        url = urlsplit(request.url)
+        pod_id = unquote(url.path.split('/')[-1])
+
+        if pod_id == 'error':
+            return Response(500, b'{"message": "error"}')
+
+        body = {
+            'response': { 'results': [{ 'value': pod_id }], 'query': parse_qs(url.query) },
+            'result_id': 'result-id',
+        }
+
+        return Response(200, json.dumps(body).encode('utf-8'))
+
+    transport = FakeTransport()
+    transport.add_response('get', '/recommendations/v1/pods/', handler=handler)
+
+    return transport
+
+def get_query(result):
+    '''Get the query parameters echoed by the fake transport'''
+
+    return result.get('response').get('query')
+
+def test_with_many_pods():
+    '''Should return results keyed by pod_id with shared parameters and exceptions in place of failed pods'''
+
+    transport = create_transport()
+    pods = { 'similar': { 'num_results': 4 }, 'bought_together': { 'item_ids': 'item-2' }, 'error': None }
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.recommendations.get_recommendation_results_many(
+            pods,
+            { 'item_ids': 'item-1', 'num_results': 8 },
+            { 'session_id': 1, 'user_agent': 'agent' },
+        )
+
+    assert list(results.keys()) == ['similar', 'bought_together', 'error']
+    assert get_query(results['similar'])['item_id'] == ['item-1']
+    assert get_query(results['similar'])['num_results'] == ['4']
+    assert get_query(results['similar'])['s'] == ['1']
+    assert get_query(results['bought_together'])['item_id'] == ['item-2']
+    assert get_query(results['bought_together'])['num_results'] == ['8']
+    assert isinstance(results['error'], HttpException)
+    assert all(request.headers.get('User-Agent') == 'agent' for request in transport.requests)
+
+def test_with_list_of_pod_ids():
+    '''Should return results keyed by pod_id and exceptions in place of invalid pods'''
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport() }) as client:
+        results = client.recommendations.get_recommendation_results_many(['similar', ''], { 'item_ids': 'item-1' })
+
+    assert results['similar'].get('response').get('results')[0].get('value') == 'similar'
+    assert isinstance(results[''], ConstructorException)
+
+def test_with_invalid_pods():
+    '''Should raise exception when pods is neither a dict nor a list'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'pods is a required parameter of type dict or list'):
+            client.recommendations.get_recommendation_results_many('similar')
+
+def test_async_with_many_pods():
+    '''Should return results keyed by pod_id and exceptions in place of failed pods'''
+
+    transport = AsyncFakeTransport(create_transport())
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.recommendations.get_recommendation_results_many(
+                { 'similar': { 'num_results': 4 }, 'error': None },
+                { 'item_ids': 'item-1' },
+            )
+
+    results = asyncio.run(run())
+
+    assert get_query(results['similar'])['item_id'] == ['item-1']
+    assert isinstance(results['error'], HttpException)
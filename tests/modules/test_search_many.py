@@ -0,0 +1,92 @@
+'''ConstructorIO Python Client - Batch Search Tests'''
+
+import asyncio
+from urllib.parse import unquote, urlsplit
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import AsyncFakeTransport
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def search_handler(request):
+    '''Answer a search request, failing queries named "error"'''
+
+    query = unquote(urlsplit(request.url).path.split('/')[-1])
+
+    if query == 'error':
+        return create_json_response({ 'message': 'error' }, 500)
+
+    return create_json_response({ 'response': { 'results': [{ 'value': query }] }, 'result_id': 'result-id' })
+
+def create_search_transport(max_in_flight):
+    '''Create a fake transport answering searches and recording the peak number of requests in flight'''
+
+    return create_transport([('get', '/search/', search_handler)], max_in_flight, delay=0.02)
+
+def get_value(result):
+    '''Get the value of the first result'''
+
+    return result.get('response').get('results')[0].get('value')
+
+def test_with_many_searches():
+    '''Should return results in the order of searches and exceptions in place of failed searches'''
+
+    max_in_flight = [0]
+    transport = create_search_transport(max_in_flight)
+    searches = [('shoes', { 'page': 2 }, { 'session_id': 1 }), ('error',), 'shirts', ('',)]
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.search.get_search_results_many(searches)
+
+    assert get_value(results[0]) == 'shoes'
+    assert isinstance(results[1], HttpException)
+    assert get_value(results[2]) == 'shirts'
+    assert isinstance(results[3], ConstructorException)
+    assert any('page=2' in request.url for request in transport.requests)
+    assert max_in_flight[0] > 1
+
+def test_with_max_concurrency():
+    '''Should not run more than max_concurrency searches at the same time'''
+
+    max_in_flight = [0]
+    transport = create_search_transport(max_in_flight)
+    searches = [f'query{index}' for index in range(10)]
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.search.get_search_results_many(searches, max_concurrency=2)
+
+    assert [get_value(result) for result in results] == searches
+    assert max_in_flight[0] == 2
+
+def test_with_invalid_searches():
+    '''Should raise exception when searches is not a list'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'searches is a required parameter of type list'):
+            client.search.get_search_results_many('shoes')
+
+def test_with_invalid_max_concurrency():
+    '''Should raise exception when max_concurrency is not a positive integer'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'max_concurrency must be a positive integer'):
+            client.search.get_search_results_many(['shoes'], max_concurrency=0)
+
+def test_async_with_many_searches():
+    '''Should return results in the order of searches and exceptions in place of failed searches'''
+
+    transport = AsyncFakeTransport(create_search_transport([0]))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.search.get_search_results_many(['shoes', ('error',)], max_concurrency=1)
+
+    results = asyncio.run(run())
+
+    assert get_value(results[0]) == 'shoes'
+    assert isinstance(results[1], HttpException)
@@ -0,0 +1,101 @@
+'''ConstructorIO Python Async Client Tests'''
+
+import asyncio
+from os import environ
+
+import pytest
+
+from constructor_io.constructor_io import AsyncConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+
+pytest.importorskip('aiohttp')
+
+TEST_API_KEY = environ['TEST_REQUEST_API_KEY']
+VALID_OPTIONS = { 'api_key': TEST_API_KEY }
+QUERY = 'item'
+SECTION = 'Products'
+
+def test_with_valid_api_key():
+    '''Should return an instance when valid API key is provided'''
+
+    client = AsyncConstructorIO(VALID_OPTIONS)
+    options = client.get_options()
+
+    assert isinstance(client, AsyncConstructorIO)
+    assert options.get('api_key') == TEST_API_KEY
+    assert options.get('version').startswith('ciopython-')
+    assert options.get('service_url') is not None
+    assert options.get('pool_size') == 100
+    assert client.autocomplete is not None
+    assert client.search is not None
+    assert client.browse is not None
+    assert client.recommendations is not None
+    assert client.catalog is not None
+    assert client.tasks is not None
+    assert client.quizzes is not None
+
+def test_with_invalid_api_key():
+    '''Should throw an error when invalid API key is provided'''
+
+    with pytest.raises(
+        ConstructorException,
+        match=r'API key is a required parameter of type string'
+    ):
+        AsyncConstructorIO({'api_key': 123456})
+
+def test_close_with_context_manager():
+    '''Should close the owned session when leaving the context manager'''
+
+    async def run():
+        async with AsyncConstructorIO(VALID_OPTIONS) as client:
+            await client.search.get_search_results(QUERY, { 'section': SECTION })
+            transport = client.get_options().get('transport')
+            session = transport.session
+
+            assert session is not None
+
+        assert session.closed
+        assert transport.session is None
+
+    asyncio.run(run())
+
+def test_with_concurrent_requests():
+    '''Should return responses for concurrent requests across modules'''
+
+    async def run():
+        async with AsyncConstructorIO(VALID_OPTIONS) as client:
+            return await asyncio.gather(
+                client.search.get_search_results(QUERY, { 'section': SECTION }),
+                client.autocomplete.get_autocomplete_results(QUERY),
+                client.browse.get_browse_results('group_id', 'All', { 'section': SECTION }),
+                client.browse.get_browse_groups(),
+            )
+
+    search, autocomplete, browse, groups = asyncio.run(run())
+
+    assert isinstance(search.get('response').get('results'), list)
+    assert search.get('request').get('term') == QUERY
+    assert isinstance(autocomplete.get('sections'), dict)
+    assert isinstance(browse.get('response').get('results'), list)
+    assert isinstance(groups.get('response').get('groups'), list)
+
+def test_with_invalid_query():
+    '''Should raise exception when invalid query is provided'''
+
+    async def run():
+        async with AsyncConstructorIO(VALID_OPTIONS) as client:
+            await client.search.get_search_results(None)
+
+    with pytest.raises(ConstructorException, match=r'query is a required parameter of type string'):
+        asyncio.run(run())
+
+def test_with_invalid_api_key_request():
+    '''Should raise exception when request is made with an invalid API key'''
+
+    async def run():
+        async with AsyncConstructorIO({ 'api_key': 'notanapikey' }) as client:
+            await client.search.get_search_results(QUERY, { 'section': SECTION })
+
+    with pytest.raises(HttpException, match=r'You have supplied an invalid `key` or `autocomplete_key`.'):
+        asyncio.run(run())
@@ -0,0 +1,233 @@
+'''ConstructorIO Python Client - Response Cache Tests'''
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from constructor_io.constructor_io import ConstructorIO
+from constructor_io.helpers.cache import (LRUCache, create_cache_key,
+                                          get_endpoint_names)
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import FakeTransport, Request, Response
+
+VALID_OPTIONS = { 'api_key': 'key-abc', 'api_token': 'token-abc' }
+RESULTS_RESPONSE = {
+    'response': { 'results': [{ 'value': 'item' }] },
+    'result_id': 'result-id',
+}
+
+def create_client(cache):
+    '''Create a client sending requests to a fake transport'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', RESULTS_RESPONSE)
+    transport.add_response('get', '/browse/', RESULTS_RESPONSE)
+    transport.add_response('get', '/recommendations/', RESULTS_RESPONSE)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'cache': cache })
+
+    return client, transport
+
+def test_with_identical_search_requests():
+    '''Should serve identical requests from the cache regardless of the timestamp'''
+
+    client, transport = create_client({ 'search': { 'ttl': 60 } })
+
+    with mock.patch('constructor_io.modules.search.time', side_effect=[1, 2]):
+        first = client.search.get_search_results('item', { 'page': 2 })
+        second = client.search.get_search_results('item', { 'page': 2 })
+
+    assert len(transport.requests) == 1
+    assert first == second
+    assert first is not second
+
+def test_with_different_search_requests():
+    '''Should not share entries between requests with different parameters'''
+
+    client, transport = create_client({ 'search': {} })
+    client.search.get_search_results('item', { 'page': 1 })
+    client.search.get_search_results('item', { 'page': 2 })
+    client.search.get_search_results('item', { 'page': 1 }, { 'user_ip': '127.0.0.1' })
+
+    assert len(transport.requests) == 3
+
+def test_with_uncached_endpoint():
+    '''Should only cache endpoints with a policy'''
+
+    client, transport = create_client({ 'search': {} })
+    client.browse.get_browse_results('group_id', 'All')
+    client.browse.get_browse_results('group_id', 'All')
+    client.recommendations.get_recommendation_results('pod')
+    client.recommendations.get_recommendation_results('pod')
+
+    assert len(transport.requests) == 4
+
+def test_with_browse_and_recommendations_policies():
+    '''Should cache browse and recommendations requests with their own policies'''
+
+    client, transport = create_client({ 'browse': { 'ttl': 30 }, 'recommendations': { 'max_size': 10 } })
+    client.browse.get_browse_results('group_id', 'All')
+    client.browse.get_browse_results('group_id', 'All')
+    client.recommendations.get_recommendation_results('pod')
+    client.recommendations.get_recommendation_results('pod')
+    caches = client.get_options().get('transport').caches
+
+    assert len(transport.requests) == 2
+    assert caches.get('browse').hits == 1
+    assert caches.get('recommendations').hits == 1
+
+def test_with_error_response():
+    '''Should not cache error responses'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', { 'message': 'error' }, status_code=500)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'cache': { 'search': {} } })
+
+    for _ in range(2):
+        with pytest.raises(HttpException):
+            client.search.get_search_results('item')
+
+    assert len(transport.requests) == 2
+    assert len(client.get_options().get('transport').caches.get('search')) == 0
+
+def test_with_invalid_endpoint():
+    '''Should throw an error when an unknown endpoint is provided'''
+
+    with pytest.raises(ConstructorException, match=r'cache endpoint must be one of'):
+        create_client({ 'catalog': {} })
+
+def test_lru_cache_eviction():
+    '''Should evict the least recently used entry when full'''
+
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+def test_lru_cache_expiry():
+    '''Should not return entries older than the ttl'''
+
+    cache = LRUCache(ttl=10)
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', side_effect=[100, 105, 111]):
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert cache.get('a') is None
+
+    assert len(cache) == 0
+
+def test_create_cache_key():
+    '''Should ignore the timestamp and the order of query parameters'''
+
+    first = Request('get', 'https://ac.cnstrc.com/search/item?key=a&page=1&_dt=1')
+    second = Request('get', 'https://ac.cnstrc.com/search/item?page=1&_dt=2&key=a')
+    third = Request('get', 'https://ac.cnstrc.com/search/item?page=1&_dt=2&key=a', auth=('token', ''))
+
+    assert create_cache_key(first) == create_cache_key(second)
+    assert create_cache_key(first) != create_cache_key(third)
+
+def create_browse_client(cache):
+    '''Create a client sending browse requests to a fake transport returning a new group each call'''
+
+    transport = FakeTransport()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+
+        return Response(200, json.dumps({ 'response': { 'groups': [len(calls)], 'facets': [] } }).encode())
+
+    transport.add_response('get', '/browse/', handler=handler)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'cache': cache })
+
+    return client, transport
+
+def test_with_stale_browse_groups():
+    '''Should serve a stale response and refresh it in the background'''
+
+    client, transport = create_browse_client({ 'browse_groups': { 'ttl': 10, 'stale_while_revalidate': 100 } })
+    caching_transport = client.get_options().get('transport')
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=0):
+        first = client.browse.get_browse_groups()
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=50):
+        stale = client.browse.get_browse_groups()
+        client.close()
+        refreshed = client.browse.get_browse_groups()
+
+    assert first.get('response').get('groups') == [1]
+    assert stale.get('response').get('groups') == [1]
+    assert refreshed.get('response').get('groups') == [2]
+    assert len(transport.requests) == 2
+    assert caching_transport.caches.get('browse_groups').stale_hits == 1
+
+def test_with_stale_browse_groups_refreshed_by_client_executor():
+    '''Should refresh stale responses in the executor shared between modules'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/browse/', { 'response': { 'groups': [], 'facets': [] } })
+
+    with ThreadPoolExecutor(1) as executor:
+        submit = mock.Mock(side_effect=executor.submit)
+        client = ConstructorIO({
+            **VALID_OPTIONS,
+            'transport': transport,
+            'executor': mock.Mock(submit=submit),
+            'cache': { 'browse_groups': { 'ttl': 10, 'stale_while_revalidate': 100 } },
+        })
+
+        with mock.patch('constructor_io.helpers.cache.monotonic', return_value=0):
+            client.browse.get_browse_groups()
+
+        with mock.patch('constructor_io.helpers.cache.monotonic', return_value=50):
+            client.browse.get_browse_groups()
+
+    assert submit.call_count == 1
+    assert len(transport.requests) == 2
+
+def test_with_expired_browse_facets():
+    '''Should wait for a new response once the stale period has passed'''
+
+    client, transport = create_browse_client({ 'browse_facets': { 'ttl': 10, 'stale_while_revalidate': 100 } })
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=0):
+        client.browse.get_browse_facets()
+
+    with mock.patch('constructor_io.helpers.cache.monotonic', return_value=200):
+        expired = client.browse.get_browse_facets()
+
+    assert expired.get('response').get('groups') == [2]
+    assert len(transport.requests) == 2
+
+def test_with_browse_groups_policy():
+    '''Should apply browse groups policies to the groups endpoint only'''
+
+    client, transport = create_browse_client({ 'browse_groups': {} })
+    client.browse.get_browse_groups()
+    client.browse.get_browse_groups()
+    client.browse.get_browse_facets()
+    client.browse.get_browse_facets()
+
+    assert len(transport.requests) == 3
+
+def test_get_endpoint_names():
+    '''Should return the most specific endpoint names first'''
+
+    service_url = 'https://ac.cnstrc.com'
+
+    assert get_endpoint_names(f'{service_url}/browse/groups?key=a', service_url) == ['browse_groups', 'browse']
+    assert get_endpoint_names(f'{service_url}/browse/groups/All?key=a', service_url) == ['browse']
+    assert get_endpoint_names(f'{service_url}/browse/facet_options?key=a', service_url) == [
+        'browse_facet_options',
+        'browse',
+    ]
+    assert get_endpoint_names(f'{service_url}/search/item?key=a', service_url) == ['search']
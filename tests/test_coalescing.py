@@ -0,0 +1,134 @@
+'''ConstructorIO Python Client - Request Coalescing Tests'''
+
+import json
+from threading import Event, Thread
+from time import monotonic, sleep
+
+import pytest
+
+from constructor_io.constructor_io import ConstructorIO
+from constructor_io.helpers.coalescing import CoalescingTransport
+from constructor_io.helpers.exception import HttpException
+from constructor_io.helpers.transport import FakeTransport, Request, Response
+
+VALID_OPTIONS = { 'api_key': 'key-abc', 'api_token': 'token-abc' }
+RESULTS_RESPONSE = {
+    'response': { 'results': [{ 'value': 'item' }] },
+    'result_id': 'result-id',
+}
+
+def create_blocking_transport(status_code=200):
+    '''Create a fake transport whose responses are held until release is set'''
+
+    release = Event()
+
+    def handler(_):
+        release.wait(5)
+
+        return Response(status_code, json.dumps(RESULTS_RESPONSE).encode('utf-8'))
+
+    transport = FakeTransport()
+    transport.add_response('get', '/browse/', handler=handler)
+    transport.add_response('get', '/search/', handler=handler)
+
+    return transport, release
+
+def run_concurrently(calls, coalescing_transport, expected_coalesced, release):
+    '''Run calls in threads, releasing the responses once the expected number of calls were coalesced'''
+
+    results = [None] * len(calls)
+
+    def run(index, call):
+        try:
+            results[index] = call()
+        except Exception as exception: # pylint: disable=broad-except
+            results[index] = exception
+
+    threads = [Thread(target=run, args=(index, call)) for index, call in enumerate(calls)]
+
+    for thread in threads:
+        thread.start()
+
+    deadline = monotonic() + 5
+
+    while coalescing_transport.coalesced < expected_coalesced and monotonic() < deadline:
+        sleep(0.01)
+
+    release.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    return results
+
+def test_with_identical_browse_requests():
+    '''Should share one network call between identical requests and copy the results for each caller'''
+
+    transport, release = create_blocking_transport()
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'coalesce': True })
+    coalescing_transport = client.get_options().get('transport')
+    calls = [lambda: client.browse.get_browse_results('group_id', 'All', { 'page': 1 })] * 5
+
+    results = run_concurrently(calls, coalescing_transport, 4, release)
+
+    assert len(transport.requests) == 1
+    assert all(result == results[0] for result in results)
+    assert len({ id(result) for result in results }) == 5
+
+def test_with_different_requests():
+    '''Should not share network calls between requests for different results'''
+
+    transport, release = create_blocking_transport()
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'coalesce': True })
+    coalescing_transport = client.get_options().get('transport')
+    calls = [
+        lambda: client.search.get_search_results('item'),
+        lambda: client.search.get_search_results('item', { 'page': 2 }),
+        lambda: client.search.get_search_results('item', None, { 'session_id': 2 }),
+    ]
+
+    run_concurrently(calls, coalescing_transport, 0, release)
+
+    assert len(transport.requests) == 3
+
+def test_with_error_response():
+    '''Should raise the error for every coalesced caller'''
+
+    transport, release = create_blocking_transport(500)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'coalesce': True })
+    coalescing_transport = client.get_options().get('transport')
+    calls = [lambda: client.search.get_search_results('item')] * 3
+
+    results = run_concurrently(calls, coalescing_transport, 2, release)
+
+    assert len(transport.requests) == 1
+    assert all(isinstance(result, HttpException) for result in results)
+
+def test_with_failed_request():
+    '''Should raise the exception of the shared network call and not keep it in flight'''
+
+    def handler(_):
+        raise ConnectionError('connection reset')
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', handler=handler)
+    coalescing_transport = CoalescingTransport(transport)
+    request = Request('get', 'https://ac.cnstrc.com/search/item?key=key-abc')
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            coalescing_transport.send(request)
+
+    assert len(transport.requests) == 2
+
+def test_with_post_requests():
+    '''Should not coalesce requests other than GET requests'''
+
+    transport = FakeTransport()
+    coalescing_transport = CoalescingTransport(transport)
+
+    for _ in range(2):
+        coalescing_transport.send(Request('post', 'https://ac.cnstrc.com/v2/items?key=key-abc', json={}))
+
+    assert len(transport.requests) == 2
+    assert coalescing_transport.coalesced == 0
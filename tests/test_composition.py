@@ -0,0 +1,159 @@
+'''ConstructorIO Python Client - Page Composition Tests'''
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.transport import AsyncTransport
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def create_body(key):
+    '''Create a response body with an empty list under key'''
+
+    return { 'response': { key: [] }, 'result_id': 'result-id' }
+
+def create_page_transport(slow_delay=0.5):
+    '''Create a fake transport answering browse facets after slow_delay seconds and failing browse groups'''
+
+    return create_transport([
+        ('get', '/search/', lambda _: create_json_response(create_body('results'))),
+        ('get', '/browse/facets', lambda _: create_json_response(create_body('facets'))),
+        ('get', '/browse/groups', lambda _: create_json_response({ 'message': 'error' }, 500)),
+    ], delay=lambda request: slow_delay if '/browse/facets' in request.url else 0)
+
+class SlowAsyncTransport(AsyncTransport):
+    '''Async transport waiting without blocking the event loop on browse facets'''
+
+    def __init__(self):
+        self.fake_transport = create_page_transport(0)
+
+    async def send(self, request):
+        if '/browse/facets' in request.url:
+            await asyncio.sleep(0.5)
+
+        return self.fake_transport.send(request)
+
+def test_with_page():
+    '''Should return the results finished in time, the calls timed out and the calls failed'''
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': create_page_transport() }) as client:
+        page = (
+            client.create_page(timeout=0.2)
+            .add('search', client.search.get_search_results, 'shoes', { 'page': 1 })
+            .add('facets', client.browse.get_browse_facets)
+            .add('groups', client.browse.get_browse_groups)
+        )
+        start = monotonic()
+        results = page.run()
+
+        assert monotonic() - start < 0.4
+
+    assert list(results.keys()) == ['search']
+    assert results.get('search').get('response').get('results') == []
+    assert results.timed_out == ['facets']
+    assert list(results.errors.keys()) == ['groups']
+    assert isinstance(results.errors.get('groups'), HttpException)
+
+def test_without_timeout():
+    '''Should wait for all calls when timeout is omitted'''
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': create_page_transport(0.05) }) as client:
+        results = client.create_page().add('facets', client.browse.get_browse_facets).run()
+
+    assert results.get('facets').get('response').get('facets') == []
+    assert results.timed_out == []
+
+def test_with_nested_fan_outs():
+    '''Should run pages fanning out on the client executor while all its threads are in use'''
+
+    max_in_flight = [0]
+    transport = create_transport([
+        ('get', '/recommendations/', lambda _: create_json_response(create_body('results'))),
+        ('get', '/browse/', lambda _: create_json_response(create_body('results'))),
+    ], max_in_flight, delay=0.02)
+
+    def run_page(client):
+        page = client.create_page(timeout=2).add(
+            'pods',
+            client.recommendations.get_recommendation_results_many,
+            ['best_sellers', 'new_arrivals', 'on_sale'],
+        )
+
+        return page.run()
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'max_workers': 2 }) as client:
+        with ThreadPoolExecutor(8) as executor:
+            pages = list(executor.map(lambda _: run_page(client), range(8)))
+
+        browse_results = client.browse.get_browse_results_many([('group_id', 'shoes')], timeout=1)
+
+    assert all(not page.timed_out and not page.errors for page in pages)
+    assert all(len(page.get('pods')) == 3 for page in pages)
+    assert max_in_flight[0] == 2
+    assert isinstance(browse_results[0], dict)
+
+def test_with_queued_calls():
+    '''Should cancel the calls not started by the deadline'''
+
+    transport = create_page_transport()
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = (
+            client.create_page(timeout=0.1, max_concurrency=1)
+            .add('facets', client.browse.get_browse_facets)
+            .add('search', client.search.get_search_results, 'shoes')
+            .run()
+        )
+        sleep(0.5)
+
+    assert results.timed_out == ['facets', 'search']
+    assert not any('/search/' in request.url for request in transport.requests)
+
+def test_with_duplicate_name():
+    '''Should raise exception when a call with the same name was already added'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        page = client.create_page().add('search', client.search.get_search_results, 'shoes')
+
+        with raises(ConstructorException, match=r'a call named search was already added'):
+            page.add('search', client.search.get_search_results, 'shirts')
+
+def test_with_invalid_function():
+    '''Should raise exception when function is not callable'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'function is a required parameter of type function'):
+            client.create_page().add('search', 'shoes')
+
+def test_with_invalid_timeout():
+    '''Should raise exception when timeout is not a positive number'''
+
+    with ConstructorIO(VALID_OPTIONS) as client:
+        with raises(ConstructorException, match=r'timeout must be a positive number'):
+            client.create_page(timeout=-1)
+
+def test_async_with_page():
+    '''Should return the results finished in time, the calls timed out and the calls failed'''
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': SlowAsyncTransport() }) as client:
+            return await (
+                client.create_page(timeout=0.2)
+                .add('search', client.search.get_search_results, 'shoes')
+                .add('facets', client.browse.get_browse_facets)
+                .add('groups', client.browse.get_browse_groups)
+                .run()
+            )
+
+    results = asyncio.run(run())
+
+    assert list(results.keys()) == ['search']
+    assert results.timed_out == ['facets']
+    assert isinstance(results.errors.get('groups'), HttpException)
@@ -0,0 +1,119 @@
+'''ConstructorIO Python Client - Request Body Compression Tests'''
+
+import asyncio
+import gzip
+import json
+from unittest import mock
+
+from pytest import raises
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Response,
+                                              Urllib3Transport)
+
+VALID_OPTIONS = { 'api_key': 'key-abc', 'api_token': 'token-abc' }
+
+def create_transport(bodies):
+    '''Create a fake transport decompressing the request bodies into bodies'''
+
+    def handler(request):
+        assert request.json is None and request.files is None
+
+        bodies.append((request.headers, gzip.decompress(b''.join(request.data))))
+
+        return Response(200, b'{"task_id": 1}')
+
+    transport = FakeTransport()
+    transport.add_response('put', '/', handler=handler)
+    transport.add_response('patch', '/', handler=handler)
+    transport.add_response('get', '/', { 'total_count': 0 })
+
+    return transport
+
+def test_with_json_body():
+    '''Should compress JSON bodies and count the bytes saved'''
+
+    bodies = []
+    items = [
+        { 'id': str(index), 'name': 'Item', 'data': { 'url': 'https://constructor.io/' } }
+        for index in range(5000)
+    ]
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': create_transport(bodies), 'compression': 'gzip' }) as client:
+        client.catalog.create_or_replace_items({ 'items': items })
+        client.tasks.get_all_tasks()
+        stats = client.get_options().get('compression_stats')
+
+    headers, body = bodies[0]
+
+    assert json.loads(body) == { 'items': items }
+    assert headers.get('Content-Encoding') == 'gzip'
+    assert headers.get('Content-Type') == 'application/json'
+    assert stats.requests == 1
+    assert stats.bytes_in == len(body)
+    assert stats.bytes_saved > len(body) // 2
+
+def test_with_catalog_files():
+    '''Should compress multipart catalog uploads'''
+
+    bodies = []
+    options = { **VALID_OPTIONS, 'transport': create_transport(bodies), 'compression': { 'level': 1 } }
+
+    with ConstructorIO(options) as client:
+        client.catalog.replace_catalog({ 'items': b'id,item_name\n' + b'1,item\n' * 1000, 'section': 'Products' })
+
+    headers, body = bodies[0]
+
+    assert headers.get('Content-Encoding') == 'gzip'
+    assert headers.get('Content-Type').startswith('multipart/form-data; boundary=')
+    assert b'filename="items.csv"' in body
+    assert body.count(b'1,item\n') == 1000
+
+def test_without_compression():
+    '''Should not compress request bodies by default'''
+
+    transport = FakeTransport()
+    transport.add_response('patch', '/', { 'task_id': 1 })
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        client.catalog.update_items({ 'items': [{ 'id': '1' }] })
+
+    assert transport.requests[0].json == { 'items': [{ 'id': '1' }] }
+    assert transport.requests[0].data is None
+
+def test_with_urllib3_transport():
+    '''Should send compressed bodies as streamed bodies'''
+
+    pool_manager = mock.Mock()
+    pool_manager.urlopen.return_value = mock.Mock(status=200, data=b'{"task_id": 1}', headers={})
+    transport = Urllib3Transport(pool_manager=pool_manager)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'compression': 'gzip' }) as client:
+        client.catalog.update_items({ 'items': [{ 'id': '1' }] })
+
+    kwargs = pool_manager.urlopen.call_args.kwargs
+
+    assert kwargs.get('headers').get('Content-Encoding') == 'gzip'
+    assert gzip.decompress(b''.join(kwargs.get('body'))) == b'{"items": [{"id": "1"}]}'
+
+def test_with_invalid_algorithm():
+    '''Should raise exception when the compression algorithm is not supported'''
+
+    with raises(ConstructorException, match=r'compression algorithm must be one of gzip, zstd'):
+        ConstructorIO({ **VALID_OPTIONS, 'compression': 'brotli' })
+
+def test_async_with_json_body():
+    '''Should compress JSON bodies sent by the async client'''
+
+    bodies = []
+    transport = AsyncFakeTransport(create_transport(bodies))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'compression': 'gzip' }) as client:
+            await client.catalog.update_items({ 'items': [{ 'id': '1' }] })
+
+    asyncio.run(run())
+
+    assert json.loads(bodies[0][1]) == { 'items': [{ 'id': '1' }] }
@@ -1,11 +1,15 @@
 '''ConstructorIO Python Client Tests'''
 
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
+from unittest import mock
 
 import pytest
+import requests
 
 from constructor_io.constructor_io import ConstructorIO
 from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.transport import FakeTransport
 
 TEST_API_KEY = environ['TEST_REQUEST_API_KEY']
 VALID_OPTIONS = { 'api_key': TEST_API_KEY }
@@ -79,3 +83,91 @@ def test_with_no_api_key():
         match=r'API key is a required parameter of type string'
     ):
         ConstructorIO({'api_key': None})
+
+def test_with_default_connection_pool():
+    '''Should create a pooled keep-alive session shared by all modules'''
+
+    client = ConstructorIO(VALID_OPTIONS)
+    session = client.get_options().get('requests')
+    adapter = session.get_adapter('https://ac.cnstrc.com')
+
+    assert isinstance(session, requests.Session)
+    assert adapter is session.get_adapter('https://quizzes.cnstrc.com')
+    assert adapter._pool_maxsize == 10 # pylint: disable=protected-access
+
+def test_with_custom_pool_size():
+    '''Should create a session with the provided pool size per host'''
+
+    client = ConstructorIO({ **VALID_OPTIONS, 'pool_size': 25 })
+    adapter = client.get_options().get('requests').get_adapter('https://ac.cnstrc.com')
+
+    assert adapter._pool_maxsize == 25 # pylint: disable=protected-access
+
+def test_with_invalid_pool_size():
+    '''Should throw an error when invalid pool size is provided'''
+
+    with pytest.raises(
+        ConstructorException,
+        match=r'pool_size must be a positive integer'
+    ):
+        ConstructorIO({ **VALID_OPTIONS, 'pool_size': 0 })
+
+def test_with_custom_requests():
+    '''Should use the provided requests object instead of creating a session'''
+
+    client = ConstructorIO({ **VALID_OPTIONS, 'requests': requests })
+
+    assert client.get_options().get('requests') is requests
+
+def test_close_with_context_manager():
+    '''Should close the owned session when leaving the context manager'''
+
+    client = ConstructorIO(VALID_OPTIONS)
+    session = client.get_options().get('requests')
+
+    with mock.patch.object(session, 'close') as mocked_close:
+        with client:
+            pass
+
+        client.close()
+
+        assert mocked_close.call_count == 1
+
+def test_close_with_custom_requests():
+    '''Should not close a requests object provided by the caller'''
+
+    session = requests.Session()
+
+    with mock.patch.object(session, 'close') as mocked_close:
+        with ConstructorIO({ **VALID_OPTIONS, 'requests': session }):
+            pass
+
+        assert mocked_close.call_count == 0
+
+def test_close_with_custom_executor():
+    '''Should use the provided executor and leave it running on close'''
+
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'executor': executor }) as client:
+        assert client.get_options().get('executor') is executor
+
+    assert executor.submit(lambda: 'running').result() == 'running'
+    executor.shutdown()
+
+def test_with_max_workers():
+    '''Should size the owned executor from max_workers, defaulting to pool_size'''
+
+    assert ConstructorIO({ **VALID_OPTIONS, 'pool_size': 5 }).get_options().get('executor').max_workers == 5
+    assert ConstructorIO({ **VALID_OPTIONS, 'max_workers': 3 }).get_options().get('executor').max_workers == 3
+
+def test_with_custom_transport():
+    '''Should use the provided transport and leave it open on close'''
+
+    transport = FakeTransport()
+
+    with mock.patch.object(transport, 'close') as mocked_close:
+        with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            assert client.get_options().get('transport') is transport
+
+        assert mocked_close.call_count == 0
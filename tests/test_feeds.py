@@ -0,0 +1,151 @@
+'''ConstructorIO Python Client - Catalog CSV Feed Tests'''
+
+import csv
+import io
+from email.parser import BytesParser
+from email.policy import HTTP
+from itertools import count
+
+from pytest import raises
+
+from constructor_io.helpers.delta import diff_csv
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.feeds import (create_item_groups_feed,
+                                          create_items_feed,
+                                          create_variations_feed)
+from constructor_io.helpers.multipart import MultipartStream
+from tests.helpers.utils import (create_mock_item, create_mock_item_group,
+                                 create_mock_variation)
+
+
+def read_csv(feed):
+    '''Read a feed into a list of dicts keyed by column'''
+
+    return list(csv.DictReader(io.StringIO(feed.read().decode('utf-8'))))
+
+def test_items_feed():
+    '''Should encode items with facets and metadata columns'''
+
+    item = create_mock_item()
+    item['suggested_score'] = 10
+    item['data']['keywords'] = ['shoe', 'sneaker']
+    item['data']['active'] = True
+    feed = create_items_feed([item, { 'id': '2', 'name': 'Item, "two"' }])
+
+    assert read_csv(feed) == [
+        {
+            'id': item['id'],
+            'item_name': item['name'],
+            'suggested_score': '10',
+            'url': item['data']['url'],
+            'image_url': item['data']['image_url'],
+            'keywords': 'shoe|sneaker',
+            'active': 'true',
+            'facet:color': 'blue|red',
+            'metadata:brand': 'abc',
+            'metadata:complexMetadataField': '{"key1":"val1","key2":"val2"}',
+        },
+        {
+            'id': '2',
+            'item_name': 'Item, "two"',
+            'suggested_score': '',
+            'url': '',
+            'image_url': '',
+            'keywords': '',
+            'active': '',
+            'facet:color': '',
+            'metadata:brand': '',
+            'metadata:complexMetadataField': '',
+        },
+    ]
+
+def test_variations_feed():
+    '''Should encode variations with a variation_id and item_id'''
+
+    variation = create_mock_variation('item-1')
+    rows = read_csv(create_variations_feed(iter([variation])))
+
+    assert list(rows[0])[:2] == ['variation_id', 'item_id']
+    assert (rows[0]['variation_id'], rows[0]['item_id']) == (variation['id'], 'item-1')
+    assert rows[0]['facet:color'] == 'blue|red'
+
+def test_item_groups_feed():
+    '''Should encode item groups with the parent_id of children'''
+
+    parent = create_mock_item_group()
+    child = create_mock_item_group()
+    parent['children'] = [child]
+    rows = read_csv(create_item_groups_feed([parent]))
+
+    assert [(row['id'], row['parent_id']) for row in rows] == [(parent['id'], ''), (child['id'], parent['id'])]
+    assert rows[0]['metadata:complexMetadataField'] == '{"key1":"val1","key2":"val2"}'
+
+def test_feed_is_streamed():
+    '''Should encode items as the feed is read, holding only the sample in memory'''
+
+    consumed = count()
+
+    def create_items():
+        for index in range(1000000):
+            next(consumed)
+            yield { 'id': str(index), 'name': f'Item {index}', 'data': { 'facets': { 'size': ['m'] } } }
+
+    feed = create_items_feed(create_items(), sample_size=10)
+    header = feed.readline()
+    chunk = feed.read(1000)
+    feed.close()
+
+    assert header == b'id,item_name,facet:size\n'
+    assert chunk.startswith(b'0,Item 0,m\n')
+    assert next(consumed) < 10000
+
+def test_feed_with_columns():
+    '''Should write the columns passed and raise an exception for an item with another column'''
+
+    items = [{ 'id': '1', 'data': { 'brand': 'abc' } }, { 'id': '2', 'data': { 'color': 'red' } }]
+
+    assert read_csv(create_items_feed(items[:1], columns=['id', 'metadata:brand', 'facet:color'])) == [
+        { 'id': '1', 'metadata:brand': 'abc', 'facet:color': '' },
+    ]
+
+    with raises(ConstructorException, match='metadata:color is not a column of the feed'):
+        create_items_feed(items, sample_size=1).read()
+
+def test_feed_with_invalid_records():
+    '''Should raise an exception for unknown attributes and invalid options'''
+
+    with raises(ConstructorException, match='children is not an attribute'):
+        create_items_feed([{ 'id': '1', 'children': [] }]).read()
+
+    with raises(ConstructorException, match='catalog records must be dicts'):
+        create_items_feed(['1']).read()
+
+    with raises(ConstructorException, match='columns must be a non-empty list'):
+        create_items_feed([], columns=[])
+
+    with raises(ConstructorException, match='sample_size must be a positive integer'):
+        create_items_feed([], sample_size=0)
+
+def test_feed_in_multipart_body():
+    '''Should be streamed in multipart bodies with chunked encoding'''
+
+    items = ({ 'id': str(index), 'name': f'Item {index}' } for index in range(20000))
+    stream = MultipartStream({ 'items': ('items.csv', create_items_feed(items)) })
+    body = b''.join(stream)
+    message = BytesParser(policy=HTTP).parsebytes(
+        b'Content-Type: ' + stream.content_type.encode('utf-8') + b'\r\n\r\n' + body
+    )
+    content = next(message.iter_parts()).get_payload(decode=True).decode('utf-8')
+
+    assert stream.len is None
+    assert content.splitlines()[:2] == ['id,item_name', '0,Item 0']
+    assert len(content.splitlines()) == 20001
+
+def test_feed_in_delta(tmp_path):
+    '''Should be compared with a previous feed'''
+
+    previous = create_items_feed([{ 'id': '1', 'name': 'a' }, { 'id': '2', 'name': 'b' }])
+    current = create_items_feed([{ 'id': '1', 'name': 'a' }, { 'id': '2', 'name': 'B' }])
+    delta = diff_csv(previous, current, tmp_path / 'items.csv')
+
+    assert (delta.num_changed, delta.num_unchanged) == (1, 1)
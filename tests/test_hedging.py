@@ -0,0 +1,164 @@
+'''ConstructorIO Python Client - Hedged Requests Tests'''
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, sleep
+
+import pytest
+
+from constructor_io.constructor_io import ConstructorIO
+from constructor_io.helpers.exception import (ConstructorException,
+                                              HttpException)
+from constructor_io.helpers.hedging import HedgingPolicy
+from constructor_io.helpers.transport import FakeTransport, Response
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+
+def create_client(hedging, delays, status_codes=None):
+    '''Create a client whose nth request takes delays[n] seconds, failing when status_codes[n] is None'''
+
+    transport = FakeTransport()
+    lock = Lock()
+
+    def handler(_request):
+        with lock:
+            index = len(transport.requests) - 1
+
+        sleep(delays[index] if index < len(delays) else 0)
+        status_code = status_codes[index] if status_codes and index < len(status_codes) else 200
+
+        if status_code is None:
+            raise ConnectionError('connection reset')
+
+        body = { 'response': { 'results': [{ 'value': str(index) }] }, 'result_id': 'result-id' }
+
+        if status_code != 200:
+            body = { 'message': 'error' }
+
+        return Response(status_code, json.dumps(body).encode('utf-8'))
+
+    transport.add_response('get', '/search/', handler=handler)
+    transport.add_response('get', '/browse/', handler=handler)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport, 'hedging': hedging })
+
+    return client, transport
+
+def test_with_slow_request():
+    '''Should return the response of the duplicate request when the original one is slow'''
+
+    client, transport = create_client({ 'search': { 'delay': 0.05, 'budget': 1 } }, [1])
+
+    with client:
+        response = client.search.get_search_results('item')
+
+    assert response.get('response').get('results')[0].get('value') == '1'
+    assert len(transport.requests) == 2
+
+def test_with_fast_request():
+    '''Should not send a duplicate request when the response arrives before the delay'''
+
+    client, transport = create_client({ 'search': { 'delay': 1, 'budget': 1 } }, [0])
+
+    with client:
+        response = client.search.get_search_results('item')
+
+    assert response.get('response').get('results')[0].get('value') == '0'
+    assert len(transport.requests) == 1
+
+def test_with_concurrent_requests():
+    '''Should send concurrent requests at once whatever the size of the pool sending duplicate requests'''
+
+    max_in_flight = [0]
+    body = { 'response': { 'results': [] }, 'result_id': 'result-id' }
+    transport = create_transport([('get', '/search/', lambda _: create_json_response(body))], max_in_flight, 0.1)
+    options = { **VALID_OPTIONS, 'transport': transport, 'hedging': { 'search': { 'delay': 5 } }, 'pool_size': 1 }
+
+    with ConstructorIO(options) as client:
+        with ThreadPoolExecutor(20) as executor:
+            start = monotonic()
+            list(executor.map(lambda _: client.search.get_search_results('item'), range(20)))
+            elapsed = monotonic() - start
+
+    assert max_in_flight[0] == 20
+    assert elapsed < 0.5
+
+def test_with_exhausted_budget():
+    '''Should not send more duplicate requests than the budget allows'''
+
+    client, transport = create_client({ 'search': { 'delay': 0, 'budget': 0.5 } }, [0.05] * 10)
+
+    with client:
+        for _ in range(4):
+            client.search.get_search_results('item')
+
+    # Budget for a duplicate request is earned every two requests
+    assert len(transport.requests) == 6
+
+def test_with_failed_duplicate_request():
+    '''Should wait for the original request when the duplicate request fails'''
+
+    client, transport = create_client({ 'search': { 'delay': 0.05, 'budget': 1 } }, [0.2], [200, None])
+
+    with client:
+        response = client.search.get_search_results('item')
+
+    assert response.get('response').get('results')[0].get('value') == '0'
+    assert len(transport.requests) == 2
+
+def test_with_error_response():
+    '''Should return the first response even if it is an error response'''
+
+    client, _ = create_client({ 'search': { 'delay': 0.05, 'budget': 1 } }, [1], [200, 400])
+
+    with client:
+        with pytest.raises(HttpException):
+            client.search.get_search_results('item')
+
+def test_with_unhedged_endpoint():
+    '''Should not hedge requests of endpoints without a policy'''
+
+    client, transport = create_client({ 'search': { 'delay': 0, 'budget': 1 } }, [0.05])
+
+    with client:
+        client.browse.get_browse_results('group_id', 'All')
+
+    assert len(transport.requests) == 1
+
+def test_with_invalid_endpoint():
+    '''Should raise exception when hedging an endpoint that is not latency critical'''
+
+    with pytest.raises(ConstructorException, match=r'hedging endpoint must be one of autocomplete, search'):
+        ConstructorIO({ **VALID_OPTIONS, 'hedging': { 'catalog': { 'delay': 0.1 } } })
+
+def test_with_invalid_policy():
+    '''Should raise exception when neither a delay nor a percentile is provided'''
+
+    with pytest.raises(ConstructorException, match=r'hedging policy requires a delay or a percentile'):
+        ConstructorIO({ **VALID_OPTIONS, 'hedging': { 'search': { 'budget': 0.1 } } })
+
+def test_policy_with_learned_percentile():
+    '''Should use the percentile of recent latencies as delay once enough were recorded'''
+
+    policy = HedgingPolicy(delay=0.5, percentile=90, min_samples=10)
+
+    for latency in range(9):
+        policy.record_latency(latency / 100)
+
+    assert policy.get_delay() == 0.5
+
+    policy.record_latency(0.09)
+
+    assert policy.get_delay() == 0.09
+
+def test_policy_budget():
+    '''Should cap duplicate requests to the budget and the maximum burst'''
+
+    policy = HedgingPolicy(delay=0.1, budget=0.5, max_burst=2)
+
+    for _ in range(10):
+        policy.record_request()
+
+    assert [policy.acquire_hedge() for _ in range(3)] == [True, True, False]
+    assert policy.hedges == 2
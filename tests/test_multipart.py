@@ -0,0 +1,99 @@
+'''ConstructorIO Python Client - Streaming Multipart Tests'''
+
+import asyncio
+import io
+
+import pytest
+
+from constructor_io.constructor_io import AsyncConstructorIO
+from constructor_io.helpers.multipart import MultipartStream
+from tests.helpers.transport import parse_multipart
+
+
+def test_with_files():
+    '''Should encode bytes, strings, streams and paths with the length of the body'''
+
+    content = b'id,item_name\n' + b'1,item\n' * 1000
+    stream = MultipartStream({
+        'items': ('items.csv', io.BytesIO(content)),
+        'variations': ('variations.csv', 'id,item_id\n1,1\n'),
+        'item_groups': ('item_groups.csv', b''),
+    })
+    body = b''.join(stream)
+
+    assert stream.len == len(body)
+    assert parse_multipart(body, stream.content_type) == {
+        'items': ('items.csv', content),
+        'variations': ('variations.csv', b'id,item_id\n1,1\n'),
+        'item_groups': ('item_groups.csv', b''),
+    }
+
+def test_with_path(tmp_path):
+    '''Should read files from their path'''
+
+    path = tmp_path / 'items.csv'
+    path.write_bytes(b'id\n1\n')
+    stream = MultipartStream({ 'items': ('items.csv', path) })
+    body = b''.join(stream)
+
+    assert stream.len == len(body)
+    assert parse_multipart(body, stream.content_type) == { 'items': ('items.csv', b'id\n1\n') }
+
+def test_reads_streams_in_chunks():
+    '''Should read streams at most chunk_size bytes at a time'''
+
+    reads = []
+
+    class Stream(io.BytesIO):
+        '''Stream recording the sizes read'''
+
+        def read(self, size=-1):
+            reads.append(size)
+
+            return super().read(size)
+
+    stream = MultipartStream({ 'items': ('items.csv', Stream(b'x' * 10000)) }, chunk_size=1024)
+    chunks = list(stream)
+
+    assert set(reads) == { 1024 }
+    assert max(len(chunk) for chunk in chunks) == 1024
+
+def test_without_known_length():
+    '''Should have no length when the size of a file can not be known before reading it'''
+
+    stream = MultipartStream({ 'items': ('items.csv', iter([b'id\n', b'', b'1\n'])) })
+    body = b''.join(stream)
+
+    assert stream.len is None
+    assert parse_multipart(body, stream.content_type) == { 'items': ('items.csv', b'id\n1\n') }
+
+def test_async_with_iterable_files():
+    '''Should send iterables of bytes and strings as files with aiohttp'''
+
+    web = pytest.importorskip('aiohttp.web')
+    test_utils = pytest.importorskip('aiohttp.test_utils')
+    uploads = []
+
+    async def handler(request):
+        uploads.append(parse_multipart(await request.read(), request.headers.get('Content-Type')))
+
+        return web.json_response({ 'task_id': 1 })
+
+    async def run():
+        application = web.Application()
+        application.router.add_put('/v1/catalog', handler)
+
+        async with test_utils.TestServer(application) as server:
+            options = { 'api_key': 'key-abc', 'service_url': str(server.make_url('')).rstrip('/') }
+
+            async with AsyncConstructorIO(options) as client:
+                return await client.catalog.replace_catalog({
+                    'items': (chunk for chunk in [b'id,item_name\n', b'1,a\n']),
+                    'variations': iter(['variation_id,item_id\n', 'v1,1\n']),
+                })
+
+    assert asyncio.run(run()) == { 'task_id': 1 }
+    assert uploads == [{
+        'items': ('items.csv', b'id,item_name\n1,a\n'),
+        'variations': ('variations.csv', b'variation_id,item_id\nv1,1\n'),
+    }]
@@ -0,0 +1,150 @@
+'''ConstructorIO Python Client - Paginated Iterators Tests'''
+
+import asyncio
+from threading import Event
+from urllib.parse import parse_qs, urlsplit
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.transport import AsyncFakeTransport, FakeTransport
+from tests.helpers.transport import create_json_response, create_transport
+
+VALID_OPTIONS = { 'api_key': 'key-abc' }
+REDIRECT_RESPONSE = {
+    'response': { 'redirect': { 'data': { 'url': '/sale' }, 'matched_terms': ['sale'] } },
+    'result_id': 'result-id',
+}
+
+def create_pages_transport(total, requested=None):
+    '''
+    Create a fake transport paginating total results, setting requested[page] once a page is requested
+    '''
+
+    def handler(request):
+        query = parse_qs(urlsplit(request.url).query)
+        page = int(query.get('page', ['1'])[0])
+        per_page = int(query.get('num_results_per_page', ['20'])[0])
+        results = [{ 'value': index } for index in range((page - 1) * per_page, min(page * per_page, total))]
+
+        if requested is not None and page in requested:
+            requested[page].set()
+
+        return create_json_response({
+            'response': { 'results': results, 'total_num_results': total },
+            'result_id': 'result-id',
+        })
+
+    return create_transport([('get', '/search/', handler), ('get', '/browse/', handler)])
+
+def get_pages(transport):
+    '''Get the page numbers requested from a fake transport'''
+
+    return [int(parse_qs(urlsplit(request.url).query).get('page')[0]) for request in transport.requests]
+
+def test_iter_search_results():
+    '''Should iterate over the results of all pages and stop at total_num_results'''
+
+    transport = create_pages_transport(25)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = list(client.search.iter_search_results('shoes', { 'results_per_page': 10 }))
+
+    assert [result.get('value') for result in results] == list(range(25))
+    assert all(result.get('result_id') == 'result-id' for result in results)
+    assert get_pages(transport) == [1, 2, 3]
+
+def test_iter_search_results_with_exact_total():
+    '''Should not request a page past total_num_results when the last page is full'''
+
+    transport = create_pages_transport(20)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = list(client.search.iter_search_results('shoes', { 'results_per_page': 10 }))
+
+    assert len(results) == 20
+    assert get_pages(transport) == [1, 2]
+
+def test_iter_search_results_prefetches_next_page():
+    '''Should request the next page while the results of the current one are consumed'''
+
+    requested = { 2: Event() }
+    transport = create_pages_transport(25, requested)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = client.search.iter_search_results('shoes', { 'results_per_page': 10 })
+
+        assert next(results).get('value') == 0
+        assert requested[2].wait(1)
+
+        results.close()
+
+def test_iter_browse_results_from_page():
+    '''Should iterate over the results from parameters.page on'''
+
+    transport = create_pages_transport(25)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        results = list(client.browse.iter_browse_results('group_id', 'shoes', { 'page': 2, 'results_per_page': 10 }))
+
+    assert [result.get('value') for result in results] == list(range(10, 25))
+    assert get_pages(transport) == [2, 3]
+
+def test_iter_browse_results_without_results():
+    '''Should stop at an empty page'''
+
+    transport = create_pages_transport(0)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        assert not list(client.browse.iter_browse_results('group_id', 'shoes'))
+
+    assert get_pages(transport) == [1]
+
+def test_iter_search_results_with_redirect():
+    '''Should stop at a redirect, which has no results'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', REDIRECT_RESPONSE)
+
+    with ConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+        assert not list(client.search.iter_search_results('sale'))
+
+    assert get_pages(transport) == [1]
+
+def test_async_iter_search_results():
+    '''Should iterate asynchronously over the results of all pages'''
+
+    transport = AsyncFakeTransport(create_pages_transport(25))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return [result async for result in client.search.iter_search_results('shoes', { 'results_per_page': 10 })]
+
+    results = asyncio.run(run())
+
+    assert [result.get('value') for result in results] == list(range(25))
+
+def test_async_iter_browse_results():
+    '''Should iterate asynchronously over the results of all pages'''
+
+    transport = AsyncFakeTransport(create_pages_transport(15))
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            results = client.browse.iter_browse_results('group_id', 'shoes', { 'results_per_page': 10 })
+
+            return [result async for result in results]
+
+    results = asyncio.run(run())
+
+    assert [result.get('value') for result in results] == list(range(15))
+
+def test_async_iter_search_results_with_redirect():
+    '''Should stop at a redirect, which has no results'''
+
+    fake_transport = FakeTransport()
+    fake_transport.add_response('get', '/search/', REDIRECT_RESPONSE)
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': AsyncFakeTransport(fake_transport) }) as client:
+            return [result async for result in client.search.iter_search_results('sale')]
+
+    assert not asyncio.run(run())
@@ -0,0 +1,157 @@
+'''ConstructorIO Python Client - Transport Tests'''
+
+import asyncio
+from unittest import mock
+
+import pytest
+import requests
+
+from constructor_io.constructor_io import AsyncConstructorIO, ConstructorIO
+from constructor_io.helpers.exception import HttpException
+from constructor_io.helpers.transport import (AsyncFakeTransport,
+                                              FakeTransport, Request,
+                                              RequestsTransport, Response,
+                                              Urllib3Transport)
+
+VALID_OPTIONS = { 'api_key': 'key-abc', 'api_token': 'token-abc' }
+SEARCH_RESPONSE = {
+    'response': { 'results': [{ 'value': 'item' }] },
+    'result_id': 'result-id',
+}
+
+def test_with_fake_transport():
+    '''Should send module requests through the provided transport'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', SEARCH_RESPONSE)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    response = client.search.get_search_results('item', {}, { 'user_ip': '127.0.0.1' })
+    request = transport.requests[0]
+
+    assert response.get('response').get('results')[0].get('result_id') == 'result-id'
+    assert request.method == 'get'
+    assert request.url.startswith('https://ac.cnstrc.com/search/item?')
+    assert request.auth == ('token-abc', '')
+    assert request.headers.get('X-Forwarded-For') == '127.0.0.1'
+
+def test_with_fake_transport_json_body():
+    '''Should pass JSON bodies to the transport'''
+
+    transport = FakeTransport()
+    transport.add_response('put', '/v2/items', { 'task_id': 1 })
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    response = client.catalog.create_or_replace_items({ 'items': [{ 'id': '1' }] })
+
+    assert response.get('task_id') == 1
+    assert transport.requests[0].json == { 'items': [{ 'id': '1' }] }
+
+def test_with_fake_transport_error_response():
+    '''Should raise an HTTP exception for error responses'''
+
+    transport = FakeTransport()
+    transport.add_response('get', '/search/', { 'message': 'Invalid key', 'status': 401 }, status_code=401)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+
+    with pytest.raises(HttpException, match=r'Invalid key'):
+        client.search.get_search_results('item')
+
+def test_with_fake_transport_handler():
+    '''Should create responses using the provided handler'''
+
+    transport = FakeTransport()
+    transport.add_response(
+        'get',
+        '/v1/tasks/',
+        handler=lambda request: Response(200, b'{"id": 1, "status": "DONE"}', url=request.url)
+    )
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+
+    assert client.tasks.get_task(1).get('status') == 'DONE'
+
+def test_response_json_returns_copies():
+    '''Should parse a new object on each call to json'''
+
+    response = Response(200, b'{"a": [1]}')
+    first = response.json()
+    first.get('a').append(2)
+
+    assert response.json() == { 'a': [1] }
+    assert response.ok
+    assert not Response(404).ok
+
+def test_requests_transport_with_requests_module():
+    '''Should call the provided requests module with the request arguments'''
+
+    with mock.patch.object(requests, 'get') as mocked_get:
+        mocked_get.return_value = mock.Mock(status_code=200, content=b'{}', headers={}, url='url')
+        transport = RequestsTransport(requests)
+        response = transport.send(Request('get', 'https://ac.cnstrc.com/', auth=('t', ''), headers={ 'a': 'b' }))
+
+        assert response.status_code == 200
+        assert mocked_get.call_args.args[0] == 'https://ac.cnstrc.com/'
+        assert mocked_get.call_args.kwargs.get('headers') == { 'a': 'b' }
+        assert mocked_get.call_args.kwargs.get('auth') == ('t', '')
+
+def test_with_async_fake_transport():
+    '''Should send async module requests through the provided transport'''
+
+    transport = AsyncFakeTransport()
+    transport.fake_transport.add_response('get', '/search/', SEARCH_RESPONSE)
+
+    async def run():
+        async with AsyncConstructorIO({ **VALID_OPTIONS, 'transport': transport }) as client:
+            return await client.search.get_search_results('item')
+
+    response = asyncio.run(run())
+
+    assert response.get('result_id') == 'result-id'
+    assert transport.fake_transport.requests[0].auth == ('token-abc', '')
+
+def test_urllib3_transport():
+    '''Should send requests with precomputed auth and static headers'''
+
+    pool_manager = mock.Mock()
+    pool_manager.urlopen.return_value = mock.Mock(status=200, data=b'{"total_count": 0}', headers={})
+    transport = Urllib3Transport(pool_manager=pool_manager)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    response = client.tasks.get_all_tasks()
+    method, url = pool_manager.urlopen.call_args.args
+    headers = pool_manager.urlopen.call_args.kwargs.get('headers')
+
+    assert response.get('total_count') == 0
+    assert method == 'GET'
+    assert url.startswith('https://ac.cnstrc.com/v1/tasks?')
+    assert headers.get('Authorization') == 'Basic dG9rZW4tYWJjOg=='
+    assert pool_manager.urlopen.call_args.kwargs.get('body') is None
+
+def test_urllib3_transport_json_body():
+    '''Should encode JSON bodies without modifying the static headers'''
+
+    pool_manager = mock.Mock()
+    pool_manager.urlopen.return_value = mock.Mock(status=200, data=b'{"task_id": 1, "total_count": 0}', headers={})
+    transport = Urllib3Transport(pool_manager=pool_manager)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    client.catalog.update_items({ 'items': [{ 'id': '1' }] })
+    json_kwargs = pool_manager.urlopen.call_args.kwargs
+    client.tasks.get_all_tasks()
+    get_kwargs = pool_manager.urlopen.call_args.kwargs
+
+    assert json_kwargs.get('body') == b'{"items": [{"id": "1"}]}'
+    assert json_kwargs.get('headers').get('Content-Type') == 'application/json'
+    assert 'Content-Type' not in get_kwargs.get('headers')
+
+def test_urllib3_transport_files():
+    '''Should encode files as multipart form data'''
+
+    pool_manager = mock.Mock()
+    pool_manager.urlopen.return_value = mock.Mock(status=200, data=b'{"task_id": 1}', headers={})
+    transport = Urllib3Transport(pool_manager=pool_manager)
+    client = ConstructorIO({ **VALID_OPTIONS, 'transport': transport })
+    client.catalog.replace_catalog({ 'items': b'id,item_name\n1,item\n' })
+    kwargs = pool_manager.urlopen.call_args.kwargs
+    body = b''.join(kwargs.get('body'))
+
+    assert kwargs.get('headers').get('Content-Type').startswith('multipart/form-data; boundary=')
+    assert kwargs.get('headers').get('Content-Length') == str(len(body))
+    assert b'filename="items.csv"' in body
+    assert b'1,item' in body
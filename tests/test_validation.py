@@ -0,0 +1,185 @@
+'''ConstructorIO Python Client - Catalog Validation Tests'''
+
+import json
+
+from pytest import raises
+
+from constructor_io.helpers import validation
+from constructor_io.helpers.exception import ConstructorException
+from constructor_io.helpers.feeds import create_items_feed
+from constructor_io.helpers.validation import (validate_catalog_files,
+                                               validate_records)
+from tests.helpers.utils import (create_mock_item, create_mock_item_group,
+                                 create_mock_variation)
+
+ITEM_GROUPS = b'id,name,parent_id\nshoes,Shoes,\nboots,Boots,shoes\nhats,Hats,caps\n'
+ITEMS = (
+    b'id,item_name,group_ids,metadata:specs\n'
+    b'1,Item 1,shoes|boots,"{""weight"": 1}"\n'
+    b'2,,hats|bags,{weight\n'
+    b'\n'
+    b'1,Item 1 again,,\n'
+    b'3,Item 3\n'
+)
+VARIATIONS = b'variation_id,item_id\nv1,1\nv2,4\n'
+
+def get_errors(report):
+    '''Get the errors of a report as tuples'''
+
+    return [(error.kind, error.row, error.column, error.message) for error in report.errors]
+
+def test_catalog_files():
+    '''Should report the errors of each row with their line and column'''
+
+    report = validate_catalog_files({ 'items': ITEMS, 'variations': VARIATIONS, 'item_groups': ITEM_GROUPS })
+
+    assert not report.ok
+    assert report.num_rows == 9
+    assert sorted(get_errors(report), key=str) == sorted([
+        ('item_groups', 4, 'parent_id', 'caps is not in item_groups'),
+        ('items', 3, 'group_ids', 'bags is not in item_groups'),
+        ('items', 3, 'item_name', 'value is required'),
+        ('items', 3, 'metadata:specs', 'value is not valid JSON'),
+        ('items', 5, 'id', '1 is not unique'),
+        ('items', 6, None, 'row has 2 columns, the header has 4'),
+        ('variations', 3, 'item_id', '4 is not in items'),
+    ], key=str)
+
+def test_catalog_files_with_missing_columns():
+    '''Should report missing and duplicated columns'''
+
+    report = validate_catalog_files({ 'items': b'id,name,name\n1,a,b\n', 'variations': b'' })
+
+    assert get_errors(report) == [
+        ('items', 1, 'name', 'column is duplicated'),
+        ('items', 1, 'item_name', 'column is required'),
+        ('variations', 1, None, 'file is empty'),
+    ]
+
+def test_catalog_files_with_text(tmp_path):
+    '''Should read strings as the content of files and paths from disk'''
+
+    (tmp_path / 'item_groups.csv').write_bytes(ITEM_GROUPS)
+
+    report = validate_catalog_files({ 'items': 'id,item_name\n1,a\n', 'item_groups': tmp_path / 'item_groups.csv' })
+
+    assert get_errors(report) == [('item_groups', 4, 'parent_id', 'caps is not in item_groups')]
+
+def test_catalog_files_with_invalid_csv():
+    '''Should report rows that are not valid CSV'''
+
+    report = validate_catalog_files({ 'items': b'id,item_name\n1,a\n2,"' + b'a' * 200000 + b'"\n' })
+
+    assert get_errors(report) == [('items', 3, None, 'row is not valid CSV: field larger than field limit (131072)')]
+
+def test_catalog_files_with_multiline_values(monkeypatch):
+    '''Should split blocks at the end of rows with values on several lines'''
+
+    monkeypatch.setattr(validation, 'BLOCK_SIZE', 2)
+    items = (
+        b'id,item_name,"metadata:\nnotes"\n'
+        b'1,Item 1,"first\n""line""\nlast"\n'
+        b'2,"Item\n2","5"" screen"\n'
+        b'3,,\n'
+        b'2,Item 4,"{\n""a"": 1\n"\n'
+    )
+    report = validate_catalog_files({ 'items': items })
+
+    assert report.num_rows == 4
+    assert get_errors(report) == [
+        ('items', 8, 'item_name', 'value is required'),
+        ('items', 9, 'metadata:\nnotes', 'value is not valid JSON'),
+        ('items', 9, 'id', '2 is not unique'),
+    ]
+
+def test_catalog_files_with_blocks():
+    '''Should check rows in blocks, numbering lines across blocks'''
+
+    items = ({ 'id': str(index), 'name': '' if index % 10000 == 0 else 'Item' } for index in range(25000))
+
+    report = validate_catalog_files({ 'items': create_items_feed(items) })
+
+    assert report.num_rows == 25000
+    assert get_errors(report) == [
+        ('items', line, 'item_name', 'value is required') for line in (2, 10002, 20002)
+    ]
+
+def test_catalog_files_with_max_errors():
+    '''Should count every error but keep the first max_errors'''
+
+    items = b'id,item_name\n' + b'1,\n' * 10
+    report = validate_catalog_files({ 'items': items }, max_errors=3)
+
+    assert report.num_errors == 19
+    assert len(report.errors) == 3
+
+    with raises(ConstructorException, match='19 catalog validation errors: items row 2 item_name: value is required'):
+        report.raise_for_errors()
+
+def test_records():
+    '''Should validate mock items, variations and item groups'''
+
+    item = create_mock_item()
+    parent = create_mock_item_group()
+    parent['children'] = [create_mock_item_group()]
+
+    assert validate_records('items', [item]).ok
+    assert validate_records('variations', [create_mock_variation(item['id'])]).ok
+    assert validate_records('item_groups', [parent]).ok
+
+def test_records_with_errors():
+    '''Should report the errors of each record with its index and attribute'''
+
+    items = [
+        { 'id': '1', 'name': 'a', 'data': { 'facets': ['color'] } },
+        { 'id': '1', 'name': ' ', 'brand': 'abc' },
+        { 'id': ['2'], 'name': 'b' },
+        { 'id': '3', 'name': 'c', 'data': { 'price': object() } },
+        'item',
+    ]
+
+    assert get_errors(validate_records('items', items)) == [
+        ('items', 0, 'data.facets', 'attribute must be a dict'),
+        ('items', 1, 'brand', 'attribute is unknown'),
+        ('items', 1, 'name', 'attribute is required'),
+        ('items', 1, 'id', '1 is not unique'),
+        ('items', 2, 'id', 'attribute must be a string or an integer'),
+        ('items', 3, None, 'record is not JSON serializable: Object of type object is not JSON serializable'),
+        ('items', 4, None, 'record must be a dict'),
+    ]
+
+def test_records_with_partial_updates():
+    '''Should only require IDs of partial updates'''
+
+    assert validate_records('variations', [{ 'id': 'v1', 'data': { 'price': 1 } }], partial=True).ok
+    assert not validate_records('variations', [{ 'id': 'v1', 'data': { 'price': 1 } }]).ok
+
+def test_records_with_limits():
+    '''Should report batches over the limits of a bulk upload chunk'''
+
+    items = [{ 'id': str(index), 'name': 'x' * 9000 } for index in range(1001)]
+    num_bytes = sum(len(json.dumps(item)) for item in items)
+
+    assert get_errors(validate_records('items', items))[-2:] == [
+        ('items', None, None, 'batch has 1001 records, the chunk limit is 1000'),
+        ('items', None, None, f'batch has {num_bytes} bytes, the chunk limit is 8388608'),
+    ]
+
+def test_records_with_invalid_item_groups():
+    '''Should report item groups that are their own parent'''
+
+    assert get_errors(validate_records('item_groups', [{ 'id': 'a', 'name': 'A', 'parent_id': 'a' }])) == [
+        ('item_groups', 0, 'parent_id', 'item group is its own parent'),
+    ]
+
+def test_invalid_parameters():
+    '''Should raise an exception for invalid parameters'''
+
+    with raises(ConstructorException, match='files is a required parameter of type dict'):
+        validate_catalog_files({})
+
+    with raises(ConstructorException, match='kind must be one of items, variations, item_groups'):
+        validate_records('products', [])
+
+    with raises(ConstructorException, match='records is a required parameter of type list'):
+        validate_records('items', None)